@@ -5,40 +5,196 @@ A multiplayer Texas 42 domino game with real-time WebSocket communication.
 """
 
 import os
+import time
+import ipaddress
+
+# Startup is timed from here until the module has finished loading
+_startup_began = time.perf_counter()
+
+# eventlet's green DNS resolver pulls in dnspython (about a fifth of startup);
+# the server only resolves the message queue's host, once, at connect
+os.environ.setdefault('EVENTLET_NO_GREENDNS', 'yes')
+
+# Socket.IO's message queue needs cooperative sockets under eventlet
+if os.environ.get('SOCKETIO_MESSAGE_QUEUE') and os.environ.get('ASYNC_MODE', 'eventlet') == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
 import uuid
+import weakref
+import mimetypes
 import random
 import string
+import threading
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
 from functools import wraps
-import threading
 
 from flask import (
-    Flask, render_template, request, jsonify, session, redirect, url_for
+    render_template, request, jsonify, session, redirect, url_for, g,
+    has_app_context, abort, send_file
 )
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_login import (
-    LoginManager, login_user, logout_user, login_required, current_user
+    login_user, logout_user, login_required, current_user
 )
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
-from models import db, login_manager
+from config import create_app
+from models import db
 from models.user import User
-from models.game_session import GameSession
+from models.user_cache import user_cache
+from models.game_session import GameSession, StaleGameState
+from models import game_store
+from models.game_store import game_from_snapshot, recent_snapshots
 from game_logic.game import Game
+from game_logic.ai import choose_bid, choose_trump, choose_domino, fast_forward_hand
+from services.actors import ActorSystem, Command
+from services.assets import AssetManifest
+from services.cluster import Cluster, RedisBroker
+from services.game_cache import GameCache
+from services.matchmaking import Matchmaker, TABLE_SIZE, skill_bucket
+from services.metrics import (
+    MetricsRegistry, MeasuredJSON, SIZE_BUCKETS, COUNT_BUCKETS
+)
+from services.outbox import Outbox
+from services.protocol import (
+    PROTOCOL_JSON, PROTOCOL_BINARY, COMPACT_PROTOCOLS, WIRE_EVENT, SharedPayload, negotiate,
+    room_for, encode
+)
+from services.presence import Presence
+from services.profiler import Profiler
+from services.ratelimit import RateLimiter
+from services.registry import SessionRegistry
+from services.scheduler import BotScheduler, TaskScheduler
+from services.seat_index import SeatIndex
+
+# Flask app with config from the environment and the database bound; the
+# server and its services below are built around it at import, once per process
+app = create_app()
+
+# Served at /metrics. Recording is a dict lookup and a few additions, so it
+# stays on in production; gauges are only read when scraped.
+metrics = MetricsRegistry()
+http_latency = metrics.histogram(
+    'game42_http_request_seconds', 'HTTP request latency by route', labels=('route', 'method'))
+event_latency = metrics.histogram(
+    'game42_socket_event_seconds', 'Socket.IO event handler latency', labels=('event',))
+command_latency = metrics.histogram(
+    'game42_command_seconds', 'Game command latency, including its emits', labels=('command',))
+db_query_latency = metrics.histogram(
+    'game42_db_query_seconds', 'Database query latency')
+db_queries = metrics.histogram(
+    'game42_db_queries', 'Database queries per HTTP request or game command',
+    buckets=COUNT_BUCKETS, labels=('source',))
+db_time = metrics.histogram(
+    'game42_db_time_seconds', 'Database time per HTTP request or game command', labels=('source',))
+bot_decision = metrics.histogram(
+    'game42_bot_decision_seconds', 'Bot decision time', labels=('decision',))
+turns_autoplayed = metrics.counter(
+    'game42_turns_autoplayed_total', 'Human turns played by the bot after TURN_TIMEOUT',
+    labels=('phase',))
+match_wait = metrics.histogram(
+    'game42_match_wait_seconds', 'Quick-match wait until seated', labels=('table',))
+payload_bytes = metrics.histogram(
+    'game42_payload_bytes', 'Serialized Socket.IO payload size',
+    buckets=SIZE_BUCKETS, labels=('encoding',))
+
+if app.config['ASYNC_MODE'] == 'asyncio':
+    # Same handlers and game code, served by an ASGI server (see asgi.py)
+    from services.async_socketio import AsyncioSocketIO
+    socketio = AsyncioSocketIO(
+        app,
+        cors_allowed_origins="*",
+        message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'],
+        json=MeasuredJSON(payload_bytes, 'json')
+    )
+    # HTTP requests run on threads of their own; routes that read or change
+    # games take the lock event handlers and background tasks share
+    games_lock = socketio.lock
+    # SQLite takes one writer at a time; queue for it here, not in its busy handler
+    database_io = (threading.RLock() if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')
+                   else nullcontext())
+
+    @contextmanager
+    def blocking_io():
+        """Let other games run while a database read or write waits."""
+        with socketio.unlocked(), database_io:
+            yield
+
+    # The message queue's receive loop blocks, so it runs without the lock
+    start_listener = socketio.start_listener
+    running_threads = socketio.running_threads
+else:
+    socketio = SocketIO(
+        app,
+        cors_allowed_origins="*",
+        async_mode='eventlet',
+        message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'],
+        # Measures each packet as Socket.IO encodes it (once per room emit)
+        json=MeasuredJSON(payload_bytes, 'json')
+    )
+    # Every green thread shares one OS thread and switches only where it waits
+    games_lock = nullcontext()
+    blocking_io = nullcontext
+    start_listener = None
+    running_threads = None
+
+
+def games_locked(f):
+    """Run a route holding games_lock: it reads or changes games in memory."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        with games_lock:
+            return f(*args, **kwargs)
+    return wrapper
+
+
+# Every game is owned by exactly one worker
+cluster = Cluster(
+    app.config['WORKER_ID'],
+    app.config['WORKER_COUNT'],
+    RedisBroker(app.config['SOCKETIO_MESSAGE_QUEUE']) if app.config['WORKER_COUNT'] > 1 else None
+)
+# Users dropped from one worker's cache, for the others to drop too
+USERS_CHANNEL = 'game42:users'
 
-# Initialize Flask app
-app = Flask(__name__)
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'game42-secret-key-change-in-production')
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///game.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
+# In-memory game storage (active games)
 
-# Initialize extensions
-db.init_app(app)
-login_manager.init_app(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
 
-# In-memory game storage (active games)
-active_games = {}  # game_id -> Game object
+def load_game_snapshot(game_id):
+    """Load a saved game, with blocking_io, without caching it."""
+    with blocking_io():
+        return game_store.load_game_snapshot(game_id)
+
+
+def save_game_state(game):
+    """Save a game (a compare-and-swap on its version), with blocking_io."""
+    with blocking_io():
+        game_store.save_game_state(game)
+
+
+def hibernate_game(game):
+    """Flush a game leaving memory; every other change is already saved."""
+    if game.dirty:
+        with app.app_context():
+            try:
+                save_game_state(game)
+            except StaleGameState:
+                pass  # A newer copy was saved elsewhere
+
+
+# game_id -> Game for games this worker owns, bounded by MAX_ACTIVE_GAMES
+active_games = GameCache(app.config['MAX_ACTIVE_GAMES'], on_evict=hibernate_game)
+# user_id -> {game_id: position or None} for the games this worker has loaded
+seat_index = SeatIndex()
+
+
+def cache_game(game):
+    """Keep a game in memory and index its players and spectators."""
+    active_games[game.game_id] = game
+    seat_index.add_game(game)
 
 
 # ============================================================================
@@ -64,9 +220,10 @@ def cleanup_old_games():
         for game in inactive_games:
             # Mark as finished so they can't be joined
             game.status = 'finished'
-            # Remove from active memory
+            # Remove from active memory (through the game's own queue)
             if game.game_id in active_games:
-                del active_games[game.game_id]
+                actors.submit('discard', game.game_id)
+            seat_index.drop_game(game.game_id)
 
         # Delete games older than 1 week
         one_week_ago = now - timedelta(weeks=1)
@@ -77,33 +234,26 @@ def cleanup_old_games():
         for game in old_games:
             db.session.delete(game)
             if game.game_id in active_games:
-                del active_games[game.game_id]
+                actors.submit('discard', game.game_id)
+            seat_index.drop_game(game.game_id)
 
-        db.session.commit()
+        with blocking_io():
+            db.session.commit()
         print(f"Cleanup: Marked {len(inactive_games)} inactive games, deleted {len(old_games)} old games")
 
 
 def start_cleanup_thread():
-    """Start a background thread that runs cleanup every hour."""
+    """Start a background green thread that runs cleanup every hour."""
     def run_cleanup():
         while True:
-            import time
-            time.sleep(3600)  # Run every hour
+            socketio.sleep(3600)  # Run every hour
             try:
                 cleanup_old_games()
             except Exception as e:
                 print(f"Error in cleanup: {e}")
 
-    thread = threading.Thread(target=run_cleanup, daemon=True)
-    thread.start()
-
-
-def update_game_activity(game_id):
-    """Update the last_activity timestamp for a game."""
-    game_session = GameSession.query.filter_by(game_id=game_id).first()
-    if game_session:
-        game_session.last_activity = datetime.utcnow()
-        db.session.commit()
+    # A green thread on the server's hub, so it never races the game actors
+    socketio.start_background_task(run_cleanup)
 
 
 # ============================================================================
@@ -117,44 +267,70 @@ def generate_guest_username():
 
 
 def get_or_create_game(game_id):
-    """Get game from memory or recreate from database."""
+    """Get game from memory or recreate from database (owner worker only)."""
+    game = active_games.get(game_id)
+    if game:
+        return game
+
+    # Another worker owns it - never cache a copy that could diverge
+    if not cluster.is_local(game_id):
+        return None
+
+    game = load_game_snapshot(game_id)
     if game_id in active_games:
-        return active_games[game_id]
+        return active_games[game_id]  # Loaded by another thread while we read
+    if game:
+        cache_game(game)
+        schedule_release(game_id)
+    return game
 
-    # Try to load from database
-    game_session = GameSession.query.filter_by(game_id=game_id).first()
-    if game_session and game_session.game_state:
-        game = Game.from_dict(game_session.game_state)
-        active_games[game_id] = game
-        return game
-    return None
 
+def fill_with_bots(game):
+    """
+    Add AI players to every empty seat.
 
-def save_game_state(game):
-    """Save game state to database."""
-    game_session = GameSession.query.filter_by(game_id=game.game_id).first()
-    if game_session:
-        game_session.game_state = game.to_dict()
-        game_session.status = game.phase
-        game_session.team1_marks = game.team1_marks
-        game_session.team2_marks = game.team2_marks
-        game_session.team1_points = game.team1_hand_points
-        game_session.team2_points = game.team2_hand_points
-
-        # Update players
-        players_dict = {}
-        for pos, player in game.players.items():
-            players_dict[pos] = player.user_id
-        game_session.players = players_dict
-        game_session.spectators = [s[0] for s in game.spectators]
-
-
-def handle_ai_turn(game_id):
-    """Handle AI player turns."""
-    import random
-    import time
+    Returns:
+        List of (position, username) for the bots that were seated
+    """
+    bot_names = ['Bot_Alice', 'Bot_Bob', 'Bot_Carol', 'Bot_Dave']
+    positions = ['north', 'south', 'east', 'west']
+    added = []
 
-    game = active_games.get(game_id)
+    for bot_num, pos in enumerate(positions):
+        if pos not in game.players:
+            bot_id = -1 - bot_num  # Negative IDs for bots
+            success, _ = game.add_player(bot_id, bot_names[bot_num], pos, is_ai=True)
+            if success:
+                added.append((pos, bot_names[bot_num]))
+    return added
+
+
+def schedule_ai_turn(game):
+    """
+    Arm the bot scheduler if the player to act is an AI, or the turn clock
+    if it is a human; either way the clock of the previous turn is stopped.
+    """
+    timers.cancel(('turn', game.game_id))
+    current_pos = game.current_turn
+    if not current_pos or current_pos not in game.players:
+        return
+    player = game.players[current_pos]
+    if player.is_ai:
+        bot_scheduler.schedule(game.game_id, game.bot_delay)
+        return
+
+    timeout = app.config['TURN_TIMEOUT']
+    if timeout <= 0:
+        return
+    if presence.is_away(game.game_id, player.user_id):
+        timeout = min(timeout, game.bot_delay)  # Nobody to wait for
+    timers.schedule(('turn', game.game_id), timeout, actors.submit, 'turn_timeout',
+                    game.game_id, {'position': current_pos, 'phase': game.phase})
+
+
+def take_ai_turn(game_id):
+    """Make a single move for the AI player whose turn it is."""
+    game = get_or_create_game(game_id)
     if not game:
         return
 
@@ -167,85 +343,55 @@ def handle_ai_turn(game_id):
     if not player.is_ai:
         return
 
-    # Small delay to make it feel more natural
-    socketio.sleep(1)
+    if game.is_all_bots:
+        fast_forward_bot_table(game)
+        return
+
+    play_for_seat(game, current_pos)
 
+
+def play_for_seat(game, position):
+    """
+    Make the bot strategy's move for a seat and broadcast it.
+
+    Used for bot seats and for human seats whose turn clock ran out. A
+    timed-out human passes in bidding rather than having a bid made for them.
+
+    Returns:
+        True if a move was made
+    """
+    game_id = game.game_id
     if game.phase == 'bidding':
-        # AI bidding logic - Smarter strategy
-        high_bid = game.high_bid or 29
-        hand = player.hand
-
-        # Calculate hand strength for each suit
-        suit_strengths = {}
-        for suit in range(7):  # 0-6
-            strength = 0
-            suit_dominoes = []
-            for domino in hand:
-                if domino.belongs_to_suit(suit):
-                    suit_dominoes.append(domino)
-                    # Doubles are very strong in trump
-                    if domino.is_double and domino.high == suit:
-                        strength += 8
-                    else:
-                        strength += 3
-                    # Count dominoes are valuable
-                    if domino.count_value > 0:
-                        strength += domino.count_value // 5
-            suit_strengths[suit] = strength
-
-        # Find best suit
-        best_suit = max(suit_strengths, key=suit_strengths.get) if suit_strengths else 0
-        max_strength = suit_strengths[best_suit]
-
-        # Count total count dominoes (5-0, 4-1, 3-2, 6-4, 5-5)
-        count_dominoes = sum(1 for d in hand if d.count_value > 0)
-
-        # Smarter bidding logic
-        bid = 0
-        if max_strength >= 18:  # Very strong hand
-            bid = min(42, max(high_bid + 1, 35))
-        elif max_strength >= 14 and high_bid < 37:  # Strong hand
-            bid = high_bid + 1
-        elif max_strength >= 10 and high_bid < 33:  # Decent hand
-            bid = high_bid + 1
-        elif max_strength >= 7 and high_bid < 31 and count_dominoes >= 2:  # Okay hand with counts
-            bid = high_bid + 1
+        if game.players[position].is_ai:
+            with bot_decision.time('bid'):
+                bid = choose_bid(game, position)
         else:
             bid = 0  # Pass
-
-        success, message = game.place_bid(current_pos, bid)
+        success, message = game.place_bid(position, bid)
         if success:
             save_game_state(game)
-            socketio.emit('bid_update', {
-                'position': current_pos,
+            outbox.emit('bid_update', {
+                'position': position,
                 'bid': bid,
                 'high_bid': game.high_bid,
                 'high_bidder': game.high_bidder,
                 'current_bidder': game.current_bidder if game.phase == 'bidding' else None,
+                'current_turn': game.current_turn,
                 'phase': game.phase,
                 'message': message
             }, room=game_id)
 
-            # Continue if still bidding and next is AI
-            if game.phase == 'bidding':
-                handle_ai_turn(game_id)
-            elif game.phase == 'trump_selection' and game.players[game.high_bidder].is_ai:
-                handle_ai_turn(game_id)
+            # Continue if next is AI
+            schedule_ai_turn(game)
+            return True
 
     elif game.phase == 'trump_selection':
-        # AI trump selection - pick strongest suit
-        hand = player.hand
-        suit_counts = {}
-        for domino in hand:
-            for suit in [domino.high, domino.low]:
-                suit_counts[suit] = suit_counts.get(suit, 0) + 1
-
-        best_suit = max(suit_counts, key=suit_counts.get) if suit_counts else 0
-
-        success, message = game.select_trump(current_pos, best_suit)
+        with bot_decision.time('trump'):
+            trump = choose_trump(game, position)
+        success, message = game.select_trump(position, trump)
         if success:
             save_game_state(game)
-            socketio.emit('trump_selected', {
+            outbox.emit('trump_selected', {
                 'trump_suit': game.trump_suit,
                 'current_leader': game.current_leader,
                 'phase': game.phase,
@@ -253,87 +399,23 @@ def handle_ai_turn(game_id):
             }, room=game_id)
 
             # Continue if next player is AI
-            if game.phase == 'playing':
-                handle_ai_turn(game_id)
+            schedule_ai_turn(game)
+            return True
 
     elif game.phase == 'playing':
-        # AI play logic - Smarter strategy
-        hand = player.hand
-        lead_suit = game.lead_suit
-        trump_suit = game.trump_suit
-
-        # Get playable dominoes
-        playable = player.get_playable_dominoes(lead_suit, trump_suit)
-
-        if playable:
-            chosen = None
-
-            if not game.current_trick:
-                # Leading the trick - smart strategy
-                # Priority: Lead with trump double, or lead with count domino, or lead strongest
-                trump_doubles = [d for d in playable if d.is_double and d.belongs_to_suit(trump_suit)]
-                count_dominoes = [d for d in playable if d.count_value > 0]
-
-                if trump_doubles:
-                    chosen = max(trump_doubles, key=lambda d: d.pip_total)
-                elif count_dominoes:
-                    chosen = max(count_dominoes, key=lambda d: d.count_value)
-                else:
-                    # Lead with highest domino
-                    chosen = max(playable, key=lambda d: d.pip_total)
-            else:
-                # Following - try to win the trick or dump low
-                current_winning = None
-                current_high_value = -1
-
-                # Find current winning domino in trick
-                for pos, domino in game.current_trick:
-                    domino_value = 0
-                    if domino.belongs_to_suit(trump_suit):
-                        domino_value = 100 + domino.pip_total  # Trump is strong
-                    elif lead_suit is not None and domino.belongs_to_suit(lead_suit):
-                        domino_value = domino.pip_total
-
-                    if domino_value > current_high_value:
-                        current_high_value = domino_value
-                        current_winning = domino
-
-                # Try to beat the current winning domino
-                can_win = []
-                for d in playable:
-                    d_value = 0
-                    if d.belongs_to_suit(trump_suit):
-                        d_value = 100 + d.pip_total
-                    elif lead_suit is not None and d.belongs_to_suit(lead_suit):
-                        d_value = d.pip_total
-
-                    if d_value > current_high_value:
-                        can_win.append((d, d_value))
-
-                if can_win:
-                    # Can win - play the lowest winning domino (save high cards)
-                    chosen = min(can_win, key=lambda x: x[1])[0]
-                else:
-                    # Can't win - dump lowest non-count domino
-                    non_count = [d for d in playable if d.count_value == 0]
-                    if non_count:
-                        chosen = min(non_count, key=lambda d: d.pip_total)
-                    else:
-                        # Have to give up a count domino
-                        chosen = min(playable, key=lambda d: d.count_value)
-
-            if not chosen:
-                chosen = playable[0]
-
-            success, message, trick_result = game.play_domino(current_pos, chosen.id)
+        with bot_decision.time('play'):
+            chosen = choose_domino(game, position)
+        if chosen:
+            success, message, trick_result = game.play_domino(position, chosen.id)
             if success:
                 save_game_state(game)
 
                 play_data = {
-                    'position': current_pos,
+                    'position': position,
                     'domino_id': chosen.id,
                     'current_trick': [(p, d.to_dict()) for p, d in game.current_trick],
                     'lead_suit': game.lead_suit,
+                    'current_turn': game.current_turn,
                     'phase': game.phase
                 }
 
@@ -349,13 +431,41 @@ def handle_ai_turn(game_id):
                     if game.phase == 'finished':
                         play_data['game_over'] = True
 
-                socketio.emit('domino_played', play_data, room=game_id)
+                outbox.emit('domino_played', play_data, room=game_id)
+
+                # A new hand was dealt - everyone needs their new view
+                if trick_result and trick_result.get('new_hand'):
+                    emit_game_state(game)
 
                 # Continue if next player is AI
-                if game.phase == 'playing' and game.current_turn:
-                    next_player = game.players.get(game.current_turn)
-                    if next_player and next_player.is_ai:
-                        handle_ai_turn(game_id)
+                schedule_ai_turn(game)
+                return True
+    return False
+
+
+def fast_forward_bot_table(game):
+    """
+    Play a whole hand in memory for a table with no human seat.
+
+    The game is persisted once and the room (spectators only) gets a single
+    compact 'hand_summary' instead of an emit and a save per move. The next
+    hand is scheduled after the table's bot delay so watchers can follow.
+    """
+    with bot_decision.time('hand'):
+        summary = fast_forward_hand(game)
+    save_game_state(game)
+
+    summary.update({
+        'phase': game.phase,
+        'team1_marks': game.team1_marks,
+        'team2_marks': game.team2_marks
+    })
+    if game.phase == Game.PHASE_FINISHED:
+        summary['game_over'] = True
+    outbox.emit('hand_summary', summary, room=game.game_id)
+    emit_game_state(game)
+
+    schedule_ai_turn(game)
 
 
 # ============================================================================
@@ -448,12 +558,17 @@ def guest_login():
 @login_required
 def logout():
     """Log out the current user."""
+    user_id = current_user.id
+
     # If guest, delete account
     if current_user.is_guest:
-        db.session.delete(current_user)
-        db.session.commit()
+        user = User.query.get(user_id)
+        if user:
+            db.session.delete(user)
+            db.session.commit()
 
     logout_user()
+    user_cache.invalidate(user_id)
     session.clear()
     return jsonify({'success': True})
 
@@ -509,6 +624,13 @@ def create_game():
     name = data.get('name', f"{current_user.username}'s Game")
     is_public = data.get('is_public', True)
 
+    # Per-table bot think time in seconds (0-5)
+    try:
+        bot_delay = float(data.get('bot_delay', app.config['BOT_THINK_DELAY']))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid bot delay'}), 400
+    bot_delay = min(max(bot_delay, 0.0), 5.0)
+
     game_id = str(uuid.uuid4())[:8]
 
     # Generate access code for private games
@@ -525,9 +647,18 @@ def create_game():
     db.session.add(game_session)
     db.session.commit()
 
-    # Create game in memory
-    game = Game(game_id)
-    active_games[game_id] = game
+    # Create the game on its owner worker (loaded from the saved state)
+    game = Game(game_id, bot_delay)
+    game_session.game_state = game.to_dict()
+    db.session.commit()
+    with games_lock:
+        if cluster.is_local(game_id):
+            cache_game(game)
+            schedule_release(game_id)
+
+        # Practice/demo table: four bots play while the creator watches
+        if data.get('bot_table'):
+            route_command('start_bot_table', game_id)
 
     return jsonify({
         'success': True,
@@ -537,6 +668,98 @@ def create_game():
     })
 
 
+# ============================================================================
+# Quick Match
+# ============================================================================
+
+# Players queued from the lobby of every worker; only the owner of MATCH_QUEUE
+# fills it, and each matched game goes to its own owner
+matchmaker = Matchmaker()
+# Key the queue's commands are routed by, like a game_id
+MATCH_QUEUE = 'quick-match'
+# Connections on this worker that have queued, so disconnects can dequeue them
+match_sids = set()
+# Seats for a team ticket, as partners, in the order they are handed out
+TEAM_SEATS = (('north', 'south'), ('east', 'west'))
+
+
+def seat_match(tickets):
+    """
+    Open a started game for a matched table and send each player to it.
+
+    Teams sit as partners, bots take any seat left over, and the game's
+    owner starts its bots and turn clocks.
+    """
+    seats = {}
+    team_seats = list(TEAM_SEATS)
+    for ticket in sorted(tickets, key=lambda t: -t.size):
+        if ticket.size == 2:
+            seats.update(zip(team_seats.pop(0), ticket.players))
+        else:
+            position = next(pos for pair in team_seats for pos in pair if pos not in seats)
+            seats[position] = ticket.players[0]
+
+    game_id = str(uuid.uuid4())[:8]
+    host = tickets[0].players[0]
+    db.session.add(GameSession(game_id=game_id, name='Quick Match', host_id=host['user_id'],
+                               is_public=False))
+    with blocking_io():
+        db.session.commit()
+
+    game = Game(game_id, app.config['BOT_THINK_DELAY'])
+    for position, player in seats.items():
+        game.add_player(player['user_id'], player['username'], position)
+    fill_with_bots(game)
+    game.start_game()
+    save_game_state(game)
+    if cluster.is_local(game_id):
+        cache_game(game)
+        schedule_release(game_id)
+    route_command('resume', game_id)
+
+    now = matchmaker.clock()
+    table = 'full' if len(seats) == TABLE_SIZE else 'bots'
+    for ticket in tickets:
+        match_wait.observe(now - ticket.queued_at, table)
+    for position, player in seats.items():
+        socketio.emit('match_found', {'game_id': game_id, 'position': position}, to=player['sid'])
+
+
+def start_matches(bucket):
+    """Open a game for every full table a bucket can make."""
+    while True:
+        table = matchmaker.match(bucket)
+        if not table:
+            break
+        seat_match(table)
+    arm_bot_fill()
+
+
+def fill_overdue_matches():
+    """Seat everyone who waited MATCH_BOT_FILL with whoever is queued, and bots."""
+    for table in matchmaker.overdue(app.config['MATCH_BOT_FILL']):
+        seat_match(table)
+    arm_bot_fill()
+
+
+def arm_bot_fill():
+    """Point the bot-fill timer at the longest-waiting ticket."""
+    delay = matchmaker.next_overdue(app.config['MATCH_BOT_FILL'])
+    if delay is None:
+        timers.cancel(('match',))
+    else:
+        timers.schedule(('match',), delay, actors.submit, 'match_overdue', MATCH_QUEUE)
+
+
+def leave_match_queue(user_id):
+    """Take a user (and their partner) out of the queue; the partner is told."""
+    for player in matchmaker.cancel(user_id):
+        if player['user_id'] != user_id:
+            socketio.emit('match_cancelled', {'reason': 'Your teammate left the queue'},
+                          to=player['sid'])
+    arm_bot_fill()
+
+
 # ============================================================================
 # Game Routes
 # ============================================================================
@@ -553,29 +776,25 @@ def game_page(game_id):
 
 @app.route('/api/games/<game_id>')
 @login_required
+@games_locked
 def get_game(game_id):
     """Get game details."""
-    game = get_or_create_game(game_id)
+    if cluster.is_local(game_id):
+        game = get_or_create_game(game_id)
+    else:
+        game = load_game_snapshot(game_id)
     if not game:
         game_session = GameSession.query.filter_by(game_id=game_id).first()
         if game_session:
             return jsonify(game_session.to_dict())
         return jsonify({'error': 'Game not found'}), 404
 
-    # Find player position if in game
-    position = None
-    for pos, player in game.players.items():
-        if player.user_id == current_user.id:
-            position = pos
-            break
-
-    is_spectator = any(s[0] == current_user.id for s in game.spectators)
-
+    position = game.position_of(current_user.id)
     if position:
         state = game.get_state_for_player(position)
         state['my_position'] = position
-    elif is_spectator:
-        state = game.get_state_for_spectator()
+    elif game.is_spectator(current_user.id):
+        state = spectator_state(game)
     else:
         # Not in game yet - basic info only
         state = {
@@ -590,6 +809,29 @@ def get_game(game_id):
     return jsonify(state)
 
 
+@app.route('/api/games/active')
+@login_required
+@games_locked
+def active_game():
+    """
+    The unfinished game the current user should rejoin, if any.
+
+    Only games loaded on this worker are indexed, so with several workers a
+    game owned by another one is not offered.
+    """
+    found = seat_index.active_game(current_user.id)
+    if found:
+        game_id, position = found
+        game_session = GameSession.query.filter_by(game_id=game_id).first()
+        if game_session and game_session.status != Game.PHASE_FINISHED:
+            return jsonify({
+                'game_id': game_id,
+                'position': position,
+                'is_spectator': position is None
+            })
+    return jsonify({'game_id': None})
+
+
 @app.route('/api/games/join/<access_code>', methods=['POST'])
 @login_required
 def join_game_by_code(access_code):
@@ -617,262 +859,522 @@ def profile():
 
 
 # ============================================================================
-# WebSocket Events
+# Static Assets
 # ============================================================================
 
-@socketio.on('connect')
-def handle_connect():
-    """Handle client connection."""
-    if current_user.is_authenticated:
-        emit('connected', {'user': current_user.to_dict()})
+# Fingerprinted copies written by build_assets.py; read once at startup
+assets = AssetManifest(os.path.join(app.static_folder, 'dist'))
+# A fingerprinted URL never changes content, so browsers keep it for a year
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 
-@socketio.on('join_game')
-def handle_join_game(data):
-    """Join a game room."""
+@app.context_processor
+def asset_helpers():
+    return {'asset_url': asset_url}
+
+
+def asset_url(name):
+    """URL of a static asset: its fingerprinted copy once built, else /static."""
+    hashed = assets.hashed(name)
+    if hashed:
+        return url_for('asset', filename=hashed)
+    return url_for('static', filename=name)
+
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Serve a fingerprinted asset, precompressed if the client accepts it."""
+    found = assets.variant(filename, lambda encoding: request.accept_encodings[encoding] > 0)
+    if not found:
+        abort(404)
+
+    path, encoding = found
+    response = send_file(path, mimetype=mimetypes.guess_type(filename)[0], conditional=True)
+    response.headers['Cache-Control'] = ASSET_CACHE_CONTROL
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# ============================================================================
+# Game Commands
+# ============================================================================
+#
+# Every state-changing socket event becomes a Command queued on the target
+# game's actor. Commands run outside the Socket.IO request context, so they
+# address the sender through caller['sid'] instead of the implicit emit().
+
+COMMAND_HANDLERS = {}  # kind -> function(game_id, data, caller)
+
+# Commands about this worker's own memory; never forwarded to the owner
+LOCAL_COMMANDS = {'discard', 'handoff', 'release', 'restore', 'drop_match_queue'}
+
+
+def game_command(kind):
+    """Register a function as the handler for a command kind."""
+    def decorator(f):
+        COMMAND_HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+def dispatch_command(command):
+    """Apply a single command inside an app context."""
+    if command.kind not in LOCAL_COMMANDS and not cluster.is_local(command.game_id):
+        # Ownership moved while the command was queued
+        cluster.forward(command)
+        return
+
+    handler = COMMAND_HANDLERS[command.kind]
+    start = time.perf_counter()
+    with app.app_context(), outbox.batch():
+        begin_db_tally()
+        try:
+            handler(command.game_id, command.payload, command.caller)
+        except StaleGameState:
+            # Someone else saved this game; drop our copy and reload next time
+            bot_scheduler.cancel(command.game_id)
+            timers.cancel(('turn', command.game_id))
+            game = active_games.pop(command.game_id, None)
+            if game:
+                game.on_seat_change = None  # The reloaded copy is indexed instead
+            if command.caller:
+                emit_error(command.caller, 'Game was updated elsewhere, please try again')
+        finally:
+            end_db_tally('command')
+    command_latency.observe(time.perf_counter() - start, command.kind)
+
+
+actors = ActorSystem(socketio.start_background_task, dispatch_command)
+
+
+def encode_frame(events, protocol):
+    """Encode events for a compact protocol, measuring binary frames."""
+    frame = encode(events, protocol)
+    if protocol == PROTOCOL_BINARY:
+        # Text frames are measured as Socket.IO serializes them
+        payload_bytes.observe(len(frame), 'msgpack')
+    return frame
+
+
+def send_frame(event, data, to=None, room=None):
+    """Emit one outbox frame, encoded for each wire protocol that needs it."""
+    events = data if event == Outbox.BATCH_EVENT else [[event, data]]
+    if room is not None:
+        socketio.emit(event, data, to=room)
+        # Compact sub-rooms nobody bound to the game is in are skipped, with
+        # their encode and (with several workers) their queue message
+        audience = room_protocols(room)
+        for protocol in COMPACT_PROTOCOLS:
+            if protocol in audience:
+                socketio.emit(WIRE_EVENT, encode_frame(events, protocol),
+                              to=room_for(room, protocol))
+        return
+
+    protocol = sessions.protocol(to)
+    if protocol == PROTOCOL_JSON:
+        socketio.emit(event, data, to=to)
+    else:
+        socketio.emit(WIRE_EVENT, encode_frame(events, protocol), to=to)
+
+
+outbox = Outbox(
+    send_frame,
+    socketio.start_background_task,
+    socketio.sleep,
+    window=app.config['EMIT_BATCH_WINDOW']
+)
+sessions = SessionRegistry()
+# Game -> (version, spectator SharedPayload); entries go when the game leaves memory
+spectator_views = weakref.WeakKeyDictionary()
+presence = Presence()
+# Presence grace periods, idle release and turn clocks, keyed ('away', game_id, user_id) /
+# ('release', game_id) / ('turn', game_id)
+timers = TaskScheduler(socketio.start_background_task, socketio.sleep)
+bot_scheduler = BotScheduler(
+    socketio.start_background_task,
+    socketio.sleep,
+    lambda game_id: actors.submit('bot_turn', game_id)
+)
+
+
+def route_command(kind, game_id, data=None, caller=None):
+    """Queue a command locally, or forward it to the game's owner worker."""
+    if cluster.is_local(game_id):
+        actors.submit(kind, game_id, data, caller)
+    else:
+        cluster.forward(Command(kind, game_id, data or {}, caller))
+
+
+def submit_command(kind, data):
+    """
+    Queue a player's game action as a command on its game's actor.
+
+    Only client-originated actions go through here and may be refused when the
+    game is behind. Commands the server raises itself (disconnects, timeouts,
+    handoffs) are routed directly, since dropping them would leave a game
+    waiting on a seat nobody holds.
+    """
     game_id = data.get('game_id')
+    if actors.pending(game_id) >= app.config['MAX_PENDING_COMMANDS']:
+        # The game is not keeping up; refuse work instead of queueing without bound
+        commands_refused[kind] = commands_refused.get(kind, 0) + 1
+        emit('error', {'message': 'Server busy, please try again'})
+        return
+
+    route_command(kind, game_id, data, current_caller())
+
+
+def current_caller():
+    """The connection and user behind the socket event being handled."""
+    return {
+        'sid': request.sid,
+        'user_id': current_user.id,
+        'username': current_user.username,
+        'protocol': connection_protocol()
+    }
+
+
+def caller_protocol(caller):
+    """Wire protocol of the connection that issued a command."""
+    return caller.get('protocol', PROTOCOL_JSON)
+
+
+def emit_error(caller, message):
+    """Send an error event to the client that issued a command."""
+    outbox.emit('error', {'message': message}, to=caller['sid'])
+
+
+def spectator_room(game_id):
+    """Room holding a game's spectator connections."""
+    return f"{game_id}/spectators"
+
+
+def room_protocols(room):
+    """Wire protocols of the connections bound to a game's room or spectator room."""
+    game_id, suffix, _ = room.partition(spectator_room(''))
+    return sessions.protocols(game_id, spectators=bool(suffix))
+
+
+def spectator_state(game):
+    """
+    The spectator view of a game, built once per saved version.
+
+    Every spectator sees the same state, so it is shared by all of them
+    until the next save bumps the version. As a SharedPayload it also keeps
+    its compact encodings, so each protocol encodes a version once for
+    the room and every late joiner or resync after it.
+    """
+    cached = spectator_views.get(game)
+    if cached is None or cached[0] != game.version:
+        view = SharedPayload(game.get_state_for_spectator())
+        cached = spectator_views[game] = (game.version, view)
+    return cached[1]
+
+
+def emit_game_state(game):
+    """
+    Send every connected viewer its own projection of the game.
+
+    Players get their seat's view (own hand only), addressed to their sid.
+    Spectators share one view, sent once to the spectator room so it is
+    encoded a single time per protocol however large the audience (compact
+    encodings are reused until the version changes; Socket.IO encodes the
+    JSON once per emit).
+    """
+    game_id = game.game_id
+    views = {}  # seat -> state, built once per seat
+    for sid, seat in list(sessions.seated(game_id).items()):
+        if seat not in views:
+            if seat not in game.players:
+                continue  # Seat was given up since the viewer joined
+            views[seat] = game.get_state_for_player(seat)
+        outbox.emit('game_state', views[seat], to=sid)
+
+    if sessions.spectator_count(game_id):
+        outbox.emit('game_state', spectator_state(game), room=spectator_room(game_id))
+
+
+def bind_viewer(game, caller, seat=None):
+    """
+    Attach the caller's connection to a game as a seat or spectator.
+
+    Also records their presence, announces a player coming back after
+    being reported away, and wakes a game that was idling.
+    """
+    game_id = game.game_id
+    sessions.bind(caller['sid'], game_id, seat, caller_protocol(caller))
+    watch_spectators(caller, game_id, seat is None)
+    timers.cancel(('release', game_id))
+    timers.cancel(('away', game_id, caller['user_id']))
+    if presence.connect(caller['sid'], game_id, caller['user_id']) and seat:
+        emit_presence(game, seat, caller['username'], True)
+        if game.current_turn == seat:
+            schedule_ai_turn(game)  # Back to the full turn clock
+
+    # Bots and turn clocks stop when a game is released; pick up where they
+    # left off (a running clock is not restarted by a reconnect)
+    if not bot_scheduler.is_pending(game_id) and not timers.is_pending(('turn', game_id)):
+        schedule_ai_turn(game)
+
+
+def watch_spectators(caller, game_id, watching=True):
+    """Add the caller's connection to a game's spectator room, or take it out."""
+    room = room_for(spectator_room(game_id), caller_protocol(caller))
+    if watching:
+        socketio.server.enter_room(caller['sid'], room, namespace='/')
+    else:
+        socketio.server.leave_room(caller['sid'], room, namespace='/')
+
+
+def emit_presence(game, seat, username, connected):
+    """Tell the table that a seated player went away or came back."""
+    outbox.emit('presence', {
+        'position': seat,
+        'username': username,
+        'connected': connected,
+        'connections': presence.connections(game.game_id)
+    }, room=game.game_id)
+
+
+def schedule_release(game_id):
+    """Drop a game from memory after IDLE_RELEASE if nobody is connected."""
+    if not presence.connections(game_id):
+        timers.schedule(('release', game_id), app.config['IDLE_RELEASE'],
+                        actors.submit, 'release', game_id)
+
+
+def send_state_to(game, caller):
+    """
+    Bind the caller's session and send them their view of the game.
+
+    Returns:
+        False if the caller holds no seat and is not spectating
+    """
+    sid = caller['sid']
+    pos = game.position_of(caller['user_id'])
+    if pos:
+        bind_viewer(game, caller, pos)
+        outbox.emit('game_state', game.get_state_for_player(pos), to=sid)
+        return True
+
+    if game.is_spectator(caller['user_id']):
+        bind_viewer(game, caller)
+        outbox.emit('game_state', spectator_state(game), to=sid)
+        return True
+
+    return False
+
+
+def emit_seats_changed(game, change):
+    """
+    Broadcast the table roster after a seat change.
+
+    Clients merge the roster into the state they hold instead of asking
+    for a fresh copy, so a join or leave costs one message per viewer.
+    """
+    outbox.emit('seats_changed', {
+        'players': {pos: p.to_dict(hide_hand=True) for pos, p in game.players.items()},
+        'spectators': list(game.spectators.values()),
+        'phase': game.phase,
+        'change': change
+    }, room=game.game_id)
+
+
+@game_command('join_game')
+def do_join_game(game_id, data, caller):
+    """Seat the caller as a player or spectator, or resend their state."""
+    sid = caller['sid']
     game = get_or_create_game(game_id)
 
     if not game:
         # Try to create from database entry
         game_session = GameSession.query.filter_by(game_id=game_id).first()
         if not game_session:
-            emit('error', {'message': 'Game not found'})
-            return
-        game = Game(game_id)
-        active_games[game_id] = game
-
-    # Update activity
-    update_game_activity(game_id)
-
-    join_room(game_id)
-
-    # Check if already in game
-    for pos, player in game.players.items():
-        if player.user_id == current_user.id:
-            # Reconnecting
-            emit('game_state', game.get_state_for_player(pos))
-            emit('player_joined', {
-                'position': pos,
-                'username': current_user.username,
-                'reconnect': True
-            }, room=game_id)
+            emit_error(caller, 'Game not found')
             return
+        game = Game(game_id, app.config['BOT_THINK_DELAY'])
+        cache_game(game)
 
-    # Check if spectator
-    if any(s[0] == current_user.id for s in game.spectators):
-        emit('game_state', game.get_state_for_spectator())
+    # Already seated or spectating - a reconnect only needs the caller's view
+    if send_state_to(game, caller):
         return
 
     # Try to join as player
     if not game.is_full:
-        success, result = game.add_player(current_user.id, current_user.username)
+        success, result = game.add_player(caller['user_id'], caller['username'])
         if success:
             save_game_state(game)
-            emit('game_state', game.get_state_for_player(result))
-            emit('player_joined', {
+            bind_viewer(game, caller, result)
+            outbox.emit('game_state', game.get_state_for_player(result), to=sid)
+            emit_seats_changed(game, {
+                'type': 'joined',
                 'position': result,
-                'username': current_user.username
-            }, room=game_id)
+                'username': caller['username']
+            })
             return
 
     # Join as spectator
-    game.add_spectator(current_user.id, current_user.username)
+    game.add_spectator(caller['user_id'], caller['username'])
     save_game_state(game)
-    emit('game_state', game.get_state_for_spectator())
-    emit('spectator_joined', {'username': current_user.username}, room=game_id)
+    bind_viewer(game, caller)
+    outbox.emit('game_state', spectator_state(game), to=sid)
+    emit_seats_changed(game, {'type': 'spectating', 'username': caller['username']})
 
 
-@socketio.on('leave_game')
-def handle_leave_game(data):
-    """Leave a game room."""
-    game_id = data.get('game_id')
-    leave_room(game_id)
+@game_command('resync')
+def do_resync(game_id, data, caller):
+    """Resend the caller's view of a game they are already in (read-only)."""
+    game = get_or_create_game(game_id)
+    if not game:
+        emit_error(caller, 'Game not found')
+        return
 
-    game = active_games.get(game_id)
+    if not send_state_to(game, caller):
+        emit_error(caller, 'You are not in this game')
+
+
+@game_command('leave_game')
+def do_leave_game(game_id, data, caller):
+    """Remove the caller's seat or spectator slot."""
+    sessions.unbind(caller['sid'])
+    watch_spectators(caller, game_id, False)
+    presence.disconnect(caller['sid'])
+    schedule_release(game_id)
+    game = get_or_create_game(game_id)
     if game:
         # Find and remove player
-        for pos, player in list(game.players.items()):
-            if player.user_id == current_user.id:
-                game.remove_player(pos)
-                emit('player_left', {'position': pos, 'username': current_user.username}, room=game_id)
-                break
+        pos = game.position_of(caller['user_id'])
+        if pos:
+            game.remove_player(pos)
 
-        game.remove_spectator(current_user.id)
+        game.remove_spectator(caller['user_id'])
         save_game_state(game)
+        emit_seats_changed(game, {
+            'type': 'left',
+            'position': pos,
+            'username': caller['username']
+        })
 
 
-@socketio.on('add_bots')
-def handle_add_bots(data):
+@game_command('add_bots')
+def do_add_bots(game_id, data, caller):
     """Add AI players to fill empty slots."""
-    game_id = data.get('game_id')
-    game = active_games.get(game_id)
+    game = get_or_create_game(game_id)
 
     if not game:
-        emit('error', {'message': 'Game not found'})
+        emit_error(caller, 'Game not found')
         return
 
     # Add bots to empty positions
-    bot_names = ['Bot_Alice', 'Bot_Bob', 'Bot_Carol', 'Bot_Dave']
-    bot_num = 0
-    positions = ['north', 'south', 'east', 'west']
-
-    for pos in positions:
-        if pos not in game.players:
-            bot_id = -1 - bot_num  # Negative IDs for bots
-            success, _ = game.add_player(bot_id, bot_names[bot_num], pos, is_ai=True)
-            if success:
-                emit('player_joined', {
-                    'position': pos,
-                    'username': bot_names[bot_num],
-                    'is_bot': True
-                }, room=game_id)
-            bot_num += 1
-
+    added = fill_with_bots(game)
     save_game_state(game)
-    emit('bots_added', {'message': f'Added {bot_num} bot(s)'}, room=game_id)
 
+    # One roster message for the whole batch
+    emit_seats_changed(game, {'type': 'bots_added', 'count': len(added)})
 
-@socketio.on('start_game')
-def handle_start_game(data):
+
+@game_command('start_game')
+def do_start_game(game_id, data, caller):
     """Start the game (host only)."""
-    game_id = data.get('game_id')
-    game = active_games.get(game_id)
+    game = get_or_create_game(game_id)
 
     if not game:
-        emit('error', {'message': 'Game not found'})
+        emit_error(caller, 'Game not found')
         return
 
     # Verify host
     game_session = GameSession.query.filter_by(game_id=game_id).first()
-    if not game_session or game_session.host_id != current_user.id:
-        emit('error', {'message': 'Only the host can start the game'})
+    if not game_session or game_session.host_id != caller['user_id']:
+        emit_error(caller, 'Only the host can start the game')
         return
 
     success, message = game.start_game()
     if not success:
-        emit('error', {'message': message})
+        emit_error(caller, message)
         return
 
     save_game_state(game)
 
-    # Send state to each player individually with their cards
-    from flask_socketio import join_room
-
     # First, broadcast to all that game started
-    emit('game_started', {
+    outbox.emit('game_started', {
         'phase': game.phase,
         'current_turn': game.current_turn,
         'message': 'Game started! Cards dealt.'
     }, room=game_id)
 
-    # Then send each player their personal state with their hand
-    socketio.emit('game_state', {
-        'phase': game.phase,
-        'players': {pos: p.to_dict(hide_hand=False) for pos, p in game.players.items()},
-        'my_position': None,
-        'current_turn': game.current_turn,
-        'high_bid': game.high_bid,
-        'high_bidder': game.high_bidder,
-        'team1_marks': game.team1_marks,
-        'team2_marks': game.team2_marks,
-        'team1_hand_points': game.team1_hand_points,
-        'team2_hand_points': game.team2_hand_points
-    }, room=game_id)
+    # Then send each viewer only their own view of the deal
+    emit_game_state(game)
 
     # If it's an AI's turn, make them act
-    if game.phase == 'bidding':
-        socketio.sleep(0.5)  # Small delay so UI can update
-        handle_ai_turn(game_id)
+    schedule_ai_turn(game)
 
 
-@socketio.on('place_bid')
-def handle_bid(data):
+@game_command('place_bid')
+def do_place_bid(game_id, data, caller):
     """Handle a bid."""
-    game_id = data.get('game_id')
     bid = data.get('bid', 0)
 
-    # Update activity
-    update_game_activity(game_id)
-
-    game = active_games.get(game_id)
+    game = get_or_create_game(game_id)
     if not game:
-        emit('error', {'message': 'Game not found'})
+        emit_error(caller, 'Game not found')
         return
 
-    # Find player position
-    position = None
-    for pos, player in game.players.items():
-        if player.user_id == current_user.id:
-            position = pos
-            break
-
+    position = game.position_of(caller['user_id'])
     if not position:
-        emit('error', {'message': 'You are not in this game'})
+        emit_error(caller, 'You are not in this game')
         return
 
     success, message = game.place_bid(position, bid)
 
     if not success:
-        emit('error', {'message': message})
+        emit_error(caller, message)
         return
 
     save_game_state(game)
 
     # Broadcast bid update
-    emit('bid_update', {
+    outbox.emit('bid_update', {
         'position': position,
         'bid': bid,
         'high_bid': game.high_bid,
         'high_bidder': game.high_bidder,
         'current_bidder': game.current_bidder,
+        'current_turn': game.current_turn,
         'phase': game.phase,
         'message': message
     }, room=game_id)
 
     # Trigger AI turn if needed
-    if game.phase == 'bidding' and game.current_bidder:
-        next_player = game.players.get(game.current_bidder)
-        if next_player and next_player.is_ai:
-            handle_ai_turn(game_id)
-    elif game.phase == 'trump_selection' and game.high_bidder:
-        bid_winner = game.players.get(game.high_bidder)
-        if bid_winner and bid_winner.is_ai:
-            handle_ai_turn(game_id)
+    schedule_ai_turn(game)
 
 
-@socketio.on('select_trump')
-def handle_trump(data):
+@game_command('select_trump')
+def do_select_trump(game_id, data, caller):
     """Handle trump selection."""
-    game_id = data.get('game_id')
     suit = data.get('suit')
 
-    game = active_games.get(game_id)
+    game = get_or_create_game(game_id)
     if not game:
-        emit('error', {'message': 'Game not found'})
+        emit_error(caller, 'Game not found')
         return
 
-    # Find player position
-    position = None
-    for pos, player in game.players.items():
-        if player.user_id == current_user.id:
-            position = pos
-            break
-
+    position = game.position_of(caller['user_id'])
     if not position:
-        emit('error', {'message': 'You are not in this game'})
+        emit_error(caller, 'You are not in this game')
         return
 
     success, message = game.select_trump(position, suit)
 
     if not success:
-        emit('error', {'message': message})
+        emit_error(caller, message)
         return
 
     save_game_state(game)
 
     # Broadcast trump selection
-    emit('trump_selected', {
+    outbox.emit('trump_selected', {
         'trump_suit': game.trump_suit,
         'current_leader': game.current_leader,
         'phase': game.phase,
@@ -880,41 +1382,28 @@ def handle_trump(data):
     }, room=game_id)
 
     # Trigger AI turn if needed
-    if game.phase == 'playing' and game.current_leader:
-        next_player = game.players.get(game.current_leader)
-        if next_player and next_player.is_ai:
-            handle_ai_turn(game_id)
+    schedule_ai_turn(game)
 
 
-@socketio.on('play_domino')
-def handle_play(data):
+@game_command('play_domino')
+def do_play_domino(game_id, data, caller):
     """Handle playing a domino."""
-    game_id = data.get('game_id')
     domino_id = data.get('domino_id')
 
-    # Update activity
-    update_game_activity(game_id)
-
-    game = active_games.get(game_id)
+    game = get_or_create_game(game_id)
     if not game:
-        emit('error', {'message': 'Game not found'})
+        emit_error(caller, 'Game not found')
         return
 
-    # Find player position
-    position = None
-    for pos, player in game.players.items():
-        if player.user_id == current_user.id:
-            position = pos
-            break
-
+    position = game.position_of(caller['user_id'])
     if not position:
-        emit('error', {'message': 'You are not in this game'})
+        emit_error(caller, 'You are not in this game')
         return
 
     success, message, trick_result = game.play_domino(position, domino_id)
 
     if not success:
-        emit('error', {'message': message})
+        emit_error(caller, message)
         return
 
     save_game_state(game)
@@ -925,6 +1414,7 @@ def handle_play(data):
         'domino_id': domino_id,
         'current_trick': [(p, d.to_dict()) for p, d in game.current_trick],
         'lead_suit': game.lead_suit,
+        'current_turn': game.current_turn,
         'phase': game.phase
     }
 
@@ -941,59 +1431,671 @@ def handle_play(data):
             play_data['game_over'] = True
             play_data['winner'] = trick_result.get('game_winner')
 
-    emit('domino_played', play_data, room=game_id)
+    outbox.emit('domino_played', play_data, room=game_id)
 
     # Send updated hand to the player who played
-    emit('hand_update', {
+    outbox.emit('hand_update', {
         'hand': [d.to_dict() for d in game.players[position].hand]
-    })
+    }, to=caller['sid'])
+
+    # A new hand was dealt - everyone needs their new view
+    if trick_result and trick_result.get('new_hand'):
+        emit_game_state(game)
 
     # Trigger AI turn if needed
-    if game.phase == 'playing' and game.current_turn:
-        next_player = game.players.get(game.current_turn)
-        if next_player and next_player.is_ai:
-            handle_ai_turn(game_id)
+    schedule_ai_turn(game)
 
 
-@socketio.on('chat_message')
-def handle_chat(data):
+@game_command('chat_message')
+def do_chat_message(game_id, data, caller):
     """Handle chat message."""
-    game_id = data.get('game_id')
     message = data.get('message', '').strip()
 
     if not message:
         return
 
-    game = active_games.get(game_id)
+    game = get_or_create_game(game_id)
     if not game:
-        emit('error', {'message': 'Game not found'})
+        emit_error(caller, 'Game not found')
         return
 
     # Check if spectator
-    is_spectator = any(s[0] == current_user.id for s in game.spectators)
+    is_spectator = game.is_spectator(caller['user_id'])
 
     # Check if in game
-    in_game = any(p.user_id == current_user.id for p in game.players.values())
+    in_game = game.position_of(caller['user_id']) is not None
 
     if not in_game and not is_spectator:
-        emit('error', {'message': 'You are not in this game'})
+        emit_error(caller, 'You are not in this game')
         return
 
     msg = game.add_chat_message(
-        current_user.id,
-        current_user.username,
+        caller['user_id'],
+        caller['username'],
         message,
         is_spectator
     )
     msg['timestamp'] = datetime.utcnow().isoformat()
+    # Chat is persisted with the next save (or when the game leaves memory)
+    game.dirty = True
+
+    outbox.emit('chat_message', msg, room=game_id)
+
+
+@game_command('start_bot_table')
+def do_start_bot_table(game_id, data, caller):
+    """Seat four bots and start a practice/demo table."""
+    game = get_or_create_game(game_id)
+    if not game:
+        return
+
+    fill_with_bots(game)
+    game.start_game()
+    save_game_state(game)
+    schedule_ai_turn(game)
+
+
+@game_command('bot_turn')
+def do_bot_turn(game_id, data, caller):
+    """Play one scheduled bot move."""
+    take_ai_turn(game_id)
+
+
+@game_command('turn_timeout')
+def do_turn_timeout(game_id, data, caller):
+    """Play for a human seat whose turn clock ran out."""
+    # The game may have been hibernated while the clock ran; reload it and
+    # make sure the same seat is still on the move in the same phase
+    game = get_or_create_game(game_id)
+    position = data['position']
+    if (not game or timers.is_pending(('turn', game_id))
+            or game.current_turn != position or game.phase != data['phase']):
+        return  # They moved (or the game went) before the command ran
+
+    outbox.emit('turn_timeout', {'position': position, 'phase': game.phase}, room=game_id)
+    phase = game.phase
+    if play_for_seat(game, position):
+        turns_autoplayed.inc(phase)
+        if phase == Game.PHASE_PLAYING:
+            hand = {'hand': [d.to_dict() for d in game.players[position].hand]}
+            for sid, seat in list(sessions.seated(game_id).items()):
+                if seat == position:
+                    outbox.emit('hand_update', hand, to=sid)
+
+
+@game_command('handoff')
+def do_handoff(game_id, data, caller):
+    """Release a game whose ownership moved to another worker."""
+    game = active_games.pop(game_id, None)
+    if not game:
+        return
+    hibernate_game(game)
+    seat_index.drop_game(game_id, game)
+
+    # Make sure bots and the turn clock keep going on the new owner
+    if bot_scheduler.is_pending(game_id) or timers.is_pending(('turn', game_id)):
+        bot_scheduler.cancel(game_id)
+        timers.cancel(('turn', game_id))
+        route_command('resume', game_id)
+
+
+@game_command('resume')
+def do_resume(game_id, data, caller):
+    """Load a game handed over by another worker and resume its bots and turn clock."""
+    game = get_or_create_game(game_id)
+    if game:
+        schedule_ai_turn(game)
+
+
+@game_command('restore')
+def do_restore(game_id, data, caller):
+    """Bring a saved game back into memory at startup and resume its bots."""
+    if game_id in active_games or not cluster.is_local(game_id):
+        return  # A returning player loaded it first, or it has moved
+
+    game = game_from_snapshot(data['state'], data['version'])
+    if game:
+        cache_game(game)
+        schedule_release(game_id)
+        schedule_ai_turn(game)
+
+
+def warm_restore():
+    """
+    Queue a restore for every recently active game this worker owns.
+
+    The snapshots come from one query; each game is then rebuilt on its own
+    actor, so restores run side by side with (and in order with) the first
+    events from returning players.
+
+    Returns:
+        Number of games queued
+    """
+    window = app.config['WARM_RESTORE_WINDOW']
+    if window <= 0:
+        return 0
+
+    since = datetime.utcnow() - timedelta(seconds=window)
+    limit = app.config['MAX_ACTIVE_GAMES']
+    with app.app_context():
+        # Other workers' games are skipped, so read enough rows for ours
+        rows = recent_snapshots(since, limit * cluster.worker_count)
+
+    queued = 0
+    for game_id, state, version in rows:
+        if queued == limit:
+            break
+        if cluster.is_local(game_id):
+            actors.submit('restore', game_id, {'state': state, 'version': version})
+            queued += 1
+    return queued
+
+
+def rebalance_games():
+    """Hand off games this worker no longer owns after a membership change."""
+    for game_id in list(active_games):
+        if not cluster.is_local(game_id):
+            actors.submit('handoff', game_id)
+    if not cluster.is_local(MATCH_QUEUE):
+        actors.submit('drop_match_queue', MATCH_QUEUE)
+
+
+@game_command('discard')
+def do_discard(game_id, data, caller):
+    """Drop a game from memory (issued by the cleanup task)."""
+    bot_scheduler.cancel(game_id)
+    timers.cancel(('release', game_id))
+    timers.cancel(('turn', game_id))
+    sessions.drop_game(game_id)
+    presence.drop_game(game_id)
+    seat_index.drop_game(game_id, active_games.pop(game_id, None))
+
+
+@game_command('disconnect')
+def do_disconnect(game_id, data, caller):
+    """A viewer's socket closed; give a seated player time to come back."""
+    sessions.unbind(caller['sid'])
+    left = presence.disconnect(caller['sid'])
+    if left is None:
+        return
+
+    _, user_id, last = left
+    game = get_or_create_game(game_id) if last else None
+    if game and game.position_of(user_id):
+        timers.schedule(('away', game_id, user_id), app.config['PRESENCE_GRACE'],
+                        actors.submit, 'presence_timeout', game_id, {'user_id': user_id})
+    schedule_release(game_id)
+
+
+@game_command('presence_timeout')
+def do_presence_timeout(game_id, data, caller):
+    """Announce a player who did not reconnect within the grace period."""
+    user_id = data['user_id']
+    if presence.is_online(game_id, user_id):
+        return
+    game = get_or_create_game(game_id)
+    if not game:
+        return
+
+    pos = game.position_of(user_id)
+    if pos:
+        presence.mark_away(game_id, user_id)
+        emit_presence(game, pos, game.players[pos].username, False)
+        if game.current_turn == pos:
+            schedule_ai_turn(game)  # Their clock now runs at bot speed
+
+
+@game_command('release')
+def do_release(game_id, data, caller):
+    """Drop an idle game from memory; it reloads from storage on the next event."""
+    if presence.connections(game_id):
+        return
+
+    bot_scheduler.cancel(game_id)
+    timers.cancel(('turn', game_id))
+    sessions.drop_game(game_id)
+    presence.drop_game(game_id)
+    game = active_games.pop(game_id, None)
+    if game:
+        hibernate_game(game)
+
+
+@game_command('queue_match')
+def do_queue_match(game_id, data, caller):
+    """Put a player in the quick-match queue and seat any table it completes."""
+    player = {'user_id': caller['user_id'], 'username': caller['username'], 'sid': caller['sid']}
+    ticket = matchmaker.enqueue(player, data['bucket'], data['team'])
+
+    status = {'team': data['team'], 'bot_fill': app.config['MATCH_BOT_FILL']}
+    if ticket is None:
+        socketio.emit('match_queued', dict(status, waiting=0, partner=None), to=caller['sid'])
+        return
+    # Both partners learn the team is complete
+    for p in ticket.players:
+        partner = next((o['username'] for o in ticket.players if o is not p), None)
+        socketio.emit('match_queued', dict(status, waiting=matchmaker.waiting(ticket.bucket),
+                                           partner=partner), to=p['sid'])
+    start_matches(ticket.bucket)
 
-    emit('chat_message', msg, room=game_id)
+
+@game_command('leave_match')
+def do_leave_match(game_id, data, caller):
+    """Take a player out of the quick-match queue."""
+    queued = matchmaker.find(caller['user_id'])
+    if queued and (not data.get('disconnected') or queued['sid'] == caller['sid']):
+        leave_match_queue(caller['user_id'])
+
+
+@game_command('drop_match_queue')
+def do_drop_match_queue(game_id, data, caller):
+    """Empty a queue this worker no longer keeps; its players queue again on the new owner."""
+    timers.cancel(('match',))
+    for player in matchmaker.clear():
+        socketio.emit('match_cancelled', {'reason': 'Matchmaking moved, please queue again'},
+                      to=player['sid'])
+
+
+@game_command('match_overdue')
+def do_match_overdue(game_id, data, caller):
+    """The longest-waiting quick-match player reached MATCH_BOT_FILL."""
+    fill_overdue_matches()
+
+
+# ============================================================================
+# WebSocket Events
+# ============================================================================
+
+# Connections to this worker: sid -> {'protocol': wire protocol, 'game_id': game being viewed}
+connections = {}
+
+# Which limit class each client event counts against
+EVENT_CLASSES = {
+    'place_bid': 'play', 'select_trump': 'play', 'play_domino': 'play',
+    'chat_message': 'chat',
+    'join_game': 'seat', 'resync': 'seat', 'leave_game': 'seat', 'add_bots': 'seat',
+    'start_game': 'seat', 'quick_match': 'seat', 'cancel_match': 'seat',
+}
+limiter = RateLimiter(app.config['RATE_LIMITS'], EVENT_CLASSES)
+commands_refused = {}  # kind -> commands dropped because the game's queue was full
+
+
+def timed_event(event):
+    """Record how long a socket event handler takes."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args):
+            with event_latency.time(event):
+                return f(*args)
+        return wrapper
+    return decorator
+
+
+def rate_limited(event):
+    """Drop a socket event that exceeds the connection's limit for its class."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args):
+            verdict = limiter.check(request.sid, event)
+            if verdict == 'allow':
+                return f(*args)
+            # Every dropped event is answered, so no client waits on a move that was never made
+            emit('rate_limited', {
+                'event': event,
+                'retry_after': round(limiter.retry_after(request.sid, event), 3)
+            })
+            if verdict == 'warn':
+                # Once per overflow, not once per dropped event
+                emit('error', {'message': 'Too many requests, slow down'})
+        return wrapper
+    return decorator
+
+
+def connection_protocol():
+    """Wire protocol negotiated by the current connection."""
+    return connections.get(request.sid, {}).get('protocol', PROTOCOL_JSON)
+
+
+def game_room(game_id):
+    """Room for a game on the current connection's wire protocol."""
+    return room_for(game_id, connection_protocol())
+
+
+def watch_game(game_id):
+    """Join a game's room and remember it so a disconnect can be reported."""
+    join_room(game_room(game_id))
+    connection = connections.get(request.sid)
+    if connection is not None:
+        connection['game_id'] = game_id
+
+
+@socketio.on('connect')
+@timed_event('connect')
+def handle_connect():
+    """Handle client connection."""
+    protocol = negotiate(request.args.get('proto', PROTOCOL_JSON))
+    connections[request.sid] = {'protocol': protocol, 'game_id': None}
+    if current_user.is_authenticated:
+        emit('connected', {'user': current_user.to_dict(), 'protocol': protocol})
+
+
+@socketio.on('join_game')
+@timed_event('join_game')
+@rate_limited('join_game')
+def handle_join_game(data):
+    """Join a game room."""
+    watch_game(data.get('game_id'))
+    submit_command('join_game', data)
+
+
+@socketio.on('resync')
+@timed_event('resync')
+@rate_limited('resync')
+def handle_resync(data):
+    """Resend the caller's game state after a reconnect, without rejoining."""
+    watch_game(data.get('game_id'))
+    submit_command('resync', data)
+
+
+@socketio.on('leave_game')
+@timed_event('leave_game')
+@rate_limited('leave_game')
+def handle_leave_game(data):
+    """Leave a game room."""
+    leave_room(game_room(data.get('game_id')))
+    connection = connections.get(request.sid)
+    if connection is not None:
+        connection['game_id'] = None
+    submit_command('leave_game', data)
+
+
+@socketio.on('add_bots')
+@timed_event('add_bots')
+@rate_limited('add_bots')
+def handle_add_bots(data):
+    """Add AI players to fill empty slots."""
+    submit_command('add_bots', data)
+
+
+@socketio.on('start_game')
+@timed_event('start_game')
+@rate_limited('start_game')
+def handle_start_game(data):
+    """Start the game (host only)."""
+    submit_command('start_game', data)
+
+
+@socketio.on('place_bid')
+@timed_event('place_bid')
+@rate_limited('place_bid')
+def handle_bid(data):
+    """Handle a bid."""
+    submit_command('place_bid', data)
+
+
+@socketio.on('select_trump')
+@timed_event('select_trump')
+@rate_limited('select_trump')
+def handle_trump(data):
+    """Handle trump selection."""
+    submit_command('select_trump', data)
+
+
+@socketio.on('play_domino')
+@timed_event('play_domino')
+@rate_limited('play_domino')
+def handle_play(data):
+    """Handle playing a domino."""
+    submit_command('play_domino', data)
+
+
+@socketio.on('chat_message')
+@timed_event('chat_message')
+@rate_limited('chat_message')
+def handle_chat(data):
+    """Handle chat message."""
+    submit_command('chat_message', data)
+
+
+@socketio.on('quick_match')
+@timed_event('quick_match')
+@rate_limited('quick_match')
+def handle_quick_match(data):
+    """
+    Queue for a quick match; 'match_found' follows once a table is ready.
+
+    Optional data: 'skill' to only meet players of a similar record, and
+    'team', a code two players both enter to sit as partners.
+    """
+    if not current_user.is_authenticated:
+        emit('error', {'message': 'Please sign in first'})
+        return
+
+    data = data or {}
+    bucket = skill_bucket(current_user.to_dict()) if data.get('skill') else None
+    team = str(data.get('team') or '').strip().upper()[:20] or None
+    match_sids.add(request.sid)
+    # The queue lives on one worker so players on every worker meet
+    route_command('queue_match', MATCH_QUEUE, {'bucket': bucket, 'team': team}, current_caller())
+
+
+@socketio.on('cancel_match')
+@timed_event('cancel_match')
+@rate_limited('cancel_match')
+def handle_cancel_match(data=None):
+    """Leave the quick-match queue."""
+    if current_user.is_authenticated:
+        match_sids.discard(request.sid)
+        route_command('leave_match', MATCH_QUEUE, {}, current_caller())
+    emit('match_cancelled', {'reason': None})
 
 
 @socketio.on('disconnect')
+@timed_event('disconnect')
 def handle_disconnect():
     """Handle client disconnect."""
-    pass  # Could implement reconnection logic here
+    connection = connections.pop(request.sid, None)
+    limiter.forget(request.sid)
+    if current_user.is_authenticated and request.sid in match_sids:
+        match_sids.discard(request.sid)
+        route_command('leave_match', MATCH_QUEUE, {'disconnected': True}, current_caller())
+    if connection and connection['game_id'] and current_user.is_authenticated:
+        # The game's owner tracks presence; let it know, however busy the game is
+        route_command('disconnect', connection['game_id'],
+                      {'game_id': connection['game_id']}, current_caller())
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+def begin_db_tally():
+    """Start counting the database work done in the current app context."""
+    g.db_queries = 0
+    g.db_time = 0.0
+
+
+def end_db_tally(source):
+    """Record the database work counted since begin_db_tally()."""
+    if 'db_queries' in g:
+        db_queries.observe(g.db_queries, source)
+        db_time.observe(g.db_time, source)
+
+
+# Registered on the Engine class so no engine is created at import time
+@event.listens_for(Engine, 'before_cursor_execute')
+def before_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def after_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    db_query_latency.observe(elapsed)
+    if has_app_context() and 'db_queries' in g:
+        g.db_queries += 1
+        g.db_time += elapsed
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    begin_db_tally()
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    http_latency.observe(time.perf_counter() - g.request_start, route, request.method)
+    end_db_tally('http')
+    return response
+
+
+metrics.gauge('game42_active_games', 'Games held in memory', lambda: len(active_games))
+metrics.gauge('game42_connections', 'Open Socket.IO connections', lambda: len(connections))
+metrics.gauge('game42_spectators', 'Spectator connections to games in memory',
+              lambda: sessions.spectator_total())
+metrics.gauge('game42_pending_commands', 'Games with queued commands', lambda: len(actors))
+for counter, description in (('hits', 'Game lookups served from memory'),
+                             ('misses', 'Game lookups that had to load from storage'),
+                             ('evictions', 'Games hibernated to stay within MAX_ACTIVE_GAMES')):
+    metrics.counter_from(f'game42_game_cache_{counter}_total', description,
+                         lambda counter=counter: active_games.stats()[counter])
+metrics.counter_from('game42_socket_events_allowed_total', 'Socket events within their rate limit',
+                     lambda: {(cls,): n['allowed'] for cls, n in limiter.stats().items()}, labels=('class',))
+metrics.counter_from('game42_socket_events_dropped_total', 'Socket events dropped by the rate limit',
+                     lambda: {(cls,): n['dropped'] for cls, n in limiter.stats().items()}, labels=('class',))
+metrics.counter_from('game42_commands_refused_total',
+                     'Commands refused because their game had MAX_PENDING_COMMANDS queued',
+                     lambda: {(kind,): n for kind, n in commands_refused.items()},
+                     labels=('command',))
+metrics.gauge('game42_match_queue', 'Players waiting for a quick match', lambda: len(matchmaker))
+metrics.gauge('game42_pending_timers', 'Turn clocks, grace periods and idle releases armed',
+              lambda: len(timers))
+metrics.gauge('game42_startup_seconds', 'Seconds this worker took to start',
+              lambda: startup_seconds)
+
+
+def scraper_required(f):
+    """Allow only requests from the addresses in METRICS_ALLOW."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        try:
+            address = ipaddress.ip_address(request.remote_addr or '')
+        except ValueError:
+            abort(403)
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not any(address in network for network in app.config['METRICS_ALLOW']):
+            abort(403)
+        return f(*args, **kwargs)
+    return wrapper
+
+
+@app.route('/metrics')
+@scraper_required
+@games_locked
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    return metrics.render(), 200, {'Content-Type': MetricsRegistry.CONTENT_TYPE}
+
+
+# ============================================================================
+# Admin Routes
+# ============================================================================
+
+# Profiles this worker on request; nothing is hooked until a run starts
+profiler = Profiler(COMMAND_HANDLERS, threads=running_threads, timers=timers)
+
+
+def admin_required(f):
+    """Allow only the registered users named in ADMIN_USERS."""
+    @wraps(f)
+    @login_required
+    def wrapper(*args, **kwargs):
+        if current_user.is_guest or current_user.username not in app.config['ADMIN_USERS']:
+            abort(403)
+        return f(*args, **kwargs)
+    return wrapper
+
+
+@app.route('/admin/profile')
+@admin_required
+@games_locked
+def list_profiles():
+    """Recent profiling runs on this worker."""
+    return jsonify({'runs': [run.to_dict() for run in profiler.runs.values()]})
+
+
+@app.route('/admin/profile/sample', methods=['POST'])
+@admin_required
+@games_locked
+def start_sampling():
+    """Sample the server's stacks for `seconds` (collapsed stacks)."""
+    data = request.get_json(silent=True) or {}
+    try:
+        seconds = float(data.get('seconds', 10))
+        interval = float(data.get('interval', 0.005))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'seconds and interval must be numbers'}), 400
+    if seconds <= 0 or interval <= 0:
+        return jsonify({'error': 'seconds and interval must be positive'}), 400
+
+    run = profiler.sample(seconds, interval)
+    return jsonify(run.to_dict()), 202
+
+
+@app.route('/admin/profile/calls', methods=['POST'])
+@admin_required
+@games_locked
+def start_call_profile():
+    """Profile the next `count` handlings of a socket event, for at most `seconds` (pstats)."""
+    data = request.get_json(silent=True) or {}
+    event = data.get('event')
+    try:
+        count = int(data.get('count', 10))
+        seconds = float(data.get('seconds', Profiler.MAX_SECONDS))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'count and seconds must be numbers'}), 400
+    if event not in COMMAND_HANDLERS:
+        return jsonify({'error': f"Unknown event: {event}"}), 400
+    if not 0 < count <= Profiler.MAX_CALLS:
+        return jsonify({'error': f"count must be between 1 and {Profiler.MAX_CALLS}"}), 400
+    if seconds <= 0:
+        return jsonify({'error': 'seconds must be positive'}), 400
+
+    try:
+        run = profiler.calls(event, count, seconds)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 409
+    return jsonify(run.to_dict()), 202
+
+
+@app.route('/admin/profile/<run_id>/cancel', methods=['POST'])
+@admin_required
+@games_locked
+def cancel_profile(run_id):
+    """Stop a run early; it keeps what it has collected."""
+    run = profiler.cancel(run_id)
+    if not run:
+        return jsonify({'error': 'Profile not found'}), 404
+    return jsonify(run.to_dict())
+
+
+@app.route('/admin/profile/<run_id>')
+@admin_required
+@games_locked
+def download_profile(run_id):
+    """Download a finished run, or its progress while it is still going."""
+    run = profiler.get(run_id)
+    if not run:
+        return jsonify({'error': 'Profile not found'}), 404
+    if not run.done:
+        return jsonify(run.to_dict()), 202
+
+    mimetype = 'text/plain' if run.kind == run.SAMPLE else 'application/octet-stream'
+    return app.response_class(run.result, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename={run.filename}'
+    })
 
 
 # ============================================================================
@@ -1010,17 +2112,62 @@ def server_error(e):
     return render_template('base.html', error='Server error'), 500
 
 
+# Seconds spent loading this module; start_services() adds the database and cluster setup
+startup_seconds = time.perf_counter() - _startup_began
+
+
 # ============================================================================
-# Main Entry Point
+# Server Lifecycle
 # ============================================================================
 
-if __name__ == '__main__':
+def start_services():
+    """
+    Get a worker ready to serve: tables, cleanup, cluster membership and
+    the warm restore.
+
+    Returns:
+        Number of games queued for warm restore
+    """
+    global startup_seconds
     with app.app_context():
         db.create_all()
 
     # Start cleanup thread
     start_cleanup_thread()
 
+    if cluster.worker_count > 1:
+        # A user changed or deleted on any worker leaves every worker's cache
+        cluster.broker.subscribe(
+            USERS_CHANNEL, lambda message: user_cache.invalidate(message['user_id'], notify=False))
+        user_cache.on_invalidate = lambda user_id: cluster.broker.publish(
+            USERS_CHANNEL, {'user_id': user_id})
+
+    # Accept commands forwarded by other workers
+    cluster.start(
+        socketio.start_background_task,
+        socketio.sleep,
+        lambda command: actors.submit(*command),
+        on_change=rebalance_games,
+        listen=start_listener
+    )
+    # Tables are back before players are; rebuilt as soon as the server runs
+    restoring = warm_restore()
+    startup_seconds = time.perf_counter() - _startup_began
+    return restoring
+
+
+def stop_services():
+    """Leave the ring, then pass games with pending bot turns to their new owners."""
+    cluster.stop()
+    for game_id in list(active_games):
+        do_handoff(game_id, {}, None)
+    do_drop_match_queue(MATCH_QUEUE, {}, None)
+
+
+def announce(restoring):
+    """Print where the server can be reached."""
+    port = app.config['PORT']
+
     # Get local IP for network access info
     import socket
     hostname = socket.gethostname()
@@ -1032,11 +2179,40 @@ if __name__ == '__main__':
     print("\n" + "=" * 50)
     print("GAME 42 - Texas 42 Domino Game")
     print("=" * 50)
-    print(f"\nServer starting...")
-    print(f"\nLocal access:   http://localhost:8080")
-    print(f"Network access: http://{local_ip}:8080")
+    print(f"\nServer starting ({app.config['ASYNC_MODE']})...")
+    print(f"\nLocal access:   http://localhost:{port}")
+    print(f"Network access: http://{local_ip}:{port}")
+    print(f"Started in:     {startup_seconds:.2f}s")
+    print(f"Warm restore:   {restoring} recent game(s)")
     print("\nShare the network address with players on your WiFi!")
     print("Cleanup thread started (runs every hour)")
+    if cluster.worker_count > 1:
+        print(f"Worker {cluster.worker_id + 1} of {cluster.worker_count}")
     print("=" * 50 + "\n")
 
-    socketio.run(app, host='0.0.0.0', port=8080, debug=True)
+
+def asgi_application():
+    """The ASGI app for ASYNC_MODE=asyncio; services start with the server."""
+    return socketio.asgi_app(
+        on_startup=lambda: announce(start_services()),
+        on_shutdown=stop_services
+    )
+
+
+# ============================================================================
+# Main Entry Point
+# ============================================================================
+
+if __name__ == '__main__':
+    if app.config['ASYNC_MODE'] == 'asyncio':
+        import uvicorn
+        uvicorn.run(asgi_application(), host='0.0.0.0', port=app.config['PORT'])
+    else:
+        announce(start_services())
+
+        # The reloader would fork a second copy of each worker
+        try:
+            socketio.run(app, host='0.0.0.0', port=app.config['PORT'], debug=True,
+                         use_reloader=cluster.worker_count == 1)
+        finally:
+            stop_services()
@@ -0,0 +1,18 @@
+"""
+GAME 42 - ASGI Entry Point
+==========================
+Runs the server on asyncio instead of eventlet, with the same events and
+game code:
+
+    uvicorn asgi:application --host 0.0.0.0 --port 8080
+
+Requires a2wsgi and uvicorn (or another ASGI server).
+"""
+
+import os
+
+os.environ['ASYNC_MODE'] = 'asyncio'
+
+from app import asgi_application
+
+application = asgi_application()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+eventlet vs asyncio
+===================
+Runs the load test against a fresh local server in each ASYNC_MODE, with
+the same table counts, duration and seed, and prints the two side by side.
+
+Each server is started from app.py on its own port with an empty temporary
+SQLite database, the load test's SERVER_ENV (no bot think time, rate limits
+out of the way) and no warm restore, and is stopped once its stages are done.
+
+Usage:
+    python benchmarks/async_modes.py --tables 5,25,50 --duration 20
+    python benchmarks/async_modes.py --modes asyncio --humans 2
+
+Requires the load test's client extras and, for asyncio, uvicorn and a2wsgi.
+"""
+
+import os
+import sys
+import time
+import signal
+import argparse
+import tempfile
+import subprocess
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_test  # Same directory; its import also checks the client extras
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ('eventlet', 'asyncio')
+
+
+def start_server(mode, port, log):
+    """Start app.py in `mode` and wait until it answers HTTP."""
+    database = os.path.join(tempfile.mkdtemp(prefix=f'game42-{mode}-'), 'game.db')
+    env = dict(
+        os.environ,
+        ASYNC_MODE=mode,
+        PORT=str(port),
+        DATABASE_URL=f'sqlite:///{database}',
+        WARM_RESTORE_WINDOW='0',
+        **load_test.SERVER_ENV
+    )
+    # Own process group: the eventlet server's reloader forks a child
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=ROOT, env=env,
+                               stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'http://localhost:{port}/auth', timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    stop_server(process)
+    sys.exit(f'The {mode} server did not start; see {log.name}')
+
+
+def stop_server(process):
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare eventlet and asyncio server modes')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--tables', default='5,25,50',
+                        type=lambda v: sorted(int(n) for n in v.split(',')),
+                        help='Comma separated table counts, one stage each')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds measured per stage')
+    parser.add_argument('--humans', type=int, default=1, choices=range(1, 5),
+                        help='Simulated players per table (the rest are bots)')
+    parser.add_argument('--bot-delay', type=float, default=0.2, help='Bot think time per table')
+    parser.add_argument('--port', type=int, default=8090, help='Port of the first server')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed, reused for every mode')
+    args = parser.parse_args()
+
+    results = {}
+    for offset, mode in enumerate(args.modes):
+        port = args.port + offset
+        log = open(os.path.join(tempfile.gettempdir(), f'game42-{mode}.log'), 'w')
+        print(f"\n== {mode} (port {port}, server log {log.name})")
+        process = start_server(mode, port, log)
+        try:
+            load_test.random.seed(args.seed)
+            results[mode] = load_test.run(SimpleNamespace(
+                url=f'http://localhost:{port}', tables=args.tables, duration=args.duration,
+                humans=args.humans, bot_delay=args.bot_delay, json=False
+            ))
+        finally:
+            stop_server(process)
+            log.close()
+
+    print(f"\n{'tables':>6}" + ''.join(
+        f"{mode + ' p50':>14}{'p95':>8}{'p99':>8}{'events/s':>10}{'limited':>9}{'errors':>8}"
+        for mode in results))
+    for stage, tables in enumerate(args.tables):
+        row = f"{tables:>6}"
+        for mode, stages in results.items():
+            r = stages[stage]
+            row += (f"{r['p50_ms']:>14.1f}{r['p95_ms']:>8.1f}{r['p99_ms']:>8.1f}"
+                    f"{r['events_per_sec']:>10.0f}{r['limited']:>9}{r['errors']:>8}")
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
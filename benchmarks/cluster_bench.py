@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Cluster Scaling Benchmark
+=========================
+Measures games/sec and events/sec as the number of worker processes grows.
+
+For each worker count it starts real servers with run_workers.py, sharing a
+message queue and a fresh database, and drives every worker with its own
+load_test.py client. A table's game is owned by whichever worker its id
+hashes to, so most commands are forwarded to another worker and its
+broadcasts come back through the queue, as in production. Without --queue
+the workers share the in-process Redis stand-in (../redis_standin.py).
+
+The workers run with the load test's SERVER_ENV, so their rate limits stay
+out of the way. Each row reports the games finished and events received by
+all clients per second, the slowest client's p95 action latency, actions the
+workers rate limited anyway, and errors. Throughput
+only grows while there are free cores for both the workers and the clients.
+
+Usage:
+    python benchmarks/cluster_bench.py --workers 1 2 4 --tables 10 --duration 20
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redis_standin import RedisStandin, wait_for_port
+from benchmarks.load_test import SERVER_ENV
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOAD_TEST = os.path.join(PROJECT_DIR, 'benchmarks', 'load_test.py')
+
+
+def free_ports(count):
+    """A run of `count` consecutive free localhost ports."""
+    while True:
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            base = s.getsockname()[1]
+        if base + count < 65536 and all(_free(base + i) for i in range(1, count)):
+            return base
+
+
+def _free(port):
+    with socket.socket() as s:
+        return s.connect_ex(('127.0.0.1', port)) != 0
+
+
+def run(worker_count, args, queue):
+    """Start worker_count workers, load them, and stop them."""
+    base_port = free_ports(worker_count)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, **SERVER_ENV, DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+                   BOT_THINK_DELAY=str(args.bot_delay))
+        env.pop('WORKER_COUNT', None)  # run_workers.py sets it per worker
+        launcher = subprocess.Popen(
+            [sys.executable, 'run_workers.py', '--workers', str(worker_count),
+             '--base-port', str(base_port), '--queue', queue],
+            cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        try:
+            if not all(wait_for_port(base_port + i) for i in range(worker_count)):
+                raise RuntimeError(f"{worker_count} workers did not start")
+
+            clients = [
+                subprocess.Popen(
+                    [sys.executable, LOAD_TEST, '--url', f"http://127.0.0.1:{base_port + i}",
+                     '--tables', str(args.tables), '--duration', str(args.duration),
+                     '--bot-delay', str(args.bot_delay), '--seed', str(i), '--json'],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+                )
+                for i in range(worker_count)
+            ]
+            stages = [json.loads(client.communicate()[0])[-1] for client in clients]
+        finally:
+            os.killpg(launcher.pid, signal.SIGINT)
+            launcher.wait()
+
+    seconds = max(stage['seconds'] for stage in stages)
+    games = sum(stage['games'] for stage in stages)
+    return {
+        'workers': worker_count,
+        'tables': sum(stage['tables'] for stage in stages),
+        'games': games,
+        'games_per_sec': round(games / seconds, 2),
+        'events_per_sec': round(sum(stage['events_per_sec'] for stage in stages), 1),
+        'p95_ms': round(max(stage['p95_ms'] for stage in stages), 1),
+        'limited': sum(stage['limited'] for stage in stages),
+        'errors': sum(stage['errors'] for stage in stages)
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='GAME 42 cluster scaling benchmark')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[n for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)] or [1],
+                        help='Worker counts to measure')
+    parser.add_argument('--tables', type=int, default=10, help='Tables per worker')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds measured per run')
+    parser.add_argument('--bot-delay', type=float, default=0, help='Bot think time per table')
+    parser.add_argument('--queue', default=None,
+                        help='Redis-compatible queue URL (default: an in-process stand-in)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    standin = None if args.queue else RedisStandin().start()
+    try:
+        results = [run(n, args, args.queue or standin.url) for n in args.workers]
+    finally:
+        if standin:
+            standin.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'workers':>8} {'tables':>7} {'games/s':>9} {'events/s':>10} {'p95 ms':>8} "
+          f"{'limited':>8}  errors")
+    for r in results:
+        print(f"{r['workers']:>8} {r['tables']:>7} {r['games_per_sec']:>9} "
+              f"{r['events_per_sec']:>10} {r['p95_ms']:>8} {r['limited']:>8}  {r['errors']}")
+
+
+if __name__ == '__main__':
+    main()
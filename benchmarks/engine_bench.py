@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Engine Micro-Benchmarks
+=======================
+Times the game engine and persistence hot paths with fixed seeds:
+
+    play_domino            Game.play_domino, one call on a mid-hand game
+    trick_winner           scoring.determine_trick_winner on a full trick
+    playable_dominoes      Player.get_playable_dominoes while following suit
+    state_for_player       Game.get_state_for_player mid-hand
+    to_dict / from_dict    Game snapshot round trip
+    save_game_state        game_store.save_game_state against a temporary SQLite file
+    full_hand              ai.fast_forward_hand from the deal to the last trick
+
+Each benchmark reports ops/sec (median of --rounds timed rounds) and the
+peak bytes allocated during one call (tracemalloc, measured in a separate
+pass so tracing does not slow the timed rounds). Per-call setup such as
+dealing a fresh game runs outside the timed section.
+
+Results can be saved as a JSON baseline and later compared against it;
+the comparison exits with status 1 when a benchmark gets slower, or
+allocates more, by more than --threshold percent.
+
+Usage:
+    python benchmarks/engine_bench.py
+    python benchmarks/engine_bench.py --save baseline.json
+    python benchmarks/engine_bench.py --compare baseline.json --threshold 10
+    python benchmarks/engine_bench.py --only play_domino full_hand
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import itertools
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic.game import Game
+from game_logic.player import Player
+from game_logic.domino import Domino
+from game_logic.scoring import determine_trick_winner
+from game_logic.ai import choose_bid, choose_trump, choose_domino, fast_forward_hand
+
+BENCHMARKS = {}  # name -> factory(seed) returning (prepare, op)
+
+
+def benchmark(name):
+    """
+    Register a benchmark factory.
+
+    The factory builds its fixtures from a seed and returns (prepare, op):
+    prepare() makes the arguments for one call (untimed), op(*args) is the
+    call being measured.
+    """
+    def decorator(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return decorator
+
+
+# ----------------------------------------------------------------------------
+# Fixtures
+# ----------------------------------------------------------------------------
+
+def new_game(seed, game_id='bench'):
+    """A four-bot game, dealt with a fixed seed and ready to bid."""
+    random.seed(seed)
+    game = Game(game_id, bot_delay=0)
+    for i, name in enumerate(['Bot_Alice', 'Bot_Bob', 'Bot_Carol', 'Bot_Dave']):
+        game.add_player(-1 - i, name, is_ai=True)
+    game.start_game()
+    return game
+
+
+def bot_move(game):
+    """Apply one bot move."""
+    position = game.current_turn
+    if game.phase == Game.PHASE_BIDDING:
+        game.place_bid(position, choose_bid(game, position))
+    elif game.phase == Game.PHASE_TRUMP_SELECTION:
+        game.select_trump(position, choose_trump(game, position))
+    else:
+        game.play_domino(position, choose_domino(game, position).id)
+
+
+def mid_hand_game(seed, plays=9):
+    """A game in the playing phase with `plays` dominoes already played."""
+    game = new_game(seed)
+    while game.phase != Game.PHASE_PLAYING:
+        bot_move(game)
+    for _ in range(plays):
+        bot_move(game)
+    return game
+
+
+# ----------------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------------
+
+@benchmark('play_domino')
+def bench_play_domino(seed):
+    snapshot = mid_hand_game(seed).to_dict()
+
+    def prepare():
+        game = Game.from_dict(snapshot)
+        position = game.current_turn
+        return game, position, choose_domino(game, position).id
+
+    def op(game, position, domino_id):
+        game.play_domino(position, domino_id)
+
+    return prepare, op
+
+
+@benchmark('trick_winner')
+def bench_trick_winner(seed):
+    random.seed(seed)
+    dominoes = random.sample([Domino(h, l) for h in range(7) for l in range(h + 1)], 4)
+    trick = list(zip(Player.PLAY_ORDER, dominoes))
+    lead_suit = dominoes[0].high
+    trump_suit = (lead_suit + 3) % 7
+    args = (trick, lead_suit, trump_suit)
+    return (lambda: args), determine_trick_winner
+
+
+@benchmark('playable_dominoes')
+def bench_playable_dominoes(seed):
+    game = mid_hand_game(seed, plays=1)
+    player = game.players[game.current_turn]
+    args = (game.lead_suit, game.trump_suit)
+    return (lambda: args), player.get_playable_dominoes
+
+
+@benchmark('state_for_player')
+def bench_state_for_player(seed):
+    game = mid_hand_game(seed)
+    args = (game.current_turn,)
+    return (lambda: args), game.get_state_for_player
+
+
+@benchmark('to_dict')
+def bench_to_dict(seed):
+    game = mid_hand_game(seed)
+    return (lambda: ()), game.to_dict
+
+
+@benchmark('from_dict')
+def bench_from_dict(seed):
+    args = (mid_hand_game(seed).to_dict(),)
+    return (lambda: args), Game.from_dict
+
+
+@benchmark('save_game_state')
+def bench_save_game_state(seed):
+    from config import create_app
+    from models import db
+    from models.game_session import GameSession
+    from models.game_store import save_game_state
+    from models.user import User
+
+    # A throwaway app on a temporary database, without the web server
+    path = os.path.join(tempfile.mkdtemp(prefix='game42-bench-'), 'bench.db')
+    bench_app = create_app(SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}')
+
+    context = bench_app.app_context()
+    context.push()
+    db.create_all()
+    host = User(username='bench_host', password_hash='-')
+    db.session.add(host)
+    db.session.commit()
+
+    game = mid_hand_game(seed)
+    session = GameSession(game_id=game.game_id, name='bench', host_id=host.id)
+    session.game_state = game.to_dict()
+    db.session.add(session)
+    db.session.commit()
+
+    return (lambda: (game,)), save_game_state
+
+
+@benchmark('full_hand')
+def bench_full_hand(seed):
+    seeds = itertools.count(seed)  # A different deal every call, same sequence every run
+
+    def prepare():
+        return (new_game(next(seeds)),)
+
+    return prepare, fast_forward_hand
+
+
+# ----------------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------------
+
+def time_round(prepare, op, min_time):
+    """Call op until min_time seconds of calls are timed; return ops/sec."""
+    calls = 0
+    elapsed = 0.0
+    clock = time.perf_counter
+    while elapsed < min_time:
+        args = prepare()
+        start = clock()
+        op(*args)
+        elapsed += clock() - start
+        calls += 1
+    return calls / elapsed
+
+
+def peak_allocation(prepare, op, calls=50):
+    """Mean peak bytes allocated while op runs."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            args = prepare()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            op(*args)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            del args
+    finally:
+        tracemalloc.stop()
+    return int(statistics.mean(peaks))
+
+
+def run_benchmark(name, seed, rounds, min_time):
+    prepare, op = BENCHMARKS[name](seed)
+    time_round(prepare, op, min_time / 4)  # Warm-up
+    rates = [time_round(prepare, op, min_time) for _ in range(rounds)]
+    return {
+        'ops_per_sec': round(statistics.median(rates), 1),
+        'spread_pct': round((max(rates) - min(rates)) / statistics.median(rates) * 100, 1),
+        'peak_alloc_bytes': peak_allocation(prepare, op)
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print each benchmark against the baseline; return names that regressed."""
+    regressed = []
+    print(f"\n{'benchmark':<20}{'ops/sec':>12}{'baseline':>12}{'change':>9}"
+          f"{'alloc':>10}{'baseline':>10}{'change':>9}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<20}{result['ops_per_sec']:>12.1f}{'-':>12}")
+            continue
+        speed = (result['ops_per_sec'] / base['ops_per_sec'] - 1) * 100
+        alloc = (result['peak_alloc_bytes'] / max(base['peak_alloc_bytes'], 1) - 1) * 100
+        flag = ''
+        if speed < -threshold or alloc > threshold:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<20}{result['ops_per_sec']:>12.1f}{base['ops_per_sec']:>12.1f}{speed:>+8.1f}%"
+              f"{result['peak_alloc_bytes']:>10}{base['peak_alloc_bytes']:>10}{alloc:>+8.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GAME 42 engine micro-benchmarks')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Benchmarks to run')
+    parser.add_argument('--seed', type=int, default=42, help='Fixture seed')
+    parser.add_argument('--rounds', type=int, default=5, help='Timed rounds per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds timed per round')
+    parser.add_argument('--save', metavar='FILE', help='Write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='Compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent slowdown or extra allocation that counts as a regression')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'benchmark':<20}{'ops/sec':>12}{'spread':>9}{'peak alloc':>12}")
+    for name in args.only or BENCHMARKS:
+        results[name] = run_benchmark(name, args.seed, args.rounds, args.min_time)
+        r = results[name]
+        print(f"{name:<20}{r['ops_per_sec']:>12.1f}{r['spread_pct']:>8.1f}%{r['peak_alloc_bytes']:>11}B")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'seed': args.seed,
+                'results': results
+            }, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressed = compare(results, baseline['results'], args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} regression(s) beyond {args.threshold}%: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
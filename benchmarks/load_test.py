@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Socket.IO Load Test
+===================
+Finds how many concurrent tables one server process can sustain.
+
+Each table is one or more simulated players (python-socketio clients)
+plus bots. A player signs in as a guest, creates or joins a game, and
+follows the same event flow as static/js/game.js. It keeps the table's
+state from game_state, bid_update, trump_selected, domino_played and
+hand_update, and bids, picks trump and plays a legal domino when its
+turn comes. Finished games are replaced by new ones.
+
+The number of tables rises in stages. For each stage the tool reports:
+  - action latency: time from emitting a bid, trump or play until the
+    server's broadcast of that action reaches the player (p50/p95/p99)
+  - events/sec: events received by all players
+  - limited: actions and requests the server dropped for its rate limits
+  - errors: error events, failed connections and stalled tables
+
+The server's per-connection rate limits are meant for people, not for
+players that act the instant their turn comes; at the default limits a run
+mostly measures rate-limit stalls. Start the server with SERVER_ENV (below)
+so the limits stay out of the way; the tool warns when actions were limited.
+Run it against a local server only, e.g.:
+    BOT_THINK_DELAY=0 RATE_LIMIT_PLAY=1000:1000 RATE_LIMIT_SEAT=1000:1000 python app.py
+    python benchmarks/load_test.py --tables 1,5,10,25 --duration 20
+
+Requires the Socket.IO client extras: pip install "python-socketio[client]"
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import requests
+    import socketio
+except ImportError:
+    sys.exit('The load test needs the Socket.IO client: pip install "python-socketio[client]"')
+
+from game_logic.domino import Domino
+from game_logic.player import Player
+
+# Seconds without an event before a table counts as stalled and resyncs
+STALL_TIMEOUT = 10
+
+# Environment for a server under load: no bot think time, and rate limits
+# well above what the simulated players send
+SERVER_ENV = {
+    'BOT_THINK_DELAY': '0',
+    'RATE_LIMIT_PLAY': '1000:1000',
+    'RATE_LIMIT_SEAT': '1000:1000'
+}
+
+
+class Stats:
+    """Counters shared by every simulated player, reset per stage."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.latencies = []
+            self.events = 0
+            self.actions = 0
+            self.limited = 0
+            self.errors = Counter()
+            self.games_finished = 0
+            self.started = time.monotonic()
+
+    def latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def count(self, field, amount=1):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def error(self, kind):
+        with self.lock:
+            self.errors[kind] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return (sorted(self.latencies), self.events, self.actions, self.limited,
+                    dict(self.errors), self.games_finished, time.monotonic() - self.started)
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return float('nan')
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class SimulatedPlayer:
+    """One browser tab: a guest account, a socket, and the table it plays at."""
+
+    def __init__(self, url, stats):
+        self.url = url
+        self.stats = stats
+        self.http = requests.Session()
+        self.sio = socketio.Client(http_session=self.http, reconnection=False)
+        self.game_id = None
+        self.position = None
+        self.state = {}
+        self.hand = []
+        self.pending = None  # (action, position it was sent for, monotonic time sent)
+        self.hold_until = 0  # Monotonic time the server allows our next rate-limited event
+        self.last_event = time.monotonic()
+        self.lock = threading.Lock()
+
+        for event in ('game_state', 'bid_update', 'trump_selected', 'domino_played',
+                      'hand_update', 'game_started', 'seats_changed', 'hand_summary',
+                      'presence', 'chat_message', 'connected'):
+            self.sio.on(event, self._handler(event))
+        self.sio.on('batch', self._on_batch)
+        self.sio.on('error', self._on_error)
+        self.sio.on('rate_limited', self._on_rate_limited)
+
+    def sign_in(self):
+        response = self.http.post(f'{self.url}/api/guest')
+        response.raise_for_status()
+
+    def create_game(self, bot_delay):
+        response = self.http.post(f'{self.url}/api/games', json={
+            'name': 'Load test', 'is_public': False, 'bot_delay': bot_delay
+        })
+        response.raise_for_status()
+        return response.json()['game_id']
+
+    def join(self, game_id):
+        """Connect (once) and take a seat at a game."""
+        with self.lock:
+            self.game_id = game_id
+            self.position = None
+            self.state = {}
+            self.hand = []
+            self.pending = None
+        if not self.sio.connected:
+            self.sio.connect(self.url, transports=['websocket'])
+        self.send('join_game', {'game_id': game_id})
+
+    def close(self):
+        if self.sio.connected:
+            self.sio.disconnect()
+
+    # -- events ----------------------------------------------------------
+
+    def _handler(self, event):
+        def handle(data=None):
+            self._apply(event, data or {})
+        return handle
+
+    def _on_batch(self, events):
+        for event, data in events:
+            if event == 'error':
+                self._on_error(data)
+            elif event == 'rate_limited':
+                self._on_rate_limited(data)
+            else:
+                self._apply(event, data)
+
+    def _on_error(self, data):
+        if time.monotonic() < self.hold_until:
+            return  # The warning that comes with a rate-limited event, already counted
+        self.stats.error(data.get('message', 'error') if isinstance(data, dict) else 'error')
+        with self.lock:
+            self.pending = None
+        self.resync()
+
+    def _on_rate_limited(self, data):
+        """The server dropped one of our events; pick the game up again once allowed."""
+        self.stats.count('limited')
+        retry_after = data.get('retry_after', 0)
+        with self.lock:
+            self.pending = None
+            self.hold_until = time.monotonic() + retry_after
+        timer = threading.Timer(retry_after, self.resync)
+        timer.daemon = True
+        timer.start()
+
+    def resync(self):
+        if self.game_id:
+            self.send('resync', {'game_id': self.game_id})
+
+    def _apply(self, event, data):
+        now = time.monotonic()
+        self.stats.count('events')
+        with self.lock:
+            self.last_event = now
+            if data.get('game_id', self.game_id) != self.game_id:
+                return  # Late event from the previous game
+            self._settle(event, data, now)
+
+            if event == 'game_state':
+                self.state = data
+                self.position = data.get('my_position') or self.position
+                mine = data.get('players', {}).get(self.position, {})
+                self.hand = mine.get('hand') or []
+            elif event == 'hand_update':
+                self.hand = data['hand']
+            elif event in ('bid_update', 'trump_selected', 'domino_played', 'game_started'):
+                self.state.update({k: v for k, v in data.items() if k != 'position'})
+                if event == 'trump_selected':
+                    self.state['current_turn'] = data['current_leader']  # The bid winner leads
+            if event == 'domino_played' and data.get('game_over'):
+                self.state['phase'] = 'finished'
+
+            action = self._next_action()
+        if action:
+            self.send(*action)
+
+    def send(self, event, data):
+        try:
+            self.sio.emit(event, data)
+        except socketio.exceptions.SocketIOError:
+            self.stats.error('disconnected')
+
+    def _settle(self, event, data, now):
+        """Time the broadcast of our own pending action."""
+        if not self.pending:
+            return
+        action, position, sent = self.pending
+        ours = (
+            (action == 'place_bid' and event == 'bid_update' and data.get('position') == position)
+            or (action == 'select_trump' and event == 'trump_selected')
+            or (action == 'play_domino' and event == 'domino_played' and data.get('position') == position)
+        )
+        if ours:
+            self.stats.latency(now - sent)
+            self.pending = None
+            if action == 'play_domino':
+                # hand_update follows, but we may lead the next trick before it arrives
+                self.hand = [d for d in self.hand if d['id'] != data.get('domino_id')]
+
+    # -- decisions -------------------------------------------------------
+
+    def _next_action(self):
+        """Decide on a move if it is our turn; returns (event, data) or None."""
+        state = self.state
+        if self.pending or not self.position or state.get('current_turn') != self.position:
+            return None
+        if time.monotonic() < self.hold_until:
+            return None  # Sent too fast; the resync after the hold brings us back
+
+        phase = state.get('phase')
+        if phase == 'bidding':
+            high_bid = state.get('high_bid') or 29
+            bid = high_bid + 1 if high_bid < 34 and random.random() < 0.3 else 0
+            action = ('place_bid', {'game_id': self.game_id, 'bid': bid})
+        elif phase == 'trump_selection':
+            suits = Counter(s for d in self.hand for s in {d['high'], d['low']})
+            suit = suits.most_common(1)[0][0] if suits else 0
+            action = ('select_trump', {'game_id': self.game_id, 'suit': suit})
+        elif phase == 'playing' and self.hand:
+            domino = random.choice(self._playable())
+            action = ('play_domino', {'game_id': self.game_id, 'domino_id': domino.id})
+        else:
+            return None
+
+        self.pending = (action[0], self.position, time.monotonic())
+        self.stats.count('actions')
+        return action
+
+    def _playable(self):
+        """Legal dominoes, by the same rule the server enforces."""
+        player = Player(None, '', self.position)
+        player.hand = [Domino.from_dict(d) for d in self.hand]
+        lead_suit = self.state.get('lead_suit') if self.state.get('current_trick') else None
+        return player.get_playable_dominoes(lead_suit, self.state.get('trump_suit'))
+
+    @property
+    def finished(self):
+        return self.state.get('phase') == 'finished'
+
+
+class Table:
+    """A game with `humans` simulated players; the first one hosts."""
+
+    def __init__(self, url, stats, humans, bot_delay):
+        self.stats = stats
+        self.bot_delay = bot_delay
+        self.players = [SimulatedPlayer(url, stats) for _ in range(humans)]
+
+    def start(self):
+        for player in self.players:
+            player.sign_in()
+        self.new_game()
+
+    def new_game(self):
+        host = self.players[0]
+        game_id = host.create_game(self.bot_delay)
+        for player in self.players:
+            player.join(game_id)
+        # Seats are taken in order on the server; wait for them before adding bots
+        deadline = time.monotonic() + STALL_TIMEOUT
+        while any(p.position is None for p in self.players):
+            if time.monotonic() > deadline:
+                self.stats.error('join timeout')
+                break
+            time.sleep(0.05)
+        host.send('add_bots', {'game_id': game_id})
+        host.send('start_game', {'game_id': game_id})
+
+    def tick(self):
+        """Replace a finished game and nudge a stalled one."""
+        host = self.players[0]
+        if host.finished:
+            self.stats.count('games_finished')
+            self.new_game()
+        elif time.monotonic() - max(p.last_event for p in self.players) > STALL_TIMEOUT:
+            self.stats.error('stalled table')
+            for player in self.players:
+                player.last_event = time.monotonic()
+                player.resync()
+
+    def close(self):
+        for player in self.players:
+            player.close()
+
+
+def run(args):
+    """Run every stage, printing a row each; returns the rows as dicts."""
+    stats = Stats()
+    tables = []
+    results = []
+    # With --json the table goes to stderr and stdout is left for the results
+    out = sys.stderr if args.json else sys.stdout
+    print(f"{'tables':>6}{'clients':>9}{'actions':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'events/s':>10}{'games':>7}{'limited':>9}  errors", file=out)
+
+    try:
+        for target in args.tables:
+            while len(tables) < target:
+                table = Table(args.url, stats, args.humans, args.bot_delay)
+                try:
+                    table.start()
+                except Exception as e:
+                    stats.error(f'start failed: {type(e).__name__}')
+                    table.close()
+                    continue
+                tables.append(table)
+
+            stats.reset()
+            deadline = time.monotonic() + args.duration
+            while time.monotonic() < deadline:
+                time.sleep(0.25)
+                for table in tables:
+                    table.tick()
+
+            latencies, events, actions, limited, errors, games, elapsed = stats.snapshot()
+            ms = [percentile(latencies, f) * 1000 for f in (0.5, 0.95, 0.99)]
+            print(f"{len(tables):>6}{len(tables) * args.humans:>9}{actions:>9}"
+                  f"{ms[0]:>9.1f}{ms[1]:>9.1f}{ms[2]:>9.1f}{events / elapsed:>10.0f}{games:>7}"
+                  f"{limited:>9}  {sum(errors.values())} {errors if errors else ''}", file=out)
+            results.append({
+                'tables': len(tables), 'actions': actions,
+                'p50_ms': ms[0], 'p95_ms': ms[1], 'p99_ms': ms[2],
+                'events_per_sec': events / elapsed, 'games': games, 'limited': limited,
+                'errors': sum(errors.values()), 'seconds': elapsed
+            })
+    finally:
+        for table in tables:
+            table.close()
+
+    if any(r['limited'] for r in results):
+        limits = ' '.join(f'{k}={v}' for k, v in SERVER_ENV.items() if k.startswith('RATE_LIMIT'))
+        print(f"The server rate limited the players, so these numbers include its stalls; "
+              f"start it with {limits}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a local GAME 42 server')
+    parser.add_argument('--url', default='http://localhost:8080', help='Server URL')
+    parser.add_argument('--tables', default='1,5,10,25',
+                        type=lambda v: sorted(int(n) for n in v.split(',')),
+                        help='Comma separated table counts, one stage each')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds measured per stage')
+    parser.add_argument('--humans', type=int, default=1, choices=range(1, 5),
+                        help='Simulated players per table (the rest are bots)')
+    parser.add_argument('--bot-delay', type=float, default=0.2, help='Bot think time per table')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--json', action='store_true', help='Print the stage results as JSON')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
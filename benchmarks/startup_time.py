@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Startup Time
+============
+Times how long each kind of process takes to import what it needs, each
+run in a fresh interpreter:
+
+    engine     game_logic only (simulations, bots, engine benchmarks)
+    tools      config and models.game_store (init_db.py, persistence tools)
+    worker     app, the whole server: Flask, Socket.IO, SQLAlchemy, services
+
+Reports the median wall time of --runs interpreter launches, minus the
+time an empty interpreter takes to start. --breakdown lists the slowest
+imports of one target (python -X importtime, cumulative microseconds).
+
+Usage:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --runs 10 --only worker
+    python benchmarks/startup_time.py --breakdown worker
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'engine': 'import game_logic.game, game_logic.ai',
+    'tools': 'import config; import models.game_store',
+    'worker': 'import app',
+}
+
+
+def launch(code, *flags):
+    """Run `code` in a fresh interpreter from the project root."""
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def wall_time(code, runs):
+    """Median seconds to start an interpreter and run `code`."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        launch(code)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def breakdown(code, top):
+    """The `top` slowest imports, by cumulative time, as (microseconds, module)."""
+    rows = []
+    for line in launch(code, '-X', 'importtime').stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GAME 42 startup time')
+    parser.add_argument('--only', nargs='+', choices=list(TARGETS), help='Targets to time')
+    parser.add_argument('--runs', type=int, default=5, help='Interpreter launches per target')
+    parser.add_argument('--breakdown', choices=list(TARGETS),
+                        help='List the slowest imports of one target')
+    parser.add_argument('--top', type=int, default=15, help='Imports listed by --breakdown')
+    args = parser.parse_args()
+
+    if args.breakdown:
+        print(f"{'cumulative ms':>14}  module")
+        for microseconds, module in breakdown(TARGETS[args.breakdown], args.top):
+            print(f"{microseconds / 1000:>14.1f}  {module}")
+        return
+
+    baseline = wall_time('pass', args.runs)
+    print(f"interpreter {baseline * 1000:.0f} ms (subtracted below)\n")
+    print(f"{'target':<10}{'import ms':>11}")
+    for name in args.only or TARGETS:
+        seconds = wall_time(TARGETS[name], args.runs) - baseline
+        print(f"{name:<10}{seconds * 1000:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
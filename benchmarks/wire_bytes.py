@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Wire Size Benchmark
+===================
+Measures bytes per hand sent to one player on each wire protocol.
+
+Bots play whole games with the real engine; every event the server would
+send the North seat (room broadcasts, its own game_state at each deal and
+its hand_update after each of its plays) is encoded as protocol '1' JSON,
+protocol '2' compact JSON and, when msgpack is installed, protocol '2b'.
+Sizes are Socket.IO payload bytes (event name plus arguments), so packet
+framing is left out.
+
+Usage:
+    python benchmarks/wire_bytes.py --games 20
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic.game import Game
+from game_logic.ai import choose_bid, choose_trump, choose_domino
+from services.protocol import (
+    PROTOCOL_COMPACT, PROTOCOL_BINARY, COMPACT_PROTOCOLS, WIRE_EVENT, encode
+)
+
+VIEWER = 'north'
+
+
+def json_size(payload):
+    return len(json.dumps(payload, separators=(',', ':')))
+
+
+def play_move(game):
+    """Apply one bot move and return the events a viewer receives for it."""
+    position = game.current_turn
+    if game.phase == Game.PHASE_BIDDING:
+        bid = choose_bid(game, position)
+        _, message = game.place_bid(position, bid)
+        return [('bid_update', {
+            'position': position,
+            'bid': bid,
+            'high_bid': game.high_bid,
+            'high_bidder': game.high_bidder,
+            'current_bidder': game.current_bidder if game.phase == Game.PHASE_BIDDING else None,
+            'current_turn': game.current_turn,
+            'phase': game.phase,
+            'message': message
+        })]
+
+    if game.phase == Game.PHASE_TRUMP_SELECTION:
+        _, message = game.select_trump(position, choose_trump(game, position))
+        return [('trump_selected', {
+            'trump_suit': game.trump_suit,
+            'current_leader': game.current_leader,
+            'phase': game.phase,
+            'message': message
+        })]
+
+    domino = choose_domino(game, position)
+    _, _, trick_result = game.play_domino(position, domino.id)
+    play_data = {
+        'position': position,
+        'domino_id': domino.id,
+        'current_trick': [(p, d.to_dict()) for p, d in game.current_trick],
+        'lead_suit': game.lead_suit,
+        'current_turn': game.current_turn,
+        'phase': game.phase
+    }
+    if trick_result:
+        play_data.update({
+            'trick_result': trick_result,
+            'team1_tricks': game.team1_tricks,
+            'team2_tricks': game.team2_tricks,
+            'team1_hand_points': game.team1_hand_points,
+            'team2_hand_points': game.team2_hand_points,
+            'team1_marks': game.team1_marks,
+            'team2_marks': game.team2_marks
+        })
+        if game.phase == Game.PHASE_FINISHED:
+            play_data['game_over'] = True
+            play_data['winner'] = trick_result.get('game_winner')
+
+    events = [('domino_played', play_data)]
+    if position == VIEWER:
+        events.append(('hand_update', {'hand': [d.to_dict() for d in game.players[VIEWER].hand]}))
+    if trick_result and trick_result.get('new_hand'):
+        events.append(('game_state', game.get_state_for_player(VIEWER)))
+    return events
+
+
+def measure(games, seed):
+    """Play bot games and total the bytes each protocol would send."""
+    random.seed(seed)
+    totals = {'1': 0, **{p: 0 for p in COMPACT_PROTOCOLS}}
+    hands = events = 0
+
+    for i in range(games):
+        game = Game(f"bench{i}", bot_delay=0)
+        for j, name in enumerate(['Bot_Alice', 'Bot_Bob', 'Bot_Carol', 'Bot_Dave']):
+            game.add_player(-1 - j, name, is_ai=True)
+        game.start_game()
+
+        pending = [('game_state', game.get_state_for_player(VIEWER))]
+        while game.phase != Game.PHASE_FINISHED:
+            pending.extend(play_move(game))
+
+        for event, data in pending:
+            totals['1'] += json_size([event, data])
+            for protocol in COMPACT_PROTOCOLS:
+                frame = encode([[event, data]], protocol)
+                if protocol == PROTOCOL_BINARY:
+                    totals[protocol] += len(WIRE_EVENT) + len(frame)
+                else:
+                    totals[protocol] += json_size([WIRE_EVENT, frame])
+            if event == 'domino_played' and data.get('trick_result', {}).get('hand_result'):
+                hands += 1
+        events += len(pending)
+
+    return totals, hands, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare bytes per hand across wire protocols')
+    parser.add_argument('--games', type=int, default=20, help='Bot games to play')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    args = parser.parse_args()
+
+    totals, hands, events = measure(args.games, args.seed)
+
+    print(f"{args.games} games, {hands} hands, {events} events to one player\n")
+    print(f"{'protocol':<12}{'bytes/hand':>12}{'bytes/event':>14}{'vs 1':>8}")
+    for protocol, total in totals.items():
+        label = {'1': '1 (json)', PROTOCOL_COMPACT: '2 (compact)', PROTOCOL_BINARY: '2b (msgpack)'}[protocol]
+        print(f"{label:<12}{total / hands:>12.0f}{total / events:>14.1f}{totals['1'] / total:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+GAME 42 - Static Asset Build
+============================
+Writes fingerprinted copies of the stylesheets and scripts under static/ to
+static/dist/, with gzip (and, if the brotli package is installed, brotli)
+variants and a manifest. The server serves them with far-future cache
+headers; rerun this after changing a file under static/.
+"""
+
+import os
+import sys
+
+# Add project directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.assets import build, brotli
+
+
+if __name__ == '__main__':
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    manifest = build(static_dir, os.path.join(static_dir, 'dist'))
+    for name, hashed in sorted(manifest.items()):
+        print(f"  {name:<20} -> {hashed}")
+    print(f"\nBuilt {len(manifest)} assets ({'brotli and gzip' if brotli else 'gzip'} variants)")
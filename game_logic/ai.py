@@ -0,0 +1,188 @@
+"""AI player strategy and in-memory play for bot seats."""
+
+
+def choose_bid(game, position):
+    """
+    Choose a bid for an AI player.
+
+    Args:
+        game: Game in the bidding phase
+        position: Position of the AI player
+
+    Returns:
+        Bid amount (30-42) or 0 to pass
+    """
+    high_bid = game.high_bid or 29
+    hand = game.players[position].hand
+
+    # Calculate hand strength for each suit
+    suit_strengths = {}
+    for suit in range(7):  # 0-6
+        strength = 0
+        for domino in hand:
+            if domino.belongs_to_suit(suit):
+                # Doubles are very strong in trump
+                if domino.is_double and domino.high == suit:
+                    strength += 8
+                else:
+                    strength += 3
+                # Count dominoes are valuable
+                if domino.count_value > 0:
+                    strength += domino.count_value // 5
+        suit_strengths[suit] = strength
+
+    # Find best suit
+    best_suit = max(suit_strengths, key=suit_strengths.get) if suit_strengths else 0
+    max_strength = suit_strengths[best_suit]
+
+    # Count total count dominoes (5-0, 4-1, 3-2, 6-4, 5-5)
+    count_dominoes = sum(1 for d in hand if d.count_value > 0)
+
+    # Smarter bidding logic
+    bid = 0
+    if max_strength >= 18:  # Very strong hand
+        bid = min(42, max(high_bid + 1, 35))
+    elif max_strength >= 14 and high_bid < 37:  # Strong hand
+        bid = high_bid + 1
+    elif max_strength >= 10 and high_bid < 33:  # Decent hand
+        bid = high_bid + 1
+    elif max_strength >= 7 and high_bid < 31 and count_dominoes >= 2:  # Okay hand with counts
+        bid = high_bid + 1
+
+    # Nothing left to outbid (e.g. someone already bid 42) - pass
+    if bid and game.high_bid and bid <= game.high_bid:
+        bid = 0
+
+    return bid
+
+
+def choose_trump(game, position):
+    """Pick the suit the AI player holds the most of."""
+    suit_counts = {}
+    for domino in game.players[position].hand:
+        for suit in [domino.high, domino.low]:
+            suit_counts[suit] = suit_counts.get(suit, 0) + 1
+
+    return max(suit_counts, key=suit_counts.get) if suit_counts else 0
+
+
+def choose_domino(game, position):
+    """
+    Choose which domino an AI player plays.
+
+    Returns:
+        Domino to play, or None if the player has nothing playable
+    """
+    lead_suit = game.lead_suit
+    trump_suit = game.trump_suit
+    playable = game.players[position].get_playable_dominoes(lead_suit, trump_suit)
+
+    if not playable:
+        return None
+
+    chosen = None
+
+    if not game.current_trick:
+        # Leading the trick - smart strategy
+        # Priority: Lead with trump double, or lead with count domino, or lead strongest
+        trump_doubles = [d for d in playable if d.is_double and d.belongs_to_suit(trump_suit)]
+        count_dominoes = [d for d in playable if d.count_value > 0]
+
+        if trump_doubles:
+            chosen = max(trump_doubles, key=lambda d: d.pip_total)
+        elif count_dominoes:
+            chosen = max(count_dominoes, key=lambda d: d.count_value)
+        else:
+            # Lead with highest domino
+            chosen = max(playable, key=lambda d: d.pip_total)
+    else:
+        # Following - try to win the trick or dump low
+        current_high_value = -1
+
+        # Find current winning domino in trick
+        for pos, domino in game.current_trick:
+            domino_value = 0
+            if domino.belongs_to_suit(trump_suit):
+                domino_value = 100 + domino.pip_total  # Trump is strong
+            elif lead_suit is not None and domino.belongs_to_suit(lead_suit):
+                domino_value = domino.pip_total
+
+            if domino_value > current_high_value:
+                current_high_value = domino_value
+
+        # Try to beat the current winning domino
+        can_win = []
+        for d in playable:
+            d_value = 0
+            if d.belongs_to_suit(trump_suit):
+                d_value = 100 + d.pip_total
+            elif lead_suit is not None and d.belongs_to_suit(lead_suit):
+                d_value = d.pip_total
+
+            if d_value > current_high_value:
+                can_win.append((d, d_value))
+
+        if can_win:
+            # Can win - play the lowest winning domino (save high cards)
+            chosen = min(can_win, key=lambda x: x[1])[0]
+        else:
+            # Can't win - dump lowest non-count domino
+            non_count = [d for d in playable if d.count_value == 0]
+            if non_count:
+                chosen = min(non_count, key=lambda d: d.pip_total)
+            else:
+                # Have to give up a count domino
+                chosen = min(playable, key=lambda d: d.count_value)
+
+    return chosen or playable[0]
+
+
+def fast_forward_hand(game):
+    """
+    Play the rest of the current hand at full speed with every seat as a bot.
+
+    Nothing is emitted or persisted; the caller saves the game once and
+    broadcasts the returned summary.
+
+    Returns:
+        Dictionary with the hand's bid, bidder, trump and compact tricks,
+        each trick being [leader, [domino ids in play order], winner, points].
+        'hand_result' and 'game_winner' come from the final trick.
+    """
+    summary = {
+        'bid': game.high_bid,
+        'bidder': game.high_bidder,
+        'trump': game.trump_suit,
+        'tricks': []
+    }
+    # Resuming mid-trick keeps the dominoes already on the table
+    leader = game.current_trick[0][0] if game.current_trick else None
+    plays = [d.id for _, d in game.current_trick]
+
+    while True:
+        position = game.current_turn
+        if game.phase == game.PHASE_BIDDING:
+            success, _ = game.place_bid(position, choose_bid(game, position))
+        elif game.phase == game.PHASE_TRUMP_SELECTION:
+            success, _ = game.select_trump(position, choose_trump(game, position))
+            summary['bid'] = game.high_bid
+            summary['bidder'] = game.high_bidder
+            summary['trump'] = game.trump_suit
+        elif game.phase == game.PHASE_PLAYING:
+            if not game.current_trick:
+                leader = position
+            domino = choose_domino(game, position)
+            success, _, trick_result = game.play_domino(position, domino.id)
+            plays.append(domino.id)
+            if trick_result:
+                summary['tricks'].append([leader, plays, trick_result['winner'], trick_result['points']])
+                plays = []
+                if 'hand_result' in trick_result:
+                    summary['hand_result'] = trick_result['hand_result']
+                    summary['game_winner'] = trick_result.get('game_winner')
+                    return summary
+        else:
+            return summary
+
+        if not success:
+            return summary
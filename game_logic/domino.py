@@ -23,6 +23,11 @@ class Domino:
         """Unique identifier for the domino."""
         return f"{self.high}-{self.low}"
 
+    @property
+    def code(self):
+        """Small integer (0-27) naming this tile on the compact wire protocol."""
+        return self.high * (self.high + 1) // 2 + self.low
+
     @property
     def is_double(self):
         """Check if this is a double (same value on both ends)."""
@@ -92,6 +97,14 @@ class Domino:
         high, low = map(int, domino_id.split('-'))
         return cls(high, low)
 
+    @classmethod
+    def from_code(cls, code):
+        """Create a Domino from its compact code (see `code`)."""
+        high = 0
+        while (high + 1) * (high + 2) // 2 <= code:
+            high += 1
+        return cls(high, code - high * (high + 1) // 2)
+
     def __eq__(self, other):
         if not isinstance(other, Domino):
             return False
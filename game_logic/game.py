@@ -25,12 +25,20 @@ class Game:
     # Winning marks
     WINNING_MARKS = 7
 
-    def __init__(self, game_id=None):
+    # Seconds a bot "thinks" before acting
+    DEFAULT_BOT_DELAY = 1.0
+
+    def __init__(self, game_id=None, bot_delay=None):
         """Initialize a new game."""
         self.game_id = game_id or str(uuid.uuid4())
         self.phase = self.PHASE_WAITING
+        self.bot_delay = self.DEFAULT_BOT_DELAY if bot_delay is None else bot_delay
+        self.version = 0  # Storage version this state was loaded from
+        self.dirty = False  # Has changes not yet saved (chat is saved lazily)
         self.players = {}  # position -> Player
-        self.spectators = []  # List of (user_id, username)
+        self.seats = {}  # user_id -> position, mirrors players
+        self.spectators = {}  # user_id -> username, in arrival order
+        self.on_seat_change = None  # Called with (game, user_id) after a seat or spectator change
 
         # Hand state
         self.dealer_position = None
@@ -71,6 +79,11 @@ class Game:
         """Check if game has 4 players."""
         return self.player_count >= 4
 
+    @property
+    def is_all_bots(self):
+        """Check if every seat is filled by an AI player."""
+        return self.is_full and all(p.is_ai for p in self.players.values())
+
     @property
     def current_turn(self):
         """Return position of player whose turn it is."""
@@ -104,25 +117,44 @@ class Game:
 
         player = Player(user_id, username, position, is_ai)
         self.players[position] = player
+        self.seats[user_id] = position
+        self._seat_changed(user_id)
         return True, position
 
     def remove_player(self, position):
         """Remove a player from the game."""
-        if position in self.players:
-            del self.players[position]
-            return True
-        return False
+        player = self.players.pop(position, None)
+        if player is None:
+            return False
+        if self.seats.get(player.user_id) == position:
+            del self.seats[player.user_id]
+        self._seat_changed(player.user_id)
+        return True
+
+    def position_of(self, user_id):
+        """Return the position a user is seated at, or None."""
+        return self.seats.get(user_id)
 
     def add_spectator(self, user_id, username):
         """Add a spectator to the game."""
-        if not any(s[0] == user_id for s in self.spectators):
-            self.spectators.append((user_id, username))
+        if user_id not in self.spectators:
+            self.spectators[user_id] = username
+            self._seat_changed(user_id)
             return True
         return False
 
     def remove_spectator(self, user_id):
         """Remove a spectator from the game."""
-        self.spectators = [(uid, name) for uid, name in self.spectators if uid != user_id]
+        if self.spectators.pop(user_id, None) is not None:
+            self._seat_changed(user_id)
+
+    def is_spectator(self, user_id):
+        """Check if a user is watching the game."""
+        return user_id in self.spectators
+
+    def _seat_changed(self, user_id):
+        if self.on_seat_change:
+            self.on_seat_change(self, user_id)
 
     def start_game(self):
         """Start the game if we have 4 players."""
@@ -368,7 +400,8 @@ class Game:
 
         # Check if hand is over
         if self.trick_number > 7:
-            return self.complete_hand()
+            success, message, hand_result = self.complete_hand()
+            return success, message, {**trick_result, **hand_result}
 
         return True, f"{winner.username} wins the trick with {points} points", trick_result
 
@@ -440,6 +473,7 @@ class Game:
         state = {
             'game_id': self.game_id,
             'phase': self.phase,
+            'my_position': position,
             'dealer': self.dealer_position,
             'current_turn': self.current_turn,
             'high_bid': self.high_bid,
@@ -480,11 +514,14 @@ class Game:
             'game_id': self.game_id,
             'phase': self.phase,
             'players': {pos: p.to_dict() for pos, p in self.players.items()},
-            'spectators': self.spectators,
+            'spectators': [[uid, name] for uid, name in self.spectators.items()],
             'dealer_position': self.dealer_position,
+            'current_bidder': self.current_bidder,
             'high_bid': self.high_bid,
             'high_bidder': self.high_bidder,
             'trump_suit': self.trump_suit,
+            'bid_winner': self.bid_winner,
+            'current_leader': self.current_leader,
             'current_trick': [(p, d.to_dict()) for p, d in self.current_trick],
             'trick_number': self.trick_number,
             'lead_suit': self.lead_suit,
@@ -492,32 +529,43 @@ class Game:
             'team2_marks': self.team2_marks,
             'team1_hand_points': self.team1_hand_points,
             'team2_hand_points': self.team2_hand_points,
+            'team1_tricks': self.team1_tricks,
+            'team2_tricks': self.team2_tricks,
             'hand_history': self.hand_history,
-            'trick_history': self.trick_history
+            'trick_history': self.trick_history,
+            'chat_messages': self.chat_messages,
+            'bot_delay': self.bot_delay
         }
 
     @classmethod
     def from_dict(cls, data):
         """Recreate a Game from dictionary."""
-        game = cls(data['game_id'])
+        game = cls(data['game_id'], data.get('bot_delay'))
         game.phase = data['phase']
         game.dealer_position = data.get('dealer_position')
+        game.current_bidder = data.get('current_bidder')
         game.high_bid = data.get('high_bid')
         game.high_bidder = data.get('high_bidder')
         game.trump_suit = data.get('trump_suit')
+        game.bid_winner = data.get('bid_winner')
+        game.current_leader = data.get('current_leader')
         game.trick_number = data.get('trick_number', 0)
         game.lead_suit = data.get('lead_suit')
         game.team1_marks = data.get('team1_marks', 0)
         game.team2_marks = data.get('team2_marks', 0)
         game.team1_hand_points = data.get('team1_hand_points', 0)
         game.team2_hand_points = data.get('team2_hand_points', 0)
+        game.team1_tricks = data.get('team1_tricks', 0)
+        game.team2_tricks = data.get('team2_tricks', 0)
         game.hand_history = data.get('hand_history', [])
         game.trick_history = data.get('trick_history', [])
-        game.spectators = data.get('spectators', [])
+        game.chat_messages = data.get('chat_messages', [])
+        game.spectators = {uid: name for uid, name in data.get('spectators', [])}
 
         # Reconstruct players
         for pos, pdata in data.get('players', {}).items():
             game.players[pos] = Player.from_dict(pdata)
+            game.seats[game.players[pos].user_id] = pos
 
         # Reconstruct current trick
         game.current_trick = []
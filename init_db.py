@@ -2,7 +2,8 @@
 """
 GAME 42 - Database Initialization Script
 ========================================
-Run this script to initialize the SQLite database with required tables.
+Run this script to initialize the database with required tables. It uses
+the server's config, so DATABASE_URL picks the same database app.py does.
 """
 
 import os
@@ -11,20 +12,11 @@ import sys
 # Add project directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from flask import Flask
+from config import create_app
 from models import db
 from models.user import User
 from models.game_session import GameSession
 
-def create_app():
-    """Create a Flask app for database initialization."""
-    app = Flask(__name__)
-    app.config['SECRET_KEY'] = 'init-key'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///game.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    db.init_app(app)
-    return app
-
 
 def init_database():
     """Initialize the database."""
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Database Migration Script
-Adds access_code and last_activity columns to game_sessions table
+Adds access_code, last_activity and version columns to game_sessions table
 """
 
 import sqlite3
@@ -33,6 +33,14 @@ def migrate():
         else:
             print("✓ last_activity column already exists")
 
+        # Add version column if it doesn't exist
+        if 'version' not in columns:
+            print("Adding version column...")
+            cursor.execute("ALTER TABLE game_sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            print("✓ version column added")
+        else:
+            print("✓ version column already exists")
+
         # Update existing rows to have last_activity set to created_at if NULL
         cursor.execute("UPDATE game_sessions SET last_activity = created_at WHERE last_activity IS NULL")
 
@@ -5,6 +5,10 @@ import random
 import string
 
 
+class StaleGameState(Exception):
+    """Raised when a game was saved by another writer since it was loaded."""
+
+
 class GameSession(db.Model):
     __tablename__ = 'game_sessions'
 
@@ -34,6 +38,9 @@ class GameSession(db.Model):
     # Game state stored as JSON
     game_state_json = db.Column(db.Text, default='{}')
 
+    # Bumped on every state save; writers compare-and-swap on it
+    version = db.Column(db.Integer, default=0, nullable=False)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     finished_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,114 @@
+"""Loading and saving game snapshots in the game_sessions table."""
+
+import json
+
+from models import db
+from models.user import User
+from models.user_cache import user_cache
+from models.game_session import GameSession, StaleGameState
+from game_logic.game import Game
+from game_logic.scoring import check_game_winner
+
+
+def game_from_snapshot(state_json, version):
+    """Rebuild a Game from its saved game_state_json, or None if it has none."""
+    state = json.loads(state_json) if state_json else None
+    if not state:
+        return None
+    game = Game.from_dict(state)
+    game.version = version or 0
+    return game
+
+
+def load_game_snapshot(game_id):
+    """Load a game from the database without caching it."""
+    game_session = GameSession.query.filter_by(game_id=game_id).first()
+    if game_session:
+        return game_from_snapshot(game_session.game_state_json, game_session.version)
+    return None
+
+
+def recent_snapshots(since, limit):
+    """
+    Saved state of the unfinished games active since `since`, newest first.
+
+    One query for all of them, reading only the columns a restore needs.
+
+    Returns:
+        List of (game_id, game_state_json, version)
+    """
+    return db.session.query(
+        GameSession.game_id, GameSession.game_state_json, GameSession.version
+    ).filter(
+        GameSession.status != 'finished',
+        GameSession.last_activity >= since
+    ).order_by(GameSession.last_activity.desc()).limit(limit).all()
+
+
+def save_game_state(game):
+    """
+    Save game state to database.
+
+    The write is a compare-and-swap on GameSession.version: it only
+    applies if nobody else saved the game since this copy was loaded,
+    otherwise StaleGameState is raised. The save that first stores a
+    finished game also records the result in its players' stats, in the
+    same transaction, so each game is counted exactly once.
+    """
+    players_dict = {}
+    for pos, player in game.players.items():
+        players_dict[pos] = player.user_id
+
+    finishing = game.phase == Game.PHASE_FINISHED and GameSession.query.filter(
+        GameSession.game_id == game.game_id,
+        GameSession.version == game.version,
+        GameSession.status != Game.PHASE_FINISHED
+    ).count() > 0
+
+    updated = GameSession.query.filter_by(
+        game_id=game.game_id, version=game.version
+    ).update({
+        'game_state_json': json.dumps(game.to_dict()),
+        'status': game.phase,
+        'team1_marks': game.team1_marks,
+        'team2_marks': game.team2_marks,
+        'team1_points': game.team1_hand_points,
+        'team2_points': game.team2_hand_points,
+        'players_json': json.dumps(players_dict),
+        'spectators_json': json.dumps(list(game.spectators)),
+        'version': game.version + 1
+    }, synchronize_session=False)
+
+    if updated:
+        players = record_results(game) if finishing else []
+        db.session.commit()
+        game.version += 1
+        game.dirty = False
+        for user_id in players:
+            user_cache.invalidate(user_id)
+    elif GameSession.query.filter_by(game_id=game.game_id).first():
+        db.session.rollback()
+        raise StaleGameState(game.game_id)
+
+
+def record_results(game):
+    """
+    Add a finished game to its human players' stats, in the current transaction.
+
+    Returns:
+        The user ids that were updated
+    """
+    winner = check_game_winner(game.team1_marks, game.team2_marks, game.WINNING_MARKS)
+    updated = []
+    for team, marks in ((1, game.team1_marks), (2, game.team2_marks)):
+        user_ids = [p.user_id for p in game.players.values() if p.team == team and not p.is_ai]
+        if not user_ids:
+            continue
+        # Increment in SQL, so games finishing together on other workers add up
+        User.query.filter(User.id.in_(user_ids)).update({
+            User.games_played: User.games_played + 1,
+            User.games_won: User.games_won + (1 if team == winner else 0),
+            User.total_marks: User.total_marks + marks
+        }, synchronize_session=False)
+        updated.extend(user_ids)
+    return updated
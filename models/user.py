@@ -1,5 +1,7 @@
 from models import db, login_manager
+from models.user_cache import user_cache
 from flask_login import UserMixin
+from sqlalchemy import event
 import bcrypt
 from datetime import datetime
 
@@ -49,6 +51,13 @@ class User(UserMixin, db.Model):
         }
 
 
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def invalidate_cached_user(mapper, connection, target):
+    """Drop stale snapshots when stats change or a guest is deleted."""
+    user_cache.invalidate(target.id)
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.get(int(user_id), User.query.get)
@@ -0,0 +1,131 @@
+"""In-process cache of the user fields that request handlers need."""
+
+import time
+import threading
+
+from flask_login import UserMixin
+
+
+class CachedUser(UserMixin):
+    """Read-only snapshot of a User row, served to Flask-Login."""
+
+    def __init__(self, data):
+        """
+        Build a cached user from a User.to_dict() snapshot.
+
+        Args:
+            data: Dictionary produced by User.to_dict()
+        """
+        self._data = data
+        self.id = data['id']
+        self.username = data['username']
+        self.is_guest = data['is_guest']
+
+    def to_dict(self):
+        """Return the cached dictionary (same shape as User.to_dict)."""
+        return dict(self._data)
+
+    def __repr__(self):
+        return f"CachedUser({self.id}, {self.username})"
+
+
+class UserCache:
+    """
+    TTL cache of user snapshots keyed by user id.
+
+    Entries expire after `ttl` seconds and are dropped explicitly on
+    logout, guest deletion and stats updates, so hot-path socket events
+    can read current_user without a SELECT.
+
+    Each worker process has its own cache. `on_invalidate(user_id)` is
+    called for every local invalidation so it can be passed on to the
+    other workers, which drop the user with invalidate(..., notify=False).
+    A worker that reloads a user in the moment before a change commits
+    keeps the old snapshot until its TTL runs out. Entries are guarded by
+    a lock, since asyncio mode serves requests on several threads.
+    """
+
+    def __init__(self, ttl=60, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.on_invalidate = None  # Called with the user id of each local invalidation
+        self._entries = {}  # user_id -> (expires_at, CachedUser)
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by every invalidation
+
+    def get(self, user_id, loader):
+        """
+        Return the cached user, calling loader(user_id) on a miss.
+
+        Args:
+            user_id: Integer user id
+            loader: Callable returning a User (or None) from the database
+
+        Returns:
+            CachedUser or None if the user does not exist
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            generation = self._generation
+        if entry and entry[0] > now:
+            return entry[1]
+
+        # The database is read without the lock
+        user = loader(user_id)
+        if user is None:
+            self.invalidate(user_id, notify=False)
+            return None
+        return self.put(user, now, generation)
+
+    def put(self, user, now=None, generation=None):
+        """
+        Store a snapshot of a User model and return it.
+
+        Args:
+            generation: If given, the snapshot is only stored when nothing was
+                invalidated since it was read (it is returned either way)
+        """
+        cached = CachedUser(user.to_dict())
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return cached  # Possibly stale already
+            if len(self._entries) >= self.max_size:
+                self._purge_expired()
+            if len(self._entries) >= self.max_size:
+                # Still full of live entries - drop the oldest insertion
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[cached.id] = (now + self.ttl, cached)
+        return cached
+
+    def invalidate(self, user_id, notify=True):
+        """
+        Drop a user from the cache.
+
+        Args:
+            notify: Pass the invalidation to on_invalidate (False when it
+                came from another worker)
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+        if notify and self.on_invalidate:
+            self.on_invalidate(user_id)
+
+    def clear(self):
+        """Drop every cached user."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        for user_id in [uid for uid, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[user_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Redis Stand-in
+==============
+A small in-process server that speaks enough of the Redis protocol for
+the workers' message queue: PUBLISH and (UN)SUBSCRIBE, plus the PING,
+SELECT, AUTH and CLIENT commands redis-py sends on connect. It keeps no
+data, so it is only a stand-in for the pub/sub that Socket.IO's message
+queue and the cluster's command channels use.
+
+Used by the tests and by cluster_bench.py when no Redis server is given.
+It can also be run by hand:
+    python redis_standin.py --port 6379
+    python run_workers.py --workers 2 --queue redis://localhost:6379/0
+"""
+
+import socket
+import threading
+import socketserver
+
+
+class _Connection(socketserver.StreamRequestHandler):
+    """One client: reads commands and writes replies and published messages."""
+
+    def setup(self):
+        super().setup()
+        self.write_lock = threading.Lock()  # Publishers write from their own threads
+        self.channels = set()
+
+    def handle(self):
+        hub = self.server.hub
+        try:
+            while True:
+                command = self._read_command()
+                if command is None:
+                    break
+                self._run(hub, command)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            hub.unsubscribe(self, self.channels)
+
+    def _read_command(self):
+        """Read one array of bulk strings (or an inline command), or None at EOF."""
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _run(self, hub, command):
+        name = command[0].upper()
+        args = command[1:]
+        if name == b'PUBLISH':
+            self.send(b':%d\r\n' % hub.publish(args[0], args[1]))
+        elif name == b'SUBSCRIBE':
+            for channel in args:
+                self.channels.add(channel)
+                hub.subscribe(self, channel)
+                self.send(encode([b'subscribe', channel, len(self.channels)]))
+        elif name == b'UNSUBSCRIBE':
+            for channel in args or list(self.channels):
+                self.channels.discard(channel)
+                hub.unsubscribe(self, [channel])
+                self.send(encode([b'unsubscribe', channel, len(self.channels)]))
+        elif name == b'PING':
+            if self.channels:
+                self.send(encode([b'pong', args[0] if args else b'']))
+            else:
+                self.send(b'+PONG\r\n')
+        elif name in (b'SELECT', b'AUTH', b'CLIENT'):
+            self.send(b'+OK\r\n')
+        else:
+            self.send(b"-ERR unknown command '%s'\r\n" % name)
+
+    def send(self, data):
+        with self.write_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+
+def encode(items):
+    """Encode a reply array of bytes and ints."""
+    parts = [b'*%d\r\n' % len(items)]
+    for item in items:
+        if isinstance(item, int):
+            parts.append(b':%d\r\n' % item)
+        else:
+            parts.append(b'$%d\r\n%s\r\n' % (len(item), item))
+    return b''.join(parts)
+
+
+class _Hub:
+    """Channel subscriptions shared by every connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # channel -> set of connections
+
+    def subscribe(self, connection, channel):
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(connection)
+
+    def unsubscribe(self, connection, channels):
+        with self._lock:
+            for channel in channels:
+                self._subscribers.get(channel, set()).discard(connection)
+
+    def publish(self, channel, message):
+        """Send a message to every subscriber; returns how many got it."""
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        frame = encode([b'message', channel, message])
+        delivered = 0
+        for connection in targets:
+            try:
+                connection.send(frame)
+                delivered += 1
+            except OSError:
+                pass  # It is going away; its handler unsubscribes it
+        return delivered
+
+
+class RedisStandin(socketserver.ThreadingTCPServer):
+    """
+    Pub/sub server on localhost, served from a background thread.
+
+    Usage:
+        with RedisStandin() as broker:
+            url = broker.url  # redis://127.0.0.1:<port>/0
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0):
+        super().__init__(('127.0.0.1', port), _Connection)
+        self.hub = _Hub()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def start(self):
+        """Serve in a daemon thread and return self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def wait_for_port(port, timeout=30):
+    """Wait until something accepts connections on a localhost port."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Redis pub/sub stand-in for local workers')
+    parser.add_argument('--port', type=int, default=6379, help='Port to listen on')
+    args = parser.parse_args()
+
+    broker = RedisStandin(args.port)
+    print(f"Redis stand-in at {broker.url}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.server_close()
+
+
+if __name__ == '__main__':
+    main()
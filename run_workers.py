@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+GAME 42 - Multi-Worker Launcher
+===============================
+Starts N server processes that share a Redis-compatible message queue.
+Each worker listens on its own port; games are owned by exactly one
+worker and commands for them are forwarded there.
+"""
+
+import os
+import sys
+import subprocess
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run several GAME 42 workers')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--base-port', type=int, default=8080,
+                        help='Port of the first worker; others follow')
+    parser.add_argument('--queue', default=os.environ.get('SOCKETIO_MESSAGE_QUEUE', 'redis://localhost:6379/0'),
+                        help='Redis-compatible message queue URL')
+    args = parser.parse_args()
+
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    # Create the tables once; workers racing to create them fail on a new database
+    subprocess.run([sys.executable, 'init_db.py'], cwd=project_dir, check=True,
+                   stdout=subprocess.DEVNULL)
+
+    processes = []
+    for worker_id in range(args.workers):
+        env = dict(
+            os.environ,
+            WORKER_ID=str(worker_id),
+            WORKER_COUNT=str(args.workers),
+            PORT=str(args.base_port + worker_id),
+            SOCKETIO_MESSAGE_QUEUE=args.queue
+        )
+        processes.append(subprocess.Popen([sys.executable, 'app.py'], cwd=project_dir, env=env))
+
+    print(f"Started {args.workers} workers on ports "
+          f"{args.base_port}-{args.base_port + args.workers - 1} (queue: {args.queue})")
+
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        print("\nStopping workers...")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+from services.actors import ActorSystem, Command
+from services.scheduler import TimerWheel, TaskScheduler, BotScheduler
+from services.cluster import Cluster, HashRing
+from services.registry import SessionRegistry
+from services.outbox import Outbox
+from services.game_cache import GameCache
+from services.seat_index import SeatIndex
+from services.metrics import MetricsRegistry
+from services.assets import AssetManifest
+from services.matchmaking import Matchmaker
+
+__all__ = ['ActorSystem', 'Command', 'TimerWheel', 'TaskScheduler', 'BotScheduler', 'Cluster',
+           'HashRing', 'SessionRegistry', 'Outbox', 'GameCache', 'SeatIndex',
+           'MetricsRegistry', 'AssetManifest', 'Matchmaker']
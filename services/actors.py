@@ -0,0 +1,82 @@
+"""Per-game actors: each game owns a command queue drained by one green thread."""
+
+import traceback
+from collections import deque, namedtuple
+
+
+# A message applied to a single game.
+#   kind:    Name of the registered command handler (e.g. 'place_bid')
+#   game_id: Game the command targets
+#   payload: Event data sent by the client (dict)
+#   caller:  {'sid', 'user_id', 'username'} of the sender, or None for
+#            server-originated commands such as bot moves
+Command = namedtuple('Command', ['kind', 'game_id', 'payload', 'caller'])
+
+
+class GameActor:
+    """Queue of pending commands for one game."""
+
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.queue = deque()
+        self.running = False
+
+    def __repr__(self):
+        return f"GameActor({self.game_id}, pending={len(self.queue)})"
+
+
+class ActorSystem:
+    """
+    Serializes commands per game without a global lock.
+
+    Commands for the same game are applied strictly in arrival order by a
+    single green thread; different games drain on independent green
+    threads. An actor's drainer exits (and the actor is dropped) as soon as
+    its queue is empty, so idle games cost nothing.
+    """
+
+    def __init__(self, spawn, dispatch):
+        """
+        Args:
+            spawn: Callable(fn, *args) that starts a green thread
+                   (e.g. socketio.start_background_task)
+            dispatch: Callable(command) that applies one Command
+        """
+        self._spawn = spawn
+        self._dispatch = dispatch
+        self._actors = {}  # game_id -> GameActor
+
+    def submit(self, kind, game_id, payload=None, caller=None):
+        """Queue a command for a game and make sure a drainer is running."""
+        actor = self._actors.get(game_id)
+        if actor is None:
+            actor = GameActor(game_id)
+            self._actors[game_id] = actor
+
+        actor.queue.append(Command(kind, game_id, payload or {}, caller))
+        if not actor.running:
+            actor.running = True
+            self._spawn(self._drain, actor)
+
+    def pending(self, game_id):
+        """Number of commands waiting for a game."""
+        actor = self._actors.get(game_id)
+        return len(actor.queue) if actor else 0
+
+    def _drain(self, actor):
+        """Apply queued commands in order until the queue is empty."""
+        try:
+            while actor.queue:
+                command = actor.queue.popleft()
+                try:
+                    self._dispatch(command)
+                except Exception:
+                    print(f"Error applying {command.kind} to game {command.game_id}:")
+                    traceback.print_exc()
+        finally:
+            actor.running = False
+            if not actor.queue and self._actors.get(actor.game_id) is actor:
+                del self._actors[actor.game_id]
+
+    def __len__(self):
+        return len(self._actors)
@@ -0,0 +1,126 @@
+"""Fingerprinted, precompressed static assets: the build step and the lookups."""
+
+import os
+import gzip
+import json
+import shutil
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # gzip variants only
+    brotli = None
+
+
+# Files under static/ that are built; everything else is served as is
+ASSET_EXTENSIONS = ('.css', '.js')
+MANIFEST = 'manifest.json'
+# Content-Encoding -> suffix of the precompressed variant, most preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz')) if brotli else (('gzip', '.gz'),)
+
+
+def _fingerprint(name, content):
+    """'css/game.css' -> 'css/game.<first 10 hex of sha256>.css'"""
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{extension}"
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def build(static_dir, out_dir):
+    """
+    Copy every asset under static_dir to out_dir with a content hash in its
+    name, next to .gz (and, with brotli installed, .br) variants.
+
+    A variant is only kept when it is smaller than the file. out_dir is
+    rebuilt from scratch and gets a manifest of {source name: hashed name}.
+
+    Returns:
+        The manifest
+    """
+    shutil.rmtree(out_dir, ignore_errors=True)
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != out_dir)
+        for filename in sorted(files):
+            if not filename.endswith(ASSET_EXTENSIONS):
+                continue
+            source = os.path.join(root, filename)
+            name = os.path.relpath(source, static_dir).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                content = f.read()
+
+            hashed = _fingerprint(name, content)
+            target = os.path.join(out_dir, hashed)
+            _write(target, content)
+            # mtime=0 keeps gzip output identical across builds
+            variants = {'.gz': gzip.compress(content, 9, mtime=0)}
+            if brotli:
+                variants['.br'] = brotli.compress(content, quality=11)
+            for suffix, compressed in variants.items():
+                if len(compressed) < len(content):
+                    _write(target + suffix, compressed)
+            manifest[name] = hashed
+
+    _write(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+class AssetManifest:
+    """
+    Maps asset names to their built, fingerprinted files.
+
+    Loaded once at startup. Without a build every lookup misses, and pages
+    fall back to the plain /static files.
+    """
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self._hashed = {}  # source name -> hashed name
+        self._encodings = {}  # hashed name -> encodings it was precompressed in
+        self.load()
+
+    def load(self):
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST)) as f:
+                self._hashed = json.load(f)
+        except (OSError, ValueError):
+            self._hashed = {}
+        self._encodings = {
+            hashed: [
+                (encoding, suffix) for encoding, suffix in ENCODINGS
+                if os.path.exists(os.path.join(self.out_dir, hashed + suffix))
+            ]
+            for hashed in self._hashed.values()
+        }
+
+    def hashed(self, name):
+        """Fingerprinted name of a built asset, or None."""
+        return self._hashed.get(name)
+
+    def variant(self, hashed, accepts):
+        """
+        Pick the file to send for a fingerprinted name.
+
+        Args:
+            hashed: Name from the manifest, e.g. 'css/game.3f2a9c1b0d.css'
+            accepts: Callable(encoding) -> whether the client accepts it
+
+        Returns:
+            (path, Content-Encoding or None), or None for an unknown name
+        """
+        encodings = self._encodings.get(hashed)
+        if encodings is None:
+            return None
+        path = os.path.join(self.out_dir, hashed)
+        for encoding, suffix in encodings:
+            if accepts(encoding):
+                return path + suffix, encoding
+        return path, None
+
+    def __len__(self):
+        return len(self._hashed)
@@ -0,0 +1,300 @@
+"""Flask-SocketIO's interface on python-socketio's asyncio (ASGI) server."""
+
+import time
+import asyncio
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import flask
+import flask_login
+import socketio
+from a2wsgi import WSGIMiddleware
+
+
+class _Stopped(BaseException):
+    """Raised in a background task's sleep() once the server is stopping."""
+
+
+class _TurnLock:
+    """
+    A lock handed to waiters in the order they asked for it.
+
+    threading.Lock lets a thread that releases it take it straight back,
+    so a busy game could keep a waiting handler out for seconds.
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._waiters = deque()
+        self._held = False
+        self.owner = None  # Ident of the thread holding it
+
+    def acquire(self, first=False):
+        """Wait for the lock; `first` goes ahead of everyone already waiting."""
+        with self._mutex:
+            if not self._held:
+                self._held = True
+                self.owner = threading.get_ident()
+                return True
+            turn = threading.Lock()
+            turn.acquire()
+            if first:
+                self._waiters.appendleft(turn)
+            else:
+                self._waiters.append(turn)
+        turn.acquire()  # Released by the holder, which hands the lock over
+        self.owner = threading.get_ident()
+        return True
+
+    def release(self):
+        with self._mutex:
+            self.owner = None
+            if self._waiters:
+                self._waiters.popleft().release()
+            else:
+                self._held = False
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _Rooms:
+    """The server.enter_room / leave_room calls the app makes, from any thread."""
+
+    def __init__(self, owner):
+        self._owner = owner
+
+    def enter_room(self, sid, room, namespace=None):
+        self._owner.call_soon(self._owner.sio.enter_room(sid, room, namespace=namespace))
+
+    def leave_room(self, sid, room, namespace=None):
+        self._owner.call_soon(self._owner.sio.leave_room(sid, room, namespace=namespace))
+
+
+class AsyncioSocketIO:
+    """
+    Stands in for flask_socketio.SocketIO when the server runs on asyncio.
+
+    Socket.IO traffic is handled on the event loop by python-socketio's
+    AsyncServer. The application's own code stays synchronous and runs on
+    threads. Event handlers and background tasks take turns holding
+    `lock`, giving it up in sleep(), which is where eventlet would switch
+    green threads, and around database I/O (unlocked()), so the game code
+    keeps the one-at-a-time semantics it was written for. HTTP requests go
+    through a2wsgi on a pool of their own, without the lock; routes that
+    touch games take it themselves. A blocking call holds up at most the
+    work waiting on the lock, never the loop, so sockets keep flowing and
+    nothing needs monkey patching.
+
+    Emits and room changes made on a worker thread are handed to the loop
+    in the order they were made.
+    """
+
+    HANDLER_THREADS = 64  # Socket.IO events, most of them waiting for the lock
+    TASK_THREADS = 32  # Background tasks: game actors, timers, the outbox
+    HTTP_THREADS = 16  # Flask requests, apart from socket work
+
+    def __init__(self, app, message_queue=None, **kwargs):
+        """
+        Args:
+            app: Flask app whose request context handlers run in
+            message_queue: Redis URL shared with other workers, or None
+            **kwargs: Passed to socketio.AsyncServer (cors_allowed_origins, json, ...)
+        """
+        self.app = app
+        manager = socketio.AsyncRedisManager(message_queue) if message_queue else None
+        self.sio = socketio.AsyncServer(async_mode='asgi', client_manager=manager, **kwargs)
+        self.server = _Rooms(self)
+        self.lock = _TurnLock()
+        # Separate pools, so handlers queued for the lock never hold up a
+        # page load, and a burst of events never delays a timer
+        self.handlers = ThreadPoolExecutor(self.HANDLER_THREADS, thread_name_prefix='game42-event')
+        self.tasks = ThreadPoolExecutor(self.TASK_THREADS, thread_name_prefix='game42-task')
+        self.http = WSGIMiddleware(self._wsgi, workers=self.HTTP_THREADS)
+        self._stopping = threading.Event()  # Set on shutdown; ends sleeping tasks
+        self.loop = None  # Set when the ASGI server starts
+        self._environ = {}  # sid -> environ of the connection's handshake
+        self._turns = {}  # sid -> asyncio.Lock keeping a connection's events in order
+        self._requests = set()  # Idents of threads serving an HTTP request
+        # flask_socketio.emit() and join_room() look the server up here
+        app.extensions['socketio'] = self
+
+    # -- the SocketIO interface app.py uses ------------------------------
+
+    def on(self, event, namespace='/'):
+        """Register a synchronous Flask-SocketIO style handler for an event."""
+        def decorator(handler):
+            if event == 'connect':
+                async def on_connect(sid, environ, auth=None):
+                    self._environ[sid] = environ
+                    self._turns[sid] = asyncio.Lock()
+                    accepted = await self._handle(handler, sid, ())
+                    if accepted is False:
+                        self._environ.pop(sid, None)
+                        self._turns.pop(sid, None)
+                    return accepted
+                self.sio.on('connect', on_connect, namespace=namespace)
+            elif event == 'disconnect':
+                async def on_disconnect(sid):
+                    try:
+                        await self._handle(handler, sid, ())
+                    finally:
+                        self._environ.pop(sid, None)
+                        self._turns.pop(sid, None)
+                self.sio.on('disconnect', on_disconnect, namespace=namespace)
+            else:
+                async def on_event(sid, *args):
+                    return await self._handle(handler, sid, args)
+                self.sio.on(event, on_event, namespace=namespace)
+            return handler
+        return decorator
+
+    def emit(self, event, *args, to=None, room=None, namespace='/', skip_sid=None,
+             callback=None, **kwargs):
+        """Queue an emit on the loop; safe from any thread."""
+        self.call_soon(self.sio.emit(
+            event, *args, to=to or room, namespace=namespace, skip_sid=skip_sid, callback=callback
+        ))
+
+    def start_background_task(self, target, *args, **kwargs):
+        """
+        Run target on the task pool, holding the lock except while it
+        sleeps. Once the server stops, sleep() ends loops that never return.
+        """
+        return self.tasks.submit(self._task, target, *args, **kwargs)
+
+    def start_listener(self, listen):
+        """
+        Run a loop that blocks in a socket read (a message queue
+        subscription) on a daemon thread, without the lock.
+
+        `listen` is called with a function, call(callback, *args), that it
+        must use to run each callback with the lock held.
+        """
+        thread = threading.Thread(target=listen, args=(self._locked,),
+                                  name='game42-listener', daemon=True)
+        thread.start()
+        return thread
+
+    def running_threads(self):
+        """Idents of the threads running app code now: the lock holder and HTTP requests."""
+        owner = self.lock.owner
+        return ([owner] if owner is not None else []) + list(self._requests)
+
+    @contextmanager
+    def unlocked(self):
+        """
+        Let other threads have the lock around blocking I/O, such as a
+        database write, made while holding it. The thread gets it back
+        ahead of the queue, so the work it is in the middle of finishes
+        first. A thread that does not hold the lock (an HTTP request) just
+        runs the block.
+        """
+        if self.lock.owner != threading.get_ident():
+            yield
+            return
+        self.lock.release()
+        try:
+            yield
+        finally:
+            self.lock.acquire(first=True)
+
+    def sleep(self, seconds=0):
+        """Give the lock to other threads for `seconds`; callers must hold it."""
+        self.lock.release()
+        try:
+            if seconds > 0:
+                self._stopping.wait(seconds)
+            else:
+                time.sleep(0)  # Event.wait(0) would not let other threads run
+        finally:
+            self.lock.acquire()
+        if self._stopping.is_set():
+            raise _Stopped()
+
+    # -- plumbing --------------------------------------------------------
+
+    def call_soon(self, coroutine):
+        """Schedule a coroutine on the loop without waiting for it."""
+        asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def _handle(self, handler, sid, args):
+        # One event at a time per connection, in arrival order, as on eventlet
+        turn = self._turns.get(sid)
+        if turn is None:  # Arrived after the disconnect; dropped
+            return None
+        async with turn:
+            return await self.loop.run_in_executor(
+                self.handlers, self._run_handler, handler, sid, args)
+
+    def _run_handler(self, handler, sid, args):
+        """Call a handler the way Flask-SocketIO does: in a request context for sid."""
+        environ = self._environ.get(sid)
+        if environ is None:  # Arrived after the disconnect; dropped
+            return None
+        with self.app.request_context(environ):
+            flask.request.sid = sid
+            flask.request.namespace = '/'
+            # Loading the user may query the database; do it before queueing for the lock
+            flask_login.current_user._get_current_object()
+            with self.lock:
+                if sid not in self._environ:
+                    return None
+                return handler(*args)
+
+    def _wsgi(self, environ, start_response):
+        """
+        The Flask app, on an HTTP thread. The lock is not held: password
+        hashes and database reads run alongside game work, and routes that
+        touch games take the lock.
+        """
+        thread = threading.get_ident()
+        self._requests.add(thread)
+        try:
+            return self.app.wsgi_app(environ, start_response)
+        finally:
+            self._requests.discard(thread)
+
+    def asgi_app(self, on_startup=None, on_shutdown=None):
+        """
+        The ASGI application: Socket.IO on the loop, everything else to Flask.
+
+        Args:
+            on_startup: Callable run (with the lock held) once the loop is up
+            on_shutdown: Callable run (with the lock held) when the server stops
+        """
+        async def startup():
+            self.loop = asyncio.get_running_loop()
+            if on_startup:
+                await self.loop.run_in_executor(self.handlers, self._locked, on_startup)
+
+        async def shutdown():
+            if on_shutdown:
+                await self.loop.run_in_executor(self.handlers, self._locked, on_shutdown)
+            # Sleeping tasks end now, busy ones at their next sleep
+            self._stopping.set()
+            for pool in (self.handlers, self.tasks):
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        return socketio.ASGIApp(
+            self.sio, other_asgi_app=self.http, on_startup=startup, on_shutdown=shutdown
+        )
+
+    def _locked(self, fn, *args, **kwargs):
+        with self.lock:
+            return fn(*args, **kwargs)
+
+    def _task(self, target, *args, **kwargs):
+        """A background task; the pool would keep its exception to itself."""
+        try:
+            self._locked(target, *args, **kwargs)
+        except _Stopped:
+            pass
+        except Exception:
+            traceback.print_exc()
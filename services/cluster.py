@@ -0,0 +1,253 @@
+"""Game ownership across worker processes and command forwarding between them."""
+
+import bisect
+import hashlib
+import json
+import time
+
+from services.actors import Command
+
+
+class LocalBroker:
+    """In-process publish/subscribe broker for a single worker."""
+
+    def __init__(self):
+        self._handlers = {}  # channel -> callback
+
+    def publish(self, channel, message):
+        """Deliver a message to the channel's subscriber, if any."""
+        handler = self._handlers.get(channel)
+        if handler:
+            handler(message)
+
+    def subscribe(self, channel, callback):
+        """Register the callback for a channel."""
+        self._handlers[channel] = callback
+
+    def listen(self, call=None):
+        """Nothing to poll; messages are delivered on publish."""
+
+
+class RedisBroker:
+    """
+    Publish/subscribe over Redis (or any server speaking its protocol).
+
+    The same server also carries Flask-SocketIO's message queue, so emits
+    from the owning worker reach clients connected to any worker.
+    """
+
+    def __init__(self, url):
+        import redis  # Only needed for multi-worker deployments
+
+        self._redis = redis.Redis.from_url(url)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._handlers = {}
+
+    def publish(self, channel, message):
+        """Publish a JSON-encoded message."""
+        self._redis.publish(channel, json.dumps(message))
+
+    def subscribe(self, channel, callback):
+        """Register the callback for a channel."""
+        self._handlers[channel] = callback
+        self._pubsub.subscribe(channel)
+
+    def listen(self, call=None):
+        """
+        Blocking loop that hands incoming messages to their callbacks.
+
+        Args:
+            call: Callable(callback, message) that runs each callback (for
+                example holding a lock); by default callbacks are called directly
+        """
+        for message in self._pubsub.listen():
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode('utf-8')
+            handler = self._handlers.get(channel)
+            if handler:
+                try:
+                    if call:
+                        call(handler, json.loads(message['data']))
+                    else:
+                        handler(json.loads(message['data']))
+                except Exception as e:
+                    print(f"Error handling message on {channel}: {e}")
+
+
+class HashRing:
+    """
+    Consistent-hash ring of worker ids.
+
+    Each worker is placed on the ring at `replicas` points; a key belongs
+    to the first worker point at or after its hash. Adding or removing a
+    worker only moves the keys next to that worker's points.
+    """
+
+    def __init__(self, workers=(), replicas=64):
+        self.replicas = replicas
+        self._points = []  # Sorted hashes
+        self._owners = {}  # hash -> worker id
+        self._workers = set()
+        for worker in workers:
+            self.add(worker)
+
+    @staticmethod
+    def _hash(key):
+        digest = hashlib.md5(str(key).encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big')
+
+    def add(self, worker):
+        """Place a worker on the ring."""
+        self._workers.add(worker)
+        for replica in range(self.replicas):
+            point = self._hash(f"worker-{worker}#{replica}")
+            if point not in self._owners:
+                bisect.insort(self._points, point)
+                self._owners[point] = worker
+
+    def remove(self, worker):
+        """Take a worker off the ring."""
+        self._workers.discard(worker)
+        for replica in range(self.replicas):
+            point = self._hash(f"worker-{worker}#{replica}")
+            if self._owners.get(point) == worker:
+                del self._owners[point]
+                self._points.pop(bisect.bisect_left(self._points, point))
+
+    def owner(self, key):
+        """Worker responsible for a key, or None if the ring is empty."""
+        if not self._points:
+            return None
+        idx = bisect.bisect_left(self._points, self._hash(key))
+        return self._owners[self._points[idx % len(self._points)]]
+
+    @property
+    def workers(self):
+        """Set of workers on the ring."""
+        return set(self._workers)
+
+    def __contains__(self, worker):
+        return worker in self._workers
+
+
+class Cluster:
+    """
+    Routes every game to a single owner worker.
+
+    Ownership is assigned by consistent hashing of game_id over the live
+    workers. Only the owner keeps the game in memory and applies its
+    commands; a worker that receives an event for a game it does not own
+    forwards the command to the owner's channel, and the owner's emits
+    reach the sender through the Socket.IO message queue.
+
+    Workers announce themselves on a membership channel and heartbeat
+    there. When a worker leaves (or stops heartbeating) it is taken off
+    the ring and its games move to the neighbouring workers, which load
+    them from storage on the next command.
+    """
+
+    CHANNEL_PREFIX = 'game42:worker:'
+    MEMBERSHIP_CHANNEL = 'game42:members'
+    HEARTBEAT_INTERVAL = 5  # seconds
+    HEARTBEAT_TIMEOUT = 15  # seconds without a heartbeat before a peer is dropped
+
+    def __init__(self, worker_id=0, worker_count=1, broker=None, clock=time.monotonic):
+        self.worker_id = worker_id
+        self.worker_count = worker_count
+        self.broker = broker or LocalBroker()
+        self.clock = clock
+        # Every configured worker is assumed alive until it misses heartbeats
+        self.ring = HashRing(range(worker_count))
+        self._last_seen = {worker: clock() for worker in range(worker_count)}
+        self._on_change = None
+        self._running = False
+
+    def owner_of(self, game_id):
+        """Worker id that owns a game (stable across processes)."""
+        if self.worker_count <= 1:
+            return self.worker_id
+        return self.ring.owner(game_id)
+
+    def is_local(self, game_id):
+        """Check if this worker owns a game."""
+        return self.owner_of(game_id) == self.worker_id
+
+    def channel(self, worker_id):
+        """Broker channel a worker listens on."""
+        return f"{self.CHANNEL_PREFIX}{worker_id}"
+
+    def forward(self, command):
+        """Send a command to the worker that owns its game."""
+        self.broker.publish(self.channel(self.owner_of(command.game_id)), command._asdict())
+
+    def start(self, spawn, sleep, deliver, on_change=None, listen=None):
+        """
+        Join the cluster and start receiving forwarded commands.
+
+        Args:
+            spawn: Callable(fn) that starts a green thread
+            sleep: Cooperative sleep function
+            deliver: Callable(command) that queues a Command locally
+            on_change: Callable() run after ownership changes
+            listen: Callable(loop) that starts the broker's receive loop,
+                which blocks between messages (defaults to spawn)
+        """
+        self._on_change = on_change
+        self.broker.subscribe(self.channel(self.worker_id), lambda msg: deliver(Command(**msg)))
+        if self.worker_count <= 1:
+            return
+
+        self.broker.subscribe(self.MEMBERSHIP_CHANNEL, self._on_membership)
+        self._running = True
+        (listen or spawn)(self.broker.listen)
+        spawn(self._heartbeat, sleep)
+        self._announce('join')
+
+    def stop(self):
+        """Leave the cluster; peers take over this worker's games."""
+        if self._running:
+            self._running = False
+            self._announce('leave')
+            # From here on owner_of() points at the workers taking over
+            self.ring.remove(self.worker_id)
+
+    def _announce(self, kind):
+        self.broker.publish(self.MEMBERSHIP_CHANNEL, {'type': kind, 'worker': self.worker_id})
+
+    def _on_membership(self, message):
+        worker = message['worker']
+        if worker == self.worker_id:
+            return
+
+        if message['type'] == 'leave':
+            self._last_seen.pop(worker, None)
+            if worker in self.ring:
+                self.ring.remove(worker)
+                self._changed()
+            return
+
+        self._last_seen[worker] = self.clock()
+        if worker not in self.ring:
+            self.ring.add(worker)
+            self._changed()
+        if message['type'] == 'join':
+            # Let the newcomer know we are here
+            self._announce('heartbeat')
+
+    def _heartbeat(self, sleep):
+        """Publish heartbeats and drop peers that have gone quiet."""
+        while self._running:
+            self._announce('heartbeat')
+            cutoff = self.clock() - self.HEARTBEAT_TIMEOUT
+            for worker, seen in list(self._last_seen.items()):
+                if worker != self.worker_id and seen < cutoff:
+                    del self._last_seen[worker]
+                    if worker in self.ring:
+                        self.ring.remove(worker)
+                        self._changed()
+            sleep(self.HEARTBEAT_INTERVAL)
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change()
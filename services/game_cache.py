@@ -0,0 +1,73 @@
+"""Bounded in-memory cache of the games this worker owns."""
+
+from collections import OrderedDict
+
+
+class GameCache:
+    """
+    LRU cache of live Game objects keyed by game_id.
+
+    Holds at most `max_size` games. Inserting past the limit evicts the
+    least recently used game, after handing it to `on_evict(game)` so it
+    can be flushed to storage; the next event for it reloads it. Lookups
+    through get() count as hits or misses.
+    """
+
+    def __init__(self, max_size=1000, on_evict=None):
+        self.max_size = max_size
+        self.on_evict = on_evict
+        self._games = OrderedDict()  # game_id -> Game, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, game_id, default=None):
+        """Return a cached game (marking it recently used), or default."""
+        game = self._games.get(game_id)
+        if game is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._games.move_to_end(game_id)
+        return game
+
+    def __getitem__(self, game_id):
+        game = self.get(game_id)
+        if game is None:
+            raise KeyError(game_id)
+        return game
+
+    def __setitem__(self, game_id, game):
+        self._games[game_id] = game
+        self._games.move_to_end(game_id)
+        while len(self._games) > self.max_size:
+            _, victim = self._games.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict:
+                try:
+                    self.on_evict(victim)
+                except Exception as e:
+                    print(f"Error hibernating game {victim.game_id}: {e}")
+
+    def pop(self, game_id, default=None):
+        """Remove a game without evicting it (no on_evict call)."""
+        return self._games.pop(game_id, default)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
+
+    def __iter__(self):
+        return iter(list(self._games))
+
+    def __len__(self):
+        return len(self._games)
+
+    def stats(self):
+        """Size and hit/miss/eviction counters."""
+        return {
+            'size': len(self._games),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
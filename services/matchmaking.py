@@ -0,0 +1,260 @@
+"""Quick-match queue: players grouped four to a table."""
+
+import time
+import heapq
+import itertools
+
+TABLE_SIZE = 4
+# Games played before a user leaves the 'new' skill band
+PROVISIONAL_GAMES = 10
+
+
+def skill_bucket(stats):
+    """Quick-match band for a User.to_dict(): 'new' for a user's first games, then by win rate."""
+    if stats['games_played'] < PROVISIONAL_GAMES:
+        return 'new'
+    if stats['win_rate'] < 45:
+        return 'low'
+    if stats['win_rate'] < 55:
+        return 'mid'
+    return 'high'
+
+
+class Ticket:
+    """A place in the queue: one player, or two who sit together as a team."""
+
+    __slots__ = ('seq', 'players', 'bucket', 'queued_at', 'live')
+
+    def __init__(self, seq, players, bucket, queued_at):
+        self.seq = seq  # Arrival order
+        self.players = players  # Tuple of the player dicts given to enqueue()
+        self.bucket = bucket
+        self.queued_at = queued_at
+        self.live = True  # False once matched or cancelled
+
+    @property
+    def size(self):
+        return len(self.players)
+
+
+class _Bucket:
+    """The tickets waiting in one bucket, by arrival."""
+
+    __slots__ = ('singles', 'pairs', 'seats')
+
+    def __init__(self):
+        self.singles = []  # Heap of (seq, Ticket)
+        self.pairs = []  # Heap of (seq, Ticket)
+        self.seats = 0  # Players in live tickets
+
+    def heap_for(self, ticket):
+        return self.pairs if ticket.size == 2 else self.singles
+
+
+class Matchmaker:
+    """
+    Groups queued players four at a time, first come first served.
+
+    Each player waits in a bucket (a skill band, or None for anyone) and is
+    only matched within it. Two players who give the same team code become
+    one ticket once both have arrived, and sit as partners. Every bucket
+    keeps its single and team tickets in two heaps by arrival, and one more
+    heap orders all tickets by arrival for the bot-fill deadline, so
+    queueing, matching and finding the longest wait are O(log n). A
+    cancelled ticket is only marked and is skipped when it reaches the
+    top of a heap.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._seq = itertools.count()
+        self._buckets = {}  # bucket -> _Bucket
+        self._oldest = []  # Heap of (seq, Ticket) across buckets
+        self._tickets = {}  # user_id -> live Ticket
+        self._teams = {}  # team code -> (player, bucket) waiting for a partner
+        self._held = {}  # user_id -> team code they wait on
+        self._size = 0  # Players in live tickets
+
+    def enqueue(self, player, bucket=None, team=None):
+        """
+        Queue a player, replacing any place they already held.
+
+        Args:
+            player: Dict with at least 'user_id'; handed back in matches
+            bucket: Hashable group the player is matched within (None = anyone)
+            team: Code shared with a partner to sit together, or None
+
+        Returns:
+            The Ticket, or None while a team waits for its second player
+        """
+        self.cancel(player['user_id'])
+        players = (player,)
+        if team is not None:
+            waiting = self._teams.pop(team, None)
+            if waiting is None:
+                self._teams[team] = (player, bucket)
+                self._held[player['user_id']] = team
+                return None
+            partner, bucket = waiting  # The first to arrive picked the bucket
+            del self._held[partner['user_id']]
+            players = (partner, player)
+
+        ticket = Ticket(next(self._seq), players, bucket, self.clock())
+        queue = self._buckets.setdefault(bucket, _Bucket())
+        heapq.heappush(queue.heap_for(ticket), (ticket.seq, ticket))
+        heapq.heappush(self._oldest, (ticket.seq, ticket))
+        queue.seats += ticket.size
+        self._size += ticket.size
+        for p in players:
+            self._tickets[p['user_id']] = ticket
+        return ticket
+
+    def cancel(self, user_id):
+        """
+        Take a player out of the queue, with their partner if they have one.
+
+        Returns:
+            Tuple of the player dicts removed (empty if they were not queued)
+        """
+        team = self._held.pop(user_id, None)
+        if team is not None:
+            player, _ = self._teams.pop(team)
+            return (player,)
+
+        ticket = self._tickets.get(user_id)
+        if ticket is None:
+            return ()
+        self._drop(ticket)
+        return ticket.players
+
+    def find(self, user_id):
+        """The player dict a user is queued (or waiting for a partner) with, or None."""
+        team = self._held.get(user_id)
+        if team is not None:
+            return self._teams[team][0]
+        ticket = self._tickets.get(user_id)
+        if ticket is None:
+            return None
+        return next(p for p in ticket.players if p['user_id'] == user_id)
+
+    def match(self, bucket=None):
+        """
+        Take a full table from a bucket, if it has enough players.
+
+        Of the ways to fill four seats (four singles, a team and two
+        singles, two teams) the one whose latest ticket arrived first is
+        used, so nobody is passed over for someone who queued after them.
+
+        Returns:
+            List of Tickets seating four, or None
+        """
+        queue = self._buckets.get(bucket)
+        if queue is None or queue.seats < TABLE_SIZE:
+            return None
+
+        singles = self._top(queue.singles, TABLE_SIZE)
+        pairs = self._top(queue.pairs, TABLE_SIZE // 2)
+        # Enough seats always allow at least one combination
+        options = [
+            pairs[:n] + singles[:TABLE_SIZE - 2 * n]
+            for n in range(len(pairs) + 1) if TABLE_SIZE - 2 * n <= len(singles)
+        ]
+        table = min(options, key=lambda tickets: max(t.seq for t in tickets))
+        self._take(queue, table, singles + pairs)
+        return table
+
+    def overdue(self, wait):
+        """
+        Take every ticket that has waited `wait` seconds or more, each with
+        the next arrivals of its bucket that fit at the same table. The
+        seats left over are for bots.
+
+        Returns:
+            List of tables, each a list of Tickets seating up to four
+        """
+        tables = []
+        cutoff = self.clock() - wait
+        while True:
+            first = self._first()
+            if first is None or first.queued_at > cutoff:
+                return tables
+
+            queue = self._buckets[first.bucket]
+            candidates = sorted(
+                self._top(queue.singles, TABLE_SIZE) + self._top(queue.pairs, TABLE_SIZE // 2),
+                key=lambda t: t.seq
+            )
+            table, seats = [], TABLE_SIZE
+            for ticket in candidates:
+                if ticket.size <= seats:
+                    table.append(ticket)
+                    seats -= ticket.size
+            self._take(queue, table, candidates)
+            tables.append(table)
+
+    def next_overdue(self, wait):
+        """Seconds until the longest-waiting ticket has waited `wait`, or None if none is queued."""
+        first = self._first()
+        if first is None:
+            return None
+        return max(0.0, first.queued_at + wait - self.clock())
+
+    def clear(self):
+        """
+        Empty the queue.
+
+        Returns:
+            List of the player dicts that were queued or waiting for a partner
+        """
+        players = [p for ticket in set(self._tickets.values()) for p in ticket.players]
+        players.extend(player for player, _ in self._teams.values())
+        self._buckets.clear()
+        self._oldest.clear()
+        self._tickets.clear()
+        self._teams.clear()
+        self._held.clear()
+        self._size = 0
+        return players
+
+    def waiting(self, bucket=None):
+        """Players queued in a bucket."""
+        queue = self._buckets.get(bucket)
+        return queue.seats if queue else 0
+
+    def _top(self, heap, count):
+        """Pop up to `count` live tickets off a bucket heap, oldest first."""
+        taken = []
+        while heap and len(taken) < count:
+            _, ticket = heapq.heappop(heap)
+            if ticket.live:
+                taken.append(ticket)
+        return taken
+
+    def _take(self, queue, table, popped):
+        """Drop the tickets seated at a table and put the other popped ones back."""
+        for ticket in popped:
+            if ticket in table:
+                self._drop(ticket)
+            else:
+                heapq.heappush(queue.heap_for(ticket), (ticket.seq, ticket))
+
+    def _first(self):
+        """The live ticket that has waited longest, or None."""
+        while self._oldest and not self._oldest[0][1].live:
+            heapq.heappop(self._oldest)
+        return self._oldest[0][1] if self._oldest else None
+
+    def _drop(self, ticket):
+        ticket.live = False
+        for p in ticket.players:
+            del self._tickets[p['user_id']]
+        self._size -= ticket.size
+        queue = self._buckets[ticket.bucket]
+        queue.seats -= ticket.size
+        if not queue.seats:
+            # Only cancelled entries are left in its heaps
+            del self._buckets[ticket.bucket]
+
+    def __len__(self):
+        """Players queued or waiting for a partner."""
+        return self._size + len(self._teams)
@@ -0,0 +1,207 @@
+"""In-process metrics exported in the Prometheus text format."""
+
+import json
+import time
+import threading
+from bisect import bisect_left
+
+
+# Seconds; covers a cached lookup up to a slow save
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Serialized payload bytes
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+# Queries per request or command
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A value that only goes up, optionally split by labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values = {}  # label values -> count
+        self._lock = threading.Lock()  # Recorded from more than one thread in asyncio mode
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        for values, count in list(self._values.items()):
+            yield self.name, _format_labels(self.labels, values), count
+
+
+class Gauge:
+    """
+    A value read at scrape time from `read()`.
+
+    `read` returns a number, or {label values tuple: number} when the gauge
+    has labels, so nothing is recorded between scrapes.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, description, read, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.read = read
+
+    def samples(self):
+        value = self.read()
+        if not self.labels:
+            yield self.name, '', value
+            return
+        for values, number in value.items():
+            yield self.name, _format_labels(self.labels, values), number
+
+
+class ReadCounter(Gauge):
+    """
+    A counter kept by some other object and read at scrape time.
+
+    For totals a service already counts for itself (cache hits, dropped
+    events); `read` works as for Gauge.
+    """
+
+    kind = 'counter'
+
+
+class Histogram:
+    """
+    Observations counted into fixed buckets, optionally split by labels.
+
+    Recording is a bisect and three additions; cumulative bucket counts
+    are only worked out when the registry is scraped.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, buckets=LATENCY_BUCKETS, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def time(self, *label_values):
+        """Context manager observing the seconds spent in its block."""
+        return _Timer(self, label_values)
+
+    def samples(self):
+        with self._lock:
+            series = [(values, list(counts), total) for values, (counts, total) in self._series.items()]
+        for values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = (('le', _format_value(bound)),)
+                yield f'{self.name}_bucket', _format_labels(self.labels, values, le), cumulative
+            labels = _format_labels(self.labels, values)
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class _Timer:
+    __slots__ = ('histogram', 'label_values', 'start')
+
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+        return False
+
+
+class MetricsRegistry:
+    """Owns a set of metrics and renders them for a scrape."""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self._metrics = {}  # name -> metric
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, description, labels=()):
+        return self.register(Counter(name, description, labels))
+
+    def gauge(self, name, description, read, labels=()):
+        return self.register(Gauge(name, description, read, labels))
+
+    def counter_from(self, name, description, read, labels=()):
+        return self.register(ReadCounter(name, description, read, labels))
+
+    def histogram(self, name, description, buckets=LATENCY_BUCKETS, labels=()):
+        return self.register(Histogram(name, description, buckets, labels))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class MeasuredJSON:
+    """
+    Stand-in for the json module that records the size of every document
+    it writes.
+
+    Handed to Socket.IO as its json module, it measures each packet as it
+    is encoded, so a room emit is counted once like it is encoded once.
+    """
+
+    def __init__(self, histogram, *label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def dumps(self, *args, **kwargs):
+        text = json.dumps(*args, **kwargs)
+        self.histogram.observe(len(text), *self.label_values)
+        return text
+
+    def loads(self, *args, **kwargs):
+        return json.loads(*args, **kwargs)
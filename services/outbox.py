@@ -0,0 +1,89 @@
+"""Outbound event buffer that coalesces emits into batch frames."""
+
+from contextlib import contextmanager
+
+
+class Outbox:
+    """
+    Buffers emits per target and sends them as ordered batch frames.
+
+    Events emitted while a command runs (or within `window` seconds of the
+    first buffered event) are held back. Consecutive events for the same
+    target (a game room or a single sid) are merged into one 'batch' frame of
+    [event, data] pairs; a lone event goes out as itself. Events for
+    different targets keep their relative order, so a viewer that is in
+    several targets never sees them reordered.
+    """
+
+    BATCH_EVENT = 'batch'
+
+    def __init__(self, send, spawn=None, sleep=None, window=0):
+        """
+        Args:
+            send: Callable(event, data, to=None, room=None) that emits one
+                  frame to a sid (to) or a game's room (room)
+            spawn: Callable(fn) that starts a green thread (needed for window > 0)
+            sleep: Cooperative sleep function (needed for window > 0)
+            window: Extra seconds to hold events after a command finishes;
+                    0 flushes as soon as the command returns
+        """
+        self._send = send
+        self._spawn = spawn
+        self._sleep = sleep
+        self.window = window
+        self._segments = []  # [(kind, target), [[event, data], ...]] in emit order
+        self._depth = 0
+        self._flush_scheduled = False
+        self.frames_sent = 0
+        self.events_sent = 0
+
+    def emit(self, event, data, to=None, room=None):
+        """Queue an event for a sid (to) or a game's room (room)."""
+        target = ('room', room) if room is not None else ('to', to)
+        if self._segments and self._segments[-1][0] == target:
+            self._segments[-1][1].append([event, data])
+        else:
+            self._segments.append([target, [[event, data]]])
+
+        if not self._depth:
+            self._schedule_flush()
+
+    @contextmanager
+    def batch(self):
+        """Hold every emit made inside the block until it exits."""
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth and self._segments:
+                self._schedule_flush()
+
+    def flush(self):
+        """Send everything buffered so far."""
+        segments, self._segments = self._segments, []
+        for (kind, target), events in segments:
+            if len(events) == 1:
+                self._send(events[0][0], events[0][1], **{kind: target})
+            else:
+                self._send(self.BATCH_EVENT, events, **{kind: target})
+            self.frames_sent += 1
+            self.events_sent += len(events)
+
+    def _schedule_flush(self):
+        if not self.window:
+            self.flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._spawn(self._flush_later)
+
+    def _flush_later(self):
+        self._sleep(self.window)
+        self._flush_scheduled = False
+        if self._depth:
+            # A command is mid-flight; it flushes when it finishes
+            return
+        self.flush()
+
+    def __len__(self):
+        return sum(len(events) for _, events in self._segments)
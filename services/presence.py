@@ -0,0 +1,82 @@
+"""Live connections per game and per user."""
+
+
+class Presence:
+    """
+    Tracks which users are connected to each game, and through which sids.
+
+    A user may have several connections (tabs, a reconnect racing the old
+    socket); they count as present while any of them is open. Users whose
+    absence has been announced are remembered so their return can be
+    announced too. The owner worker keeps this state for its games.
+    """
+
+    def __init__(self):
+        self._sids = {}   # sid -> (game_id, user_id)
+        self._games = {}  # game_id -> {user_id: set of sids}
+        self._away = {}   # game_id -> user_ids announced as disconnected
+
+    def connect(self, sid, game_id, user_id):
+        """
+        Record a live connection.
+
+        Returns:
+            True if the user had been announced as away and is now back
+        """
+        self.disconnect(sid)
+        self._sids[sid] = (game_id, user_id)
+        self._games.setdefault(game_id, {}).setdefault(user_id, set()).add(sid)
+
+        away = self._away.get(game_id)
+        if away and user_id in away:
+            away.discard(user_id)
+            return True
+        return False
+
+    def disconnect(self, sid):
+        """
+        Forget a connection.
+
+        Returns:
+            (game_id, user_id, last) where `last` is True if the user has no
+            other connection to the game, or None for an unknown sid
+        """
+        binding = self._sids.pop(sid, None)
+        if not binding:
+            return None
+
+        game_id, user_id = binding
+        users = self._games.get(game_id, {})
+        sids = users.get(user_id, set())
+        sids.discard(sid)
+        if not sids:
+            users.pop(user_id, None)
+            if not users:
+                self._games.pop(game_id, None)
+        return game_id, user_id, not sids
+
+    def is_online(self, game_id, user_id):
+        """Check if a user has any connection to a game."""
+        return user_id in self._games.get(game_id, {})
+
+    def mark_away(self, game_id, user_id):
+        """Remember that a user's absence has been announced."""
+        self._away.setdefault(game_id, set()).add(user_id)
+
+    def is_away(self, game_id, user_id):
+        """Check if a user's absence has been announced."""
+        return user_id in self._away.get(game_id, ())
+
+    def connections(self, game_id):
+        """Number of live connections to a game."""
+        return sum(len(sids) for sids in self._games.get(game_id, {}).values())
+
+    def drop_game(self, game_id):
+        """Forget every connection to a game."""
+        for sids in self._games.pop(game_id, {}).values():
+            for sid in sids:
+                self._sids.pop(sid, None)
+        self._away.pop(game_id, None)
+
+    def __len__(self):
+        return len(self._sids)
@@ -0,0 +1,251 @@
+"""On-demand profiling of a running server: stack sampling and per-call cProfile."""
+
+import sys
+import time
+import uuid
+import marshal
+import pstats
+import cProfile
+from collections import Counter
+from functools import wraps
+
+import greenlet
+
+
+def _unpatched():
+    """
+    The real _thread and time modules, even when eventlet has monkey
+    patched the standard library; the sampler needs a real OS thread and a
+    real sleep. Imported on first use so loading this module stays cheap.
+    """
+    try:
+        from eventlet.patcher import original
+        return original('_thread'), original('time')
+    except ImportError:
+        import _thread
+        return _thread, time
+
+
+class ProfileRun:
+    """One profiling run and, once finished, its result."""
+
+    SAMPLE = 'sample'
+    CALLS = 'calls'
+
+    def __init__(self, kind, target):
+        self.id = uuid.uuid4().hex[:8]
+        self.kind = kind
+        self.target = target  # Seconds to sample, or the command profiled
+        self.started = time.time()
+        self.finished = None
+        self.samples = 0  # Stack samples or profiled calls so far
+        self.result = None  # Collapsed stacks (str) or pstats data (bytes)
+        self.cancelled = False
+        self.stop = None  # Ends a calls run early with what it has
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    @property
+    def filename(self):
+        extension = 'collapsed' if self.kind == self.SAMPLE else 'pstats'
+        return f"profile-{self.id}.{extension}"
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'target': self.target,
+            'samples': self.samples,
+            'done': self.done,
+            'cancelled': self.cancelled,
+            'filename': self.filename
+        }
+
+
+def _collapse(frame):
+    """Render a stack as 'outer;...;inner' frames for flame graphs."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Profiler:
+    """
+    Starts and keeps profiling runs for the admin endpoints.
+
+    Two kinds of run:
+      - sample(seconds): an OS thread snapshots the server thread's stack
+        every `interval` seconds. Green threads all run on that one thread,
+        so each sample is whatever greenlet held the CPU. When the app runs
+        on several OS threads, `threads` names the ones to snapshot at each
+        tick instead. The result is collapsed stacks for flamegraph.pl or
+        speedscope.
+      - calls(kind, count, seconds): the next `count` applications of a
+        command are run under cProfile, for at most `seconds`. The result
+        is a pstats file.
+
+    Nothing is hooked while no run is active: the sampler thread exits when
+    its time is up, and a profiled command's handler is swapped back as
+    soon as its last call returns or its time is up. cancel() ends either
+    kind early; the run keeps what it collected so far.
+    """
+
+    MAX_SECONDS = 300
+    MAX_CALLS = 1000
+    KEEP_RUNS = 10
+
+    def __init__(self, handlers, threads=None, timers=None):
+        """
+        Args:
+            handlers: {command kind: handler} mapping that calls() wraps
+            threads: Callable returning the idents of the threads running app
+                code right now; by default the thread that starts a run
+            timers: TaskScheduler that ends calls runs at their deadline;
+                without one they end only on their last call or cancel()
+        """
+        self.handlers = handlers
+        self.threads = threads
+        self.timers = timers
+        self.runs = {}  # id -> ProfileRun, oldest first
+        self._profiles = {}  # greenlet -> cProfile.Profile of a call in progress
+        self._previous_trace = None
+
+    def _add(self, run):
+        self.runs[run.id] = run
+        while len(self.runs) > self.KEEP_RUNS:
+            del self.runs[next(iter(self.runs))]
+        return run
+
+    def get(self, run_id):
+        return self.runs.get(run_id)
+
+    def cancel(self, run_id):
+        """
+        End a run now, keeping what it has collected. A sampling run
+        finishes at its next tick.
+
+        Returns:
+            The run, or None if there is no such run
+        """
+        run = self.runs.get(run_id)
+        if run is not None and not run.done:
+            run.cancelled = True
+            if run.stop is not None:
+                run.stop()
+        return run
+
+    def sample(self, seconds, interval=0.005):
+        """Sample the server's stacks for `seconds` in the background."""
+        run = self._add(ProfileRun(ProfileRun.SAMPLE, min(seconds, self.MAX_SECONDS)))
+        real_thread, real_time = _unpatched()
+        threads = self.threads
+        if threads is None:
+            caller = real_thread.get_ident()
+            threads = lambda: (caller,)
+        real_thread.start_new_thread(self._sample, (run, threads, real_time, interval))
+        return run
+
+    def _sample(self, run, threads, real_time, interval):
+        stacks = Counter()
+        deadline = real_time.monotonic() + run.target
+        while not run.cancelled and real_time.monotonic() < deadline:
+            real_time.sleep(interval)
+            frames = sys._current_frames()
+            for thread_id in threads():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[_collapse(frame)] += 1
+                    run.samples += 1
+            frames = frame = None  # Sampled stacks are not kept alive between ticks
+        run.result = ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        run.finished = real_time.time()
+
+    def calls(self, kind, count, seconds=MAX_SECONDS):
+        """
+        Profile the next `count` applications of a command. If they have
+        not all arrived after `seconds` (at most MAX_SECONDS), the handler
+        is restored and the run finishes with the calls it has.
+
+        Raises:
+            KeyError: Unknown command
+            ValueError: That command is already being profiled
+        """
+        handler = self.handlers[kind]
+        if getattr(handler, 'profile_run', None):
+            raise ValueError(f"{kind} is already being profiled")
+
+        run = self._add(ProfileRun(ProfileRun.CALLS, kind))
+        stats = []
+
+        def finish():
+            if run.done:
+                return
+            if self.handlers.get(kind) is profiled:
+                self.handlers[kind] = handler
+            if self.timers is not None:
+                self.timers.cancel(('profile', run.id))
+            self._finish_calls(run, stats)
+
+        @wraps(handler)
+        def profiled(*args):
+            profile = cProfile.Profile()
+            self._track(greenlet.getcurrent(), profile)
+            try:
+                return handler(*args)
+            finally:
+                self._untrack(greenlet.getcurrent())
+                if not run.done:  # Calls that overlapped the last one are left out
+                    stats.append(profile)
+                    run.samples += 1
+                    if run.samples >= count:
+                        finish()
+
+        profiled.profile_run = run
+        run.stop = finish
+        self.handlers[kind] = profiled
+        if self.timers is not None:
+            self.timers.schedule(('profile', run.id), min(seconds, self.MAX_SECONDS), finish)
+        return run
+
+    def _finish_calls(self, run, profiles):
+        merged = pstats.Stats()  # Empty if no call arrived in time
+        for profile in profiles:
+            merged.add(profile)
+        run.result = marshal.dumps(merged.stats)
+        run.finished = time.time()
+
+    # A profiled call can yield to other green threads (a socket write, a
+    # forwarded command). cProfile follows the OS thread, so it is paused
+    # whenever the call's greenlet is switched out and resumed when it is
+    # switched back in; other greenlets' work stays out of its numbers.
+
+    def _track(self, glet, profile):
+        if not self._profiles:
+            self._previous_trace = greenlet.settrace(self._on_switch)
+        self._profiles[glet] = profile
+        profile.enable()
+
+    def _untrack(self, glet):
+        profile = self._profiles.pop(glet, None)
+        if profile is not None:
+            profile.disable()
+        if not self._profiles:
+            greenlet.settrace(self._previous_trace)
+            self._previous_trace = None
+
+    def _on_switch(self, event, args):
+        if event in ('switch', 'throw'):
+            origin, target = args
+            paused = self._profiles.get(origin)
+            if paused is not None:
+                paused.disable()
+            resumed = self._profiles.get(target)
+            if resumed is not None:
+                resumed.enable()
+        if self._previous_trace is not None:
+            self._previous_trace(event, args)
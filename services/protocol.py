@@ -0,0 +1,191 @@
+"""
+Wire protocols spoken to game clients.
+
+Protocol '1' is the original: one Socket.IO event per message with a JSON
+dict payload. Protocol '2' sends every frame as a single 'm' event whose
+payload is a list of messages; the hot game events are positional arrays
+with tiles as integer codes (Domino.code), positions and phases as small
+indexes, and everything else passes through as [event_name, data].
+Protocol '2b' is protocol '2' packed with MessagePack into a binary frame.
+
+A connection picks its protocol in the Socket.IO handshake query
+(?proto=2b) and falls back to '1' for anything unknown. Each protocol has
+its own sub-room per game, so an emit is encoded once per protocol rather
+than once per viewer.
+"""
+
+from game_logic.domino import Domino
+from game_logic.game import Game
+from game_logic.player import Player
+
+try:
+    import msgpack
+except ImportError:  # Binary frames are optional
+    msgpack = None
+
+
+PROTOCOL_JSON = '1'
+PROTOCOL_COMPACT = '2'
+PROTOCOL_BINARY = '2b'
+
+# Protocols that get their own encoding of every frame
+COMPACT_PROTOCOLS = (PROTOCOL_COMPACT,) + ((PROTOCOL_BINARY,) if msgpack else ())
+
+WIRE_EVENT = 'm'
+
+POSITIONS = [Player.NORTH, Player.EAST, Player.SOUTH, Player.WEST]
+PHASES = [
+    Game.PHASE_WAITING, Game.PHASE_DEALING, Game.PHASE_BIDDING, Game.PHASE_TRUMP_SELECTION,
+    Game.PHASE_PLAYING, Game.PHASE_SCORING, Game.PHASE_FINISHED
+]
+
+# Field lists are (key, codec); the client mirrors them in static/js/wire.js
+PLAYER_FIELDS = (
+    ('user_id', None), ('username', None), ('is_ai', None), ('hand_count', None),
+    ('current_bid', None), ('has_passed', None), ('hand', 'tiles'),
+)
+TRICK_FIELDS = (
+    ('trick_number', None), ('plays', 'trick'), ('winner', 'pos'), ('points', None),
+    ('lead_suit', None), ('trump_suit', None), ('hand_result', None), ('new_hand', None),
+    ('game_winner', None),
+)
+EVENT_FIELDS = {
+    'game_state': (
+        ('game_id', None), ('phase', 'phase'), ('my_position', 'pos'), ('dealer', 'pos'),
+        ('current_turn', 'pos'), ('high_bid', None), ('high_bidder', 'pos'), ('trump_suit', None),
+        ('trick_number', None), ('current_trick', 'trick'), ('lead_suit', None),
+        ('team1_marks', None), ('team2_marks', None), ('team1_tricks', None), ('team2_tricks', None),
+        ('team1_hand_points', None), ('team2_hand_points', None), ('players', 'players'),
+        ('trick_history', 'tricks'), ('is_spectator', None),
+    ),
+    'bid_update': (
+        ('position', 'pos'), ('bid', None), ('high_bid', None), ('high_bidder', 'pos'),
+        ('current_bidder', 'pos'), ('current_turn', 'pos'), ('phase', 'phase'),
+    ),
+    'trump_selected': (
+        ('trump_suit', None), ('current_leader', 'pos'), ('phase', 'phase'),
+    ),
+    'domino_played': (
+        ('position', 'pos'), ('domino_id', 'tile'), ('current_trick', 'trick'), ('lead_suit', None),
+        ('current_turn', 'pos'), ('phase', 'phase'), ('trick_result', 'trick_result'),
+        ('team1_tricks', None), ('team2_tricks', None), ('team1_hand_points', None),
+        ('team2_hand_points', None), ('team1_marks', None), ('team2_marks', None),
+        ('game_over', None), ('winner', None),
+    ),
+    'hand_update': (
+        ('hand', 'tiles'),
+    ),
+    'seats_changed': (
+        ('players', 'players'), ('spectators', None), ('phase', 'phase'), ('change', None),
+    ),
+}
+EVENT_CODES = {event: code for code, event in enumerate(EVENT_FIELDS)}
+
+
+def negotiate(requested):
+    """Return the protocol to use for a client's requested one."""
+    if requested == PROTOCOL_BINARY and msgpack is None:
+        return PROTOCOL_COMPACT
+    if requested in (PROTOCOL_JSON, PROTOCOL_COMPACT, PROTOCOL_BINARY):
+        return requested
+    return PROTOCOL_JSON
+
+
+def room_for(game_id, protocol):
+    """Socket.IO room a game's viewers on a protocol listen to."""
+    if protocol == PROTOCOL_JSON:
+        return game_id
+    return f"{game_id}~{protocol}"
+
+
+class SharedPayload(dict):
+    """
+    Event data sent unchanged to many connections, such as the spectator
+    view of one game version. A frame carrying only this payload is encoded
+    once per protocol and then reused, so build a new one when the data
+    changes instead of editing it.
+    """
+
+    __slots__ = ('frames',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frames = {}  # (event, protocol) -> encoded frame
+
+    def __reduce__(self):
+        # Other workers get the plain data, not this worker's encodings
+        return dict, (dict(self),)
+
+
+def encode(events, protocol):
+    """
+    Encode [[event, data], ...] as the payload of one compact wire frame.
+
+    Returns:
+        List of messages (protocol '2') or MessagePack bytes (protocol '2b')
+    """
+    if len(events) == 1 and isinstance(events[0][1], SharedPayload):
+        event, data = events[0]
+        frame = data.frames.get((event, protocol))
+        if frame is None:
+            frame = data.frames[(event, protocol)] = _encode(events, protocol)
+        return frame
+    return _encode(events, protocol)
+
+
+def _encode(events, protocol):
+    messages = [encode_message(event, data) for event, data in events]
+    if protocol == PROTOCOL_BINARY:
+        return msgpack.packb(messages)
+    return messages
+
+
+def encode_message(event, data):
+    """Encode one event as [code, *fields], or [event, data] if it has no schema."""
+    fields = EVENT_FIELDS.get(event)
+    if fields is None:
+        return [event, data]
+    return [EVENT_CODES[event]] + _pack(data, fields)
+
+
+def _pack(data, fields):
+    values = [_encode_value(data.get(key), codec) for key, codec in fields]
+    # Optional trailing fields cost nothing when absent
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def _tile(value):
+    if isinstance(value, dict):
+        value = value['id']
+    if isinstance(value, str):
+        return Domino.from_id(value).code
+    return value.code
+
+
+def _encode_value(value, codec):
+    if value is None or codec is None:
+        return value
+    if codec == 'pos':
+        return POSITIONS.index(value)
+    if codec == 'phase':
+        return PHASES.index(value)
+    if codec == 'tile':
+        return _tile(value)
+    if codec == 'tiles':
+        return [_tile(d) for d in value]
+    if codec == 'trick':
+        flat = []
+        for pos, domino in value:
+            flat.append(POSITIONS.index(pos))
+            flat.append(_tile(domino))
+        return flat
+    if codec == 'trick_result':
+        return _pack(value, TRICK_FIELDS)
+    if codec == 'tricks':
+        return [_pack(trick, TRICK_FIELDS) for trick in value]
+    if codec == 'players':
+        player_list = [value.get(pos) for pos in POSITIONS]
+        return [_pack(p, PLAYER_FIELDS) if p else None for p in player_list]
+    raise ValueError(f"Unknown codec {codec}")
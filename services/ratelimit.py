@@ -0,0 +1,111 @@
+"""Token-bucket limits on socket events, per connection and event class."""
+
+import time
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `burst`; each event takes one."""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated', 'warned')
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+        self.warned = False  # Client already told about the current overflow
+
+    def take(self, now):
+        """Take a token if one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.warned = False
+            return True
+        return False
+
+    def wait(self, now):
+        """Seconds from `now` until a token is available."""
+        tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        return max(0.0, (1 - tokens) / self.rate)
+
+
+class RateLimiter:
+    """
+    Per-connection token buckets, one per event class.
+
+    Events map to classes (e.g. 'play', 'chat'); each class has its own
+    (rate, burst). Buckets are created on first use and refilled lazily
+    when an event arrives, so checking costs a dict lookup and a little
+    arithmetic. Events with no class are never limited.
+    """
+
+    def __init__(self, limits, classes, clock=time.monotonic):
+        """
+        Args:
+            limits: {class: (events per second, burst)}
+            classes: {event name: class}
+            clock: Monotonic time source
+        """
+        self.limits = dict(limits)
+        self.classes = dict(classes)
+        self.clock = clock
+        self._buckets = {}  # sid -> {class: TokenBucket}
+        self.allowed = {cls: 0 for cls in self.limits}
+        self.dropped = {cls: 0 for cls in self.limits}
+
+    def check(self, sid, event):
+        """
+        Count an event against the connection's bucket.
+
+        Returns:
+            'allow', 'drop', or 'warn' (dropped, and the first drop since
+            the last allowed event, so the player should be warned once)
+        """
+        cls = self.classes.get(event)
+        if cls is None:
+            return 'allow'
+
+        now = self.clock()
+        buckets = self._buckets.setdefault(sid, {})
+        bucket = buckets.get(cls)
+        if bucket is None:
+            rate, burst = self.limits[cls]
+            bucket = buckets[cls] = TokenBucket(rate, burst, now)
+
+        if bucket.take(now):
+            self.allowed[cls] += 1
+            return 'allow'
+
+        self.dropped[cls] += 1
+        if bucket.warned:
+            return 'drop'
+        bucket.warned = True
+        return 'warn'
+
+    def retry_after(self, sid, event):
+        """Seconds until the connection may send an event of this class again (0 if now)."""
+        cls = self.classes.get(event)
+        bucket = self._buckets.get(sid, {}).get(cls)
+        if bucket is None:
+            return 0.0
+        return bucket.wait(self.clock())
+
+    def forget(self, sid):
+        """Drop a closed connection's buckets."""
+        self._buckets.pop(sid, None)
+
+    def stats(self):
+        """Allowed and dropped event counts per class."""
+        return {cls: {'allowed': self.allowed[cls], 'dropped': self.dropped[cls]}
+                for cls in self.limits}
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+def parse_limit(value):
+    """Parse 'rate:burst' (e.g. '5:10') into (float rate, int burst)."""
+    rate, _, burst = value.partition(':')
+    return float(rate), int(burst or max(1, float(rate)))
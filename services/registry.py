@@ -0,0 +1,103 @@
+"""Registry of which connection is watching which game, and from which seat."""
+
+
+class SessionRegistry:
+    """
+    Maps each connected sid to its game and seat.
+
+    A seat is a position ('north', ...) for players or None for spectators.
+    Seated connections are indexed per game so the server can send every
+    player its own projection without broadcasting hidden hands; spectators
+    all share one view, so they are only counted and get it through a
+    single group emit. The wire protocol each connection negotiated is
+    kept alongside, with a count per game of the connections on each
+    protocol, so a broadcast is only encoded for protocols someone uses.
+    """
+
+    DEFAULT_PROTOCOL = '1'
+
+    def __init__(self):
+        self._sessions = {}    # sid -> (game_id, seat)
+        self._seated = {}      # game_id -> {sid: seat} for players
+        self._spectators = {}  # game_id -> set of spectator sids
+        self._protocols = {}   # sid -> wire protocol, when not the default
+        self._audience = {}    # game_id -> {(protocol, is spectator): connections}
+
+    def bind(self, sid, game_id, seat=None, protocol=DEFAULT_PROTOCOL):
+        """Attach a connection to a game as a player seat or spectator."""
+        self.unbind(sid)
+        self._sessions[sid] = (game_id, seat)
+        if seat is None:
+            self._spectators.setdefault(game_id, set()).add(sid)
+        else:
+            self._seated.setdefault(game_id, {})[sid] = seat
+        if protocol != self.DEFAULT_PROTOCOL:
+            self._protocols[sid] = protocol
+        audience = self._audience.setdefault(game_id, {})
+        key = (protocol, seat is None)
+        audience[key] = audience.get(key, 0) + 1
+
+    def unbind(self, sid):
+        """
+        Detach a connection from its game.
+
+        Returns:
+            (game_id, seat) it was bound to, or None
+        """
+        binding = self._sessions.pop(sid, None)
+        protocol = self._protocols.pop(sid, self.DEFAULT_PROTOCOL)
+        if binding:
+            game_id, seat = binding
+            audience = self._audience[game_id]
+            key = (protocol, seat is None)
+            audience[key] -= 1
+            if not audience[key]:
+                del audience[key]
+                if not audience:
+                    del self._audience[game_id]
+            group = self._spectators if seat is None else self._seated
+            members = group.get(game_id)
+            if members is not None:
+                if seat is None:
+                    members.discard(sid)
+                else:
+                    members.pop(sid, None)
+                if not members:
+                    del group[game_id]
+        return binding
+
+    def get(self, sid):
+        """Return (game_id, seat) for a connection, or None."""
+        return self._sessions.get(sid)
+
+    def protocol(self, sid):
+        """Wire protocol of a bound connection (the default if unbound)."""
+        return self._protocols.get(sid, self.DEFAULT_PROTOCOL)
+
+    def protocols(self, game_id, spectators=False):
+        """Wire protocols of a game's connections (only its spectators' if asked)."""
+        return {protocol for protocol, spectator in self._audience.get(game_id, ())
+                if spectator or not spectators}
+
+    def seated(self, game_id):
+        """Return {sid: seat} for every player connection to a game."""
+        return self._seated.get(game_id, {})
+
+    def spectator_count(self, game_id):
+        """Number of spectator connections to a game."""
+        return len(self._spectators.get(game_id, ()))
+
+    def spectator_total(self):
+        """Number of spectator connections across all games."""
+        return sum(len(sids) for sids in self._spectators.values())
+
+    def drop_game(self, game_id):
+        """Forget every connection bound to a game."""
+        sids = list(self._seated.pop(game_id, {})) + list(self._spectators.pop(game_id, ()))
+        self._audience.pop(game_id, None)
+        for sid in sids:
+            self._sessions.pop(sid, None)
+            self._protocols.pop(sid, None)
+
+    def __len__(self):
+        return len(self._sessions)
@@ -0,0 +1,211 @@
+"""Timer wheel and the task schedulers built on it."""
+
+import time
+
+
+class Timer:
+    """A pending callback armed on a TimerWheel."""
+
+    __slots__ = ('deadline', 'callback', 'args', 'slot', 'cancelled')
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline  # Absolute tick number
+        self.callback = callback
+        self.args = args
+        self.slot = None
+        self.cancelled = False
+
+    def fire(self):
+        """Run the callback."""
+        return self.callback(*self.args)
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel with O(1) arm and cancel.
+
+    Time is divided into ticks of `tick` seconds. Level 0 has one slot per
+    tick; each slot of level n covers a whole revolution of level n - 1.
+    A timer is armed on the lowest level whose range reaches its deadline
+    and moves down a level each time the wheel below comes round to its
+    slot, so it is handled at most `levels` times before it fires however
+    many timers are pending. The defaults (64 slots, 4 levels, 50 ms)
+    reach about nine days; later deadlines wait on the top level.
+    """
+
+    def __init__(self, tick=0.05, slots=64, levels=4, clock=time.monotonic):
+        self.tick = tick
+        self.clock = clock
+        self._size = slots
+        self._levels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._spans = [slots ** level for level in range(levels)]  # Ticks per slot
+        self._origin = clock()
+        self._current = 0  # Last tick that has been processed
+        self._count = 0
+
+    def _tick_at(self, when):
+        return int((when - self._origin) / self.tick)
+
+    def _place(self, timer, now):
+        """Put a timer in its slot, relative to tick `now`."""
+        n = self._size
+        delta = timer.deadline - now
+        level = 0
+        while level < len(self._spans) - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        span = self._spans[level]
+        # Beyond the top level's range: wait in its furthest slot and go round again
+        deadline = min(timer.deadline, now + span * n - 1)
+        timer.slot = self._levels[level][(deadline // span) % n]
+        timer.slot.add(timer)
+
+    def schedule(self, delay, callback, *args):
+        """
+        Arm a timer to run callback(*args) after `delay` seconds.
+
+        Returns:
+            Timer handle that can be passed to cancel()
+        """
+        if not self._count:
+            # Idle: skip the ticks nobody waited for
+            self._current = max(self._current, self._tick_at(self.clock()))
+        deadline = max(self._tick_at(self.clock() + delay), self._current + 1)
+        timer = Timer(deadline, callback, args)
+        self._place(timer, self._current)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer):
+        """Disarm a timer; a no-op if it already fired or was cancelled."""
+        if timer.slot is not None:
+            timer.slot.discard(timer)
+            timer.slot = None
+            self._count -= 1
+        timer.cancelled = True
+
+    def advance(self, now=None):
+        """
+        Move the wheel forward to `now` and collect expired timers.
+
+        Returns:
+            List of expired Timer objects, in deadline order
+        """
+        target = self._tick_at(self.clock() if now is None else now)
+        expired = []
+        n = self._size
+        tick = self._current + 1
+        while tick <= target and self._count:
+            # Bring down the higher slots that start at this tick, top first
+            for level in range(len(self._levels) - 1, 0, -1):
+                span = self._spans[level]
+                if tick % span == 0:
+                    wheel, index = self._levels[level], (tick // span) % n
+                    cascading, wheel[index] = wheel[index], set()
+                    for timer in cascading:
+                        self._place(timer, tick)
+
+            slot = self._levels[0][tick % n]
+            if slot:
+                for timer in slot:
+                    timer.slot = None
+                self._count -= len(slot)
+                expired.extend(slot)
+                self._levels[0][tick % n] = set()
+            tick += 1
+        self._current = max(self._current, target)
+        return expired
+
+    def __len__(self):
+        return self._count
+
+
+class TaskScheduler:
+    """
+    Keyed one-shot tasks on a timer wheel.
+
+    At most one task is pending per key; scheduling a key again re-arms
+    it. A single green thread advances the wheel while anything is
+    pending and runs due tasks, so nothing parks a green thread per task.
+    """
+
+    def __init__(self, spawn, sleep, wheel=None):
+        """
+        Args:
+            spawn: Callable(fn) that starts a green thread
+            sleep: Cooperative sleep function (e.g. socketio.sleep)
+            wheel: TimerWheel to use (a new one if omitted)
+        """
+        self._spawn = spawn
+        self._sleep = sleep
+        self.wheel = wheel or TimerWheel()
+        self._pending = {}  # key -> Timer
+        self._running = False
+
+    def schedule(self, key, delay, callback, *args):
+        """Arm (or re-arm) the task for a key to run callback(*args) after `delay` seconds."""
+        timer = self._pending.pop(key, None)
+        if timer:
+            self.wheel.cancel(timer)
+        self._pending[key] = self.wheel.schedule(delay, self._fire, key, callback, args)
+        self._ensure_running()
+
+    def cancel(self, key):
+        """Drop the pending task for a key, if any."""
+        timer = self._pending.pop(key, None)
+        if timer:
+            self.wheel.cancel(timer)
+
+    def is_pending(self, key):
+        """Check if a task is waiting for a key."""
+        return key in self._pending
+
+    def _fire(self, key, callback, args):
+        self._pending.pop(key, None)
+        callback(*args)
+
+    def _ensure_running(self):
+        if not self._running:
+            self._running = True
+            self._spawn(self._run)
+
+    def _run(self):
+        """Advance the wheel every tick until nothing is pending."""
+        try:
+            while len(self.wheel):
+                self._sleep(self.wheel.tick)
+                for timer in self.wheel.advance():
+                    try:
+                        timer.fire()
+                    except Exception as e:
+                        print(f"Error in scheduled task: {e}")
+        finally:
+            self._running = False
+
+    def __len__(self):
+        return len(self._pending)
+
+
+class BotScheduler(TaskScheduler):
+    """
+    Runs bot turns as timed tasks instead of sleeping in a handler.
+
+    At most one bot turn is pending per game. Due turns are handed to
+    `submit(game_id)`, which queues them on the game's actor, so bot
+    chains progress one move per timer without recursion or a parked
+    green thread per table.
+    """
+
+    def __init__(self, spawn, sleep, submit, wheel=None):
+        """
+        Args:
+            spawn: Callable(fn) that starts a green thread
+            sleep: Cooperative sleep function (e.g. socketio.sleep)
+            submit: Callable(game_id) that queues the bot turn command
+            wheel: TimerWheel to use (a new one if omitted)
+        """
+        super().__init__(spawn, sleep, wheel)
+        self._submit = submit
+
+    def schedule(self, game_id, delay):
+        """Arm (or re-arm) the next bot turn for a game."""
+        super().schedule(game_id, delay, self._submit, game_id)
@@ -0,0 +1,91 @@
+"""Index of where each user sits across the games in memory."""
+
+
+class SeatIndex:
+    """
+    Maps each user to the games they belong to and their place in each.
+
+    A place is a position ('north', ...) for a seated player or None for a
+    spectator. Games report every seat or spectator change through their
+    on_seat_change hook, so the index never needs a scan to answer "where
+    is this user?". Bots are left out. Each worker indexes only the games
+    it has loaded, so with several workers a game owned by another worker
+    is not found here. Entries outlive a game's hibernation so a returning
+    player can still find it, and go when the game is discarded or handed
+    off.
+    """
+
+    def __init__(self):
+        self._users = {}  # user_id -> {game_id: position or None}, oldest first
+        self._games = {}  # game_id -> set of indexed user_ids
+
+    def add_game(self, game):
+        """
+        Index every member of a game and follow its seat changes.
+
+        Entries left from an earlier copy of the game are replaced, so a
+        game reloaded from storage is indexed as it was saved.
+        """
+        self.drop_game(game.game_id)
+        game.on_seat_change = self.update
+        for user_id in list(game.seats) + list(game.spectators):
+            self.update(game, user_id)
+
+    def update(self, game, user_id):
+        """Re-read one user's place in a game after it changed."""
+        position = game.position_of(user_id)
+        if position is not None and game.players[position].is_ai:
+            return
+
+        if position is None and not game.is_spectator(user_id):
+            self._remove(user_id, game.game_id)
+            return
+
+        places = self._users.setdefault(user_id, {})
+        places.pop(game.game_id, None)  # Most recent change last
+        places[game.game_id] = position
+        self._games.setdefault(game.game_id, set()).add(user_id)
+
+    def _remove(self, user_id, game_id):
+        places = self._users.get(user_id)
+        if places is not None:
+            places.pop(game_id, None)
+            if not places:
+                del self._users[user_id]
+        members = self._games.get(game_id)
+        if members is not None:
+            members.discard(user_id)
+            if not members:
+                del self._games[game_id]
+
+    def active_game(self, user_id):
+        """
+        The game a user should rejoin: their latest seat, else their latest
+        spectator slot.
+
+        Returns:
+            (game_id, position or None), or None if they are in no game
+        """
+        places = self._users.get(user_id)
+        if not places:
+            return None
+        spectating = None
+        for game_id, position in reversed(places.items()):
+            if position is not None:
+                return game_id, position
+            spectating = spectating or (game_id, None)
+        return spectating
+
+    def drop_game(self, game_id, game=None):
+        """Forget a game's members (and stop following it)."""
+        if game is not None:
+            game.on_seat_change = None
+        for user_id in self._games.pop(game_id, ()):
+            places = self._users.get(user_id)
+            if places is not None:
+                places.pop(game_id, None)
+                if not places:
+                    del self._users[user_id]
+
+    def __len__(self):
+        return len(self._users)
@@ -13,6 +13,11 @@
     let isSpectator = false;
     let gameState = {};
     let currentUser = null;
+    let lastTrick = null;       // Finished trick kept on the table briefly
+    let lastTrickTimer = null;
+    let applyingBatch = false;  // Defer re-renders while a batch is applied
+    let uiDirty = false;
+    const awaySeats = new Set();  // Seats whose player lost their connection
 
     // DOM Elements - will be initialized after DOM ready
     let elements = {};
@@ -67,8 +72,9 @@
         }
         gameId = container.dataset.gameId;
 
-        // Connect to WebSocket
-        socket = io();
+        // Connect to WebSocket (no long-polling, so any worker can take the connection)
+        // and ask for the compact wire protocol
+        socket = io({ transports: ['websocket'], query: { proto: Wire.PROTOCOL } });
 
         // Set up socket handlers
         setupSocketHandlers();
@@ -101,6 +107,12 @@
             console.log('Connected to server');
         });
 
+        // Several events coalesced by the server, applied in order with one re-render
+        socket.on('batch', applyEvents);
+
+        // Compact protocol frames decode to the same events
+        socket.on(Wire.EVENT, (frame) => applyEvents(Wire.decode(frame)));
+
         socket.on('connected', (data) => {
             console.log('User connected:', data.user);
         });
@@ -113,31 +125,59 @@
             updateUI();
         });
 
-        socket.on('player_joined', (data) => {
-            showToast(`${data.username} joined as ${positionNames[data.position]}`);
-            // Refresh game state
-            socket.emit('join_game', { game_id: gameId });
-        });
+        socket.on('seats_changed', (data) => {
+            // Merge the roster, keeping any hand we already hold
+            const players = {};
+            for (const [pos, player] of Object.entries(data.players)) {
+                const known = gameState.players?.[pos];
+                players[pos] = (known && known.user_id === player.user_id && known.hand)
+                    ? { ...player, hand: known.hand }
+                    : player;
+            }
+            gameState.players = players;
+            gameState.spectators = data.spectators;
+            gameState.phase = data.phase;
+            updateUI();
 
-        socket.on('player_left', (data) => {
-            showToast(`${data.username} left the game`);
-            socket.emit('join_game', { game_id: gameId });
+            const change = data.change;
+            if (change.type === 'joined') {
+                showToast(`${change.username} joined as ${positionNames[change.position]}`);
+            } else if (change.type === 'left') {
+                awaySeats.delete(change.position);
+                showToast(`${change.username} left the game`);
+            } else if (change.type === 'spectating') {
+                showToast(`${change.username} is now spectating`);
+            } else if (change.type === 'bots_added') {
+                showToast(`Added ${change.count} bot(s)`);
+            }
         });
 
-        socket.on('bots_added', (data) => {
-            showToast(data.message);
-            // Refresh game state
-            socket.emit('join_game', { game_id: gameId });
+        socket.on('presence', (data) => {
+            if (data.connected) {
+                awaySeats.delete(data.position);
+                showToast(`${data.username} is back`);
+            } else {
+                awaySeats.add(data.position);
+                showToast(`${data.username} lost connection`, 'error');
+            }
+            updateUI();
         });
 
-        socket.on('spectator_joined', (data) => {
-            showToast(`${data.username} is now spectating`);
+        socket.on('turn_timeout', (data) => {
+            // The bot's move for the seat follows as a normal update
+            if (data.position === myPosition) {
+                showToast('Out of time - a bot played your turn', 'error');
+            } else {
+                const playerName = gameState.players?.[data.position]?.username || data.position;
+                showToast(`${playerName} ran out of time`);
+            }
         });
 
-        socket.on('game_started', (state) => {
-            console.log('Game started:', state);
-            gameState = state;
-            myPosition = state.my_position;
+        socket.on('game_started', (data) => {
+            // Each viewer's own game_state (with their hand) follows
+            console.log('Game started:', data);
+            gameState.phase = data.phase;
+            gameState.current_turn = data.current_turn;
             showToast('Game started! Time to bid.');
             updateUI();
         });
@@ -147,7 +187,7 @@
             gameState.high_bid = data.high_bid;
             gameState.high_bidder = data.high_bidder;
             gameState.phase = data.phase;
-            gameState.current_turn = data.current_bidder;
+            gameState.current_turn = data.current_turn;
 
             const playerName = gameState.players?.[data.position]?.username || data.position;
             if (data.bid > 0) {
@@ -184,9 +224,16 @@
             gameState.current_trick = data.current_trick;
             gameState.lead_suit = data.lead_suit;
             gameState.phase = data.phase;
+            gameState.current_turn = data.current_turn;
 
-            // Show the played domino
-            renderPlayedDomino(data.position, data.domino_id);
+            // Take the domino out of the player's hand (hands we can see)
+            const player = gameState.players?.[data.position];
+            if (player) {
+                if (player.hand) {
+                    player.hand = player.hand.filter(d => d.id !== data.domino_id);
+                }
+                player.hand_count = Math.max((player.hand_count || 1) - 1, 0);
+            }
 
             if (data.trick_result) {
                 // Trick is complete
@@ -195,26 +242,36 @@
                 gameState.team1_hand_points = data.team1_hand_points;
                 gameState.team2_hand_points = data.team2_hand_points;
 
+                // Keep the finished trick on the table for a moment
+                showLastTrick(data.trick_result.plays);
+
                 const winner = gameState.players[data.trick_result.winner];
                 showToast(`${winner?.username} wins the trick! (${data.trick_result.points} pts)`);
 
-                // Clear trick after delay
-                setTimeout(() => {
-                    clearPlayedDominoes();
-                    socket.emit('join_game', { game_id: gameId });
-                }, 1500);
-
                 if (data.game_over) {
                     gameState.team1_marks = data.team1_marks;
                     gameState.team2_marks = data.team2_marks;
                     showGameOver(data.winner);
                 }
-            } else {
-                // Refresh state to get next player's turn
-                socket.emit('join_game', { game_id: gameId });
             }
 
+            updateUI();
+        });
+
+        socket.on('hand_summary', (data) => {
+            // Fast-forwarded bot table: one summary per hand
+            console.log('Hand summary:', data);
+            gameState.team1_marks = data.team1_marks;
+            gameState.team2_marks = data.team2_marks;
+            gameState.phase = data.phase;
             updateScores();
+
+            const bidder = gameState.players?.[data.bidder]?.username || data.bidder;
+            showToast(`${bidder} bid ${data.bid} on ${suitNames[data.trump]}. ${data.hand_result}`);
+
+            if (data.game_over) {
+                showGameOver(data.game_winner);
+            }
         });
 
         socket.on('hand_update', (data) => {
@@ -233,18 +290,42 @@
             showToast(data.message, 'error');
         });
 
+        // A move sent too fast was dropped; once it may be sent again, redraw
+        // the table from the server's state so the player can make it
+        socket.on('rate_limited', (data) => {
+            if (['place_bid', 'select_trump', 'play_domino'].includes(data.event)) {
+                setTimeout(() => socket.emit('resync', { game_id: gameId }),
+                           data.retry_after * 1000);
+            }
+        });
+
         socket.on('disconnect', () => {
             console.log('Disconnected from server');
             showToast('Connection lost. Reconnecting...', 'error');
         });
 
-        socket.on('reconnect', () => {
+        // Reconnects fire on the manager, not the socket
+        socket.io.on('reconnect', () => {
             console.log('Reconnected');
             showToast('Reconnected!', 'success');
-            socket.emit('join_game', { game_id: gameId });
+            socket.emit('resync', { game_id: gameId });
         });
     }
 
+    function applyEvents(events) {
+        applyingBatch = true;
+        try {
+            events.forEach(([event, data]) => {
+                socket.listeners(event).forEach(handler => handler(data));
+            });
+        } finally {
+            applyingBatch = false;
+        }
+        if (uiDirty) {
+            updateUI();
+        }
+    }
+
     // UI Handlers
     function setupUIHandlers() {
         // Bid buttons - use event delegation
@@ -331,6 +412,11 @@
 
     // Update UI
     function updateUI() {
+        if (applyingBatch) {
+            uiDirty = true;
+            return;
+        }
+        uiDirty = false;
         updatePhaseDisplay();
         updateScores();
         updatePlayers();
@@ -409,7 +495,7 @@
             const player = gameState.players?.[pos];
 
             if (player) {
-                if (nameEl) nameEl.textContent = player.username;
+                if (nameEl) nameEl.textContent = player.username + (awaySeats.has(pos) ? ' (away)' : '');
 
                 // Show hand for other players (face down)
                 if (handEl && pos !== myPosition && !isSpectator) {
@@ -722,9 +808,11 @@
     function renderCurrentTrick() {
         clearPlayedDominoes();
 
-        if (!gameState.current_trick) return;
+        // Until the next lead, show the trick that just finished
+        const trick = gameState.current_trick?.length ? gameState.current_trick : lastTrick;
+        if (!trick) return;
 
-        gameState.current_trick.forEach(([pos, domino]) => {
+        trick.forEach(([pos, domino]) => {
             renderPlayedDomino(pos, domino.id, domino);
         });
     }
@@ -749,6 +837,15 @@
         return counts[`${high}-${low}`] || 0;
     }
 
+    function showLastTrick(plays) {
+        lastTrick = plays;
+        clearTimeout(lastTrickTimer);
+        lastTrickTimer = setTimeout(() => {
+            lastTrick = null;
+            renderCurrentTrick();
+        }, 1500);
+    }
+
     function clearPlayedDominoes() {
         ['north', 'south', 'east', 'west'].forEach(pos => {
             const container = document.getElementById(`played-${pos}`);
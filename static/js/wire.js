@@ -0,0 +1,202 @@
+/**
+ * GAME 42 - Compact Wire Protocol
+ * Decodes protocol '2' frames (and '2b', the same packed with MessagePack)
+ * back into the event payloads game.js already understands.
+ * Field lists mirror services/protocol.py.
+ */
+
+const Wire = (function() {
+    'use strict';
+
+    // Ask for binary frames; the server falls back to '2' without MessagePack
+    const PROTOCOL = '2b';
+    const EVENT = 'm';
+
+    const POSITIONS = ['north', 'east', 'south', 'west'];
+    const PHASES = ['waiting', 'dealing', 'bidding', 'trump_selection', 'playing', 'scoring', 'finished'];
+    const COUNTS = { '5-0': 5, '4-1': 5, '3-2': 5, '6-4': 10, '5-5': 10 };
+
+    const PLAYER_FIELDS = [
+        ['user_id'], ['username'], ['is_ai'], ['hand_count'],
+        ['current_bid'], ['has_passed'], ['hand', 'tiles']
+    ];
+    const TRICK_FIELDS = [
+        ['trick_number'], ['plays', 'trick'], ['winner', 'pos'], ['points'],
+        ['lead_suit'], ['trump_suit'], ['hand_result'], ['new_hand'],
+        ['game_winner']
+    ];
+    // Indexed by event code
+    const EVENTS = [
+        ['game_state', [
+            ['game_id'], ['phase', 'phase'], ['my_position', 'pos'], ['dealer', 'pos'],
+            ['current_turn', 'pos'], ['high_bid'], ['high_bidder', 'pos'], ['trump_suit'],
+            ['trick_number'], ['current_trick', 'trick'], ['lead_suit'],
+            ['team1_marks'], ['team2_marks'], ['team1_tricks'], ['team2_tricks'],
+            ['team1_hand_points'], ['team2_hand_points'], ['players', 'players'],
+            ['trick_history', 'tricks'], ['is_spectator']
+        ]],
+        ['bid_update', [
+            ['position', 'pos'], ['bid'], ['high_bid'], ['high_bidder', 'pos'],
+            ['current_bidder', 'pos'], ['current_turn', 'pos'], ['phase', 'phase']
+        ]],
+        ['trump_selected', [
+            ['trump_suit'], ['current_leader', 'pos'], ['phase', 'phase']
+        ]],
+        ['domino_played', [
+            ['position', 'pos'], ['domino_id', 'tile'], ['current_trick', 'trick'], ['lead_suit'],
+            ['current_turn', 'pos'], ['phase', 'phase'], ['trick_result', 'trick_result'],
+            ['team1_tricks'], ['team2_tricks'], ['team1_hand_points'],
+            ['team2_hand_points'], ['team1_marks'], ['team2_marks'],
+            ['game_over'], ['winner']
+        ]],
+        ['hand_update', [
+            ['hand', 'tiles']
+        ]],
+        ['seats_changed', [
+            ['players', 'players'], ['spectators'], ['phase', 'phase'], ['change']
+        ]]
+    ];
+
+    // Tile code -> domino dict, in the order of Domino.code
+    const TILES = [];
+    for (let high = 0; high < 7; high++) {
+        for (let low = 0; low <= high; low++) {
+            const id = `${high}-${low}`;
+            TILES.push({
+                id, high, low,
+                is_double: high === low,
+                count_value: COUNTS[id] || 0,
+                pip_total: high + low
+            });
+        }
+    }
+
+    function tile(code) {
+        return { ...TILES[code] };
+    }
+
+    function unpack(values, fields) {
+        const data = {};
+        fields.forEach(([key, codec], i) => {
+            const value = values[i];
+            data[key] = (value === undefined || value === null) ? null : decodeValue(value, codec);
+        });
+        return data;
+    }
+
+    function decodeValue(value, codec) {
+        switch (codec) {
+            case 'pos': return POSITIONS[value];
+            case 'phase': return PHASES[value];
+            case 'tile': return TILES[value].id;
+            case 'tiles': return value.map(tile);
+            case 'trick': {
+                const plays = [];
+                for (let i = 0; i < value.length; i += 2) {
+                    plays.push([POSITIONS[value[i]], tile(value[i + 1])]);
+                }
+                return plays;
+            }
+            case 'trick_result': return unpack(value, TRICK_FIELDS);
+            case 'tricks': return value.map(t => unpack(t, TRICK_FIELDS));
+            case 'players': {
+                const players = {};
+                value.forEach((p, i) => {
+                    if (!p) return;
+                    const player = unpack(p, PLAYER_FIELDS);
+                    player.position = POSITIONS[i];
+                    player.team = (i % 2 === 0) ? 1 : 2;
+                    if (player.hand === null) delete player.hand;
+                    players[POSITIONS[i]] = player;
+                });
+                return players;
+            }
+            default: return value;
+        }
+    }
+
+    /**
+     * Decode one 'm' frame into [[event, data], ...].
+     */
+    function decode(frame) {
+        const messages = (frame instanceof ArrayBuffer) ? unpackMsgpack(frame) : frame;
+        return messages.map(message => {
+            if (typeof message[0] === 'string') {
+                return message;  // Event without a compact form
+            }
+            const [event, fields] = EVENTS[message[0]];
+            return [event, unpack(message.slice(1), fields)];
+        });
+    }
+
+    // Minimal MessagePack decoder (everything msgpack.packb produces for our frames)
+    function unpackMsgpack(buffer) {
+        const view = new DataView(buffer);
+        const bytes = new Uint8Array(buffer);
+        const text = new TextDecoder();
+        let pos = 0;
+
+        function str(len) {
+            const s = text.decode(bytes.subarray(pos, pos + len));
+            pos += len;
+            return s;
+        }
+        function array(len) {
+            const out = new Array(len);
+            for (let i = 0; i < len; i++) out[i] = read();
+            return out;
+        }
+        function map(len) {
+            const out = {};
+            for (let i = 0; i < len; i++) {
+                const key = read();
+                out[key] = read();
+            }
+            return out;
+        }
+        function bin(len) {
+            const out = bytes.slice(pos, pos + len);
+            pos += len;
+            return out;
+        }
+        function read() {
+            const b = bytes[pos++];
+            if (b <= 0x7f) return b;
+            if (b >= 0xe0) return b - 0x100;
+            if (b >= 0xa0 && b <= 0xbf) return str(b & 0x1f);
+            if (b >= 0x90 && b <= 0x9f) return array(b & 0x0f);
+            if (b >= 0x80 && b <= 0x8f) return map(b & 0x0f);
+            let v;
+            switch (b) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: v = view.getUint8(pos); pos += 1; return bin(v);
+                case 0xc5: v = view.getUint16(pos); pos += 2; return bin(v);
+                case 0xc6: v = view.getUint32(pos); pos += 4; return bin(v);
+                case 0xca: v = view.getFloat32(pos); pos += 4; return v;
+                case 0xcb: v = view.getFloat64(pos); pos += 8; return v;
+                case 0xcc: v = view.getUint8(pos); pos += 1; return v;
+                case 0xcd: v = view.getUint16(pos); pos += 2; return v;
+                case 0xce: v = view.getUint32(pos); pos += 4; return v;
+                case 0xcf: v = Number(view.getBigUint64(pos)); pos += 8; return v;
+                case 0xd0: v = view.getInt8(pos); pos += 1; return v;
+                case 0xd1: v = view.getInt16(pos); pos += 2; return v;
+                case 0xd2: v = view.getInt32(pos); pos += 4; return v;
+                case 0xd3: v = Number(view.getBigInt64(pos)); pos += 8; return v;
+                case 0xd9: v = view.getUint8(pos); pos += 1; return str(v);
+                case 0xda: v = view.getUint16(pos); pos += 2; return str(v);
+                case 0xdb: v = view.getUint32(pos); pos += 4; return str(v);
+                case 0xdc: v = view.getUint16(pos); pos += 2; return array(v);
+                case 0xdd: v = view.getUint32(pos); pos += 4; return array(v);
+                case 0xde: v = view.getUint16(pos); pos += 2; return map(v);
+                case 0xdf: v = view.getUint32(pos); pos += 4; return map(v);
+                default: throw new Error(`Unsupported MessagePack byte 0x${b.toString(16)}`);
+            }
+        }
+
+        return read();
+    }
+
+    return { PROTOCOL, EVENT, decode };
+})();
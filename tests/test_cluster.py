@@ -0,0 +1,157 @@
+"""
+Multi-worker tests over the Redis stand-in.
+
+Two workers started by run_workers.py share the stand-in as their message
+queue; players connected to different workers sit at the same table.
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from redis_standin import RedisStandin, wait_for_port
+from services.actors import Command
+from services.cluster import Cluster, RedisBroker
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def port_free(port):
+    with socket.socket() as s:
+        return s.connect_ex(('127.0.0.1', port)) != 0
+
+
+def wait_until(check, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def broker():
+    with RedisStandin() as standin:
+        yield standin
+
+
+def test_command_forwarded_to_owner(broker):
+    """A command for another worker's game is delivered on that worker's channel."""
+    received = {0: [], 1: []}
+    clusters = []
+    for worker in (0, 1):
+        cluster = Cluster(worker, 2, RedisBroker(broker.url))
+        cluster.start(lambda f, *a: threading.Thread(target=f, args=a, daemon=True).start(),
+                      time.sleep, received[worker].append)
+        clusters.append(cluster)
+
+    game_id = next(f"g{n}" for n in range(100) if clusters[0].owner_of(f"g{n}") == 1)
+    time.sleep(0.2)  # Let both listeners subscribe
+    clusters[0].forward(Command('chat_message', game_id, {'message': 'hi'}, None))
+
+    assert wait_until(lambda: received[1])
+    assert received[1][0].game_id == game_id and received[1][0].payload == {'message': 'hi'}
+    assert not received[0]
+    for cluster in clusters:
+        cluster.stop()
+
+
+def test_worker_count_needs_message_queue():
+    from config import load_config
+
+    with pytest.raises(ValueError, match='SOCKETIO_MESSAGE_QUEUE'):
+        load_config({'WORKER_COUNT': '2'})
+
+
+@pytest.fixture(params=['eventlet', 'asyncio'])
+def workers(request, broker):
+    """Two workers in each ASYNC_MODE; asyncio needs its ASGI server installed."""
+    pytest.importorskip('socketio')
+    pytest.importorskip('requests')
+    if request.param == 'asyncio':
+        pytest.importorskip('uvicorn')
+        pytest.importorskip('a2wsgi')
+    base_port = free_port()
+    while not all(port_free(base_port + i) for i in range(2)):
+        base_port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp}/cluster.db", BOT_THINK_DELAY='0',
+                   ASYNC_MODE=request.param)
+        launcher = subprocess.Popen(
+            [sys.executable, 'run_workers.py', '--workers', '2', '--base-port', str(base_port),
+             '--queue', broker.url],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        try:
+            assert all(wait_for_port(base_port + i) for i in range(2)), 'workers did not start'
+            yield [f"http://127.0.0.1:{base_port + i}" for i in range(2)]
+        finally:
+            os.killpg(launcher.pid, 2)
+            launcher.wait(timeout=30)
+
+
+def test_players_on_different_workers_share_a_table(workers):
+    """Room emits from the game's owner reach a player connected to the other worker."""
+    import requests
+    import socketio
+
+    players = []
+    for url in workers:
+        http = requests.Session()
+        http.post(f"{url}/api/guest").raise_for_status()
+        client = socketio.Client(http_session=http, reconnection=False)
+        events = []
+        client.on('*', lambda event, data=None, events=events: events.append((event, data)))
+        client.connect(url, transports=['websocket'])
+        players.append((http, client, events))
+
+    try:
+        host_http = players[0][0]
+        game_id = host_http.post(f"{workers[0]}/api/games", json={'name': 'cluster'}).json()['game_id']
+        for _, client, _ in players:
+            client.emit('join_game', {'game_id': game_id})
+        assert wait_until(lambda: all(
+            any(e == 'game_state' for e, _ in events) for _, _, events in players))
+
+        players[1][1].emit('chat_message', {'game_id': game_id, 'message': 'across workers'})
+
+        def chatted(events):
+            for event, data in events:
+                batch = data if event == 'batch' else [[event, data]]
+                if any(e == 'chat_message' and d.get('message') == 'across workers'
+                       for e, d in batch):
+                    return True
+            return False
+        assert wait_until(lambda: all(chatted(events) for _, _, events in players))
+    finally:
+        for _, client, _ in players:
+            client.disconnect()
+
+
+def test_deleted_user_leaves_every_workers_cache(workers):
+    """A guest logged out (and deleted) on one worker is no longer served by the other."""
+    import requests
+
+    http = requests.Session()
+    http.post(f"{workers[0]}/api/guest").raise_for_status()
+    cookies = http.cookies.copy()
+    assert requests.get(f"{workers[1]}/api/user", cookies=cookies).status_code == 200  # Cached there
+
+    http.post(f"{workers[0]}/api/logout").raise_for_status()
+    assert wait_until(lambda: requests.get(
+        f"{workers[1]}/api/user", cookies=cookies, allow_redirects=False).status_code != 200)
@@ -0,0 +1,85 @@
+"""GameCache LRU eviction, and hibernating evicted games to the database."""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.game_cache import GameCache
+from game_logic.game import Game
+
+
+def test_least_recently_used_game_is_evicted():
+    evicted = []
+    cache = GameCache(max_size=2, on_evict=evicted.append)
+    games = {game_id: Game(game_id) for game_id in ('a', 'b', 'c')}
+    cache['a'] = games['a']
+    cache['b'] = games['b']
+    assert cache.get('a') is games['a']  # Now b is the oldest
+    cache['c'] = games['c']
+
+    assert evicted == [games['b']]
+    assert 'b' not in cache and list(cache) == ['a', 'c']
+    assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 1, 'misses': 0, 'evictions': 1}
+
+
+def test_lookups_count_hits_and_misses():
+    cache = GameCache()
+    cache['a'] = Game('a')
+    cache.get('a')
+    assert cache.get('missing') is None
+    with pytest.raises(KeyError):
+        cache['missing']
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_pop_does_not_evict():
+    evicted = []
+    cache = GameCache(on_evict=evicted.append)
+    cache['a'] = Game('a')
+    assert cache.pop('a').game_id == 'a'
+    assert cache.pop('a') is None
+    assert evicted == []
+
+
+def test_failing_hibernation_still_evicts():
+    def fail(game):
+        raise RuntimeError('database gone')
+
+    cache = GameCache(max_size=1, on_evict=fail)
+    cache['a'] = Game('a')
+    cache['b'] = Game('b')
+    assert list(cache) == ['b']
+
+
+def test_hibernated_game_reloads_with_its_changes():
+    from config import create_app
+    from models import db
+    from models.game_session import GameSession
+    from models.game_store import load_game_snapshot, save_game_state
+
+    def hibernate(game):
+        if game.dirty:
+            save_game_state(game)
+
+    app = create_app(SQLALCHEMY_DATABASE_URI='sqlite://')
+    with app.app_context():
+        db.create_all()
+        cache = GameCache(max_size=1, on_evict=hibernate)
+        for game_id in ('a', 'b'):
+            db.session.add(GameSession(game_id=game_id, name=game_id, host_id=1))
+        db.session.commit()
+
+        game = Game('a')
+        game.add_player(1, 'alice', 'north')
+        game.dirty = True  # Changed since it was last saved
+        cache['a'] = game
+        cache['b'] = Game('b')  # Evicts a, which is saved on the way out
+
+        assert 'a' not in cache and not game.dirty
+        reloaded = load_game_snapshot('a')
+        assert reloaded.players['north'].username == 'alice'
+        assert reloaded.version == game.version == 1
@@ -0,0 +1,76 @@
+"""
+Finished games update their players' stats, which quick match bands by.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import create_app
+from models import db
+from models.user import User
+from models.game_session import GameSession
+from models.game_store import save_game_state
+from game_logic.game import Game
+from services.matchmaking import PROVISIONAL_GAMES, skill_bucket
+
+
+@pytest.fixture
+def app():
+    app = create_app(SQLALCHEMY_DATABASE_URI='sqlite://')
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+def add_user(name):
+    user = User(username=name)
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def finished_game(winner_id, loser_id):
+    """A saved game in which winner_id's team has just reached the winning marks."""
+    game_id = f'game-{GameSession.query.count()}'
+    db.session.add(GameSession(game_id=game_id, name='x', host_id=winner_id))
+    db.session.commit()
+    game = Game(game_id)
+    game.add_player(winner_id, 'winner', 'north')
+    game.add_player(loser_id, 'loser', 'east')
+    game.add_player(-1, 'Bot 1', 'south', is_ai=True)
+    game.add_player(-2, 'Bot 2', 'west', is_ai=True)
+    if game.players['north'].team == 1:
+        game.team1_marks = Game.WINNING_MARKS
+    else:
+        game.team2_marks = Game.WINNING_MARKS
+    game.phase = Game.PHASE_FINISHED
+    return game
+
+
+def test_finished_game_counted_once(app):
+    winner, loser = add_user('winner'), add_user('loser')
+    game = finished_game(winner, loser)
+    save_game_state(game)
+    save_game_state(game)  # Later saves of the finished game count nothing
+
+    won, lost = db.session.get(User, winner), db.session.get(User, loser)
+    assert (won.games_played, won.games_won, won.total_marks) == (1, 1, Game.WINNING_MARKS)
+    assert (lost.games_played, lost.games_won, lost.total_marks) == (1, 0, 0)
+
+
+def test_results_move_players_out_of_the_new_band(app):
+    winner, loser = add_user('winner'), add_user('loser')
+    assert skill_bucket(db.session.get(User, winner).to_dict()) == 'new'
+
+    for _ in range(PROVISIONAL_GAMES):
+        save_game_state(finished_game(winner, loser))
+
+    db.session.expire_all()
+    assert skill_bucket(db.session.get(User, winner).to_dict()) == 'high'
+    assert skill_bucket(db.session.get(User, loser).to_dict()) == 'low'
@@ -0,0 +1,117 @@
+"""Quick-match queue: tables of four, skill bands, teams and the bot-fill deadline."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.matchmaking import Matchmaker, PROVISIONAL_GAMES, skill_bucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def player(user_id):
+    return {'user_id': user_id, 'username': f'p{user_id}'}
+
+
+def seated(table):
+    return sorted(p['user_id'] for ticket in table for p in ticket.players)
+
+
+def test_four_players_make_a_table_first_come_first_served():
+    queue = Matchmaker()
+    for user_id in range(1, 6):
+        queue.enqueue(player(user_id))
+    assert seated(queue.match()) == [1, 2, 3, 4]
+    assert queue.match() is None
+    assert len(queue) == 1
+
+
+def test_players_only_meet_their_own_band():
+    queue = Matchmaker()
+    for user_id in range(3):
+        queue.enqueue(player(user_id), bucket='new')
+    queue.enqueue(player(9), bucket='high')
+    assert queue.match('new') is None
+    queue.enqueue(player(3), bucket='new')
+    assert seated(queue.match('new')) == [0, 1, 2, 3]
+    assert queue.waiting('high') == 1
+
+
+def test_team_code_seats_partners_together():
+    queue = Matchmaker()
+    assert queue.enqueue(player(1), team='abc') is None  # Waits for its partner
+    assert len(queue) == 1
+    queue.enqueue(player(2))
+    queue.enqueue(player(3))
+    assert queue.match() is None  # The partner has not arrived
+    team = queue.enqueue(player(4), team='abc')
+    assert team.size == 2
+    table = queue.match()
+    assert seated(table) == [1, 2, 3, 4]
+    assert any(ticket is team for ticket in table)
+
+
+def test_requeue_and_cancel():
+    queue = Matchmaker()
+    queue.enqueue(player(1))
+    queue.enqueue(player(1), bucket='mid')  # Replaces the first place
+    assert queue.waiting() == 0 and queue.waiting('mid') == 1
+    assert queue.cancel(1) == (player(1),)
+    assert queue.cancel(1) == ()
+    assert len(queue) == 0
+
+    queue.enqueue(player(2), team='t')
+    assert queue.find(2) == player(2)
+    assert queue.cancel(2) == (player(2),)
+    assert queue.find(2) is None
+
+
+def test_cancelled_tickets_are_skipped():
+    queue = Matchmaker()
+    for user_id in range(5):
+        queue.enqueue(player(user_id))
+    queue.cancel(1)
+    assert seated(queue.match()) == [0, 2, 3, 4]
+
+
+def test_overdue_players_get_a_table_with_bots():
+    clock = Clock()
+    queue = Matchmaker(clock=clock)
+    queue.enqueue(player(1))
+    clock.now = 10
+    queue.enqueue(player(2))
+    queue.enqueue(player(3), bucket='low')
+    assert queue.next_overdue(30) == 20
+    assert queue.overdue(30) == []
+
+    clock.now = 30
+    tables = queue.overdue(30)
+    assert [seated(table) for table in tables] == [[1, 2]]  # Same band, next arrival
+    assert queue.next_overdue(30) == 10
+    assert len(queue) == 1
+
+
+def test_clear_returns_everyone_queued():
+    queue = Matchmaker()
+    queue.enqueue(player(1))
+    queue.enqueue(player(2), team='t')
+    assert sorted(p['user_id'] for p in queue.clear()) == [1, 2]
+    assert len(queue) == 0 and queue.next_overdue(30) is None
+
+
+def test_skill_bucket_bands():
+    def stats(played, rate):
+        return {'games_played': played, 'win_rate': rate}
+
+    assert skill_bucket(stats(PROVISIONAL_GAMES - 1, 100)) == 'new'
+    assert skill_bucket(stats(PROVISIONAL_GAMES, 30)) == 'low'
+    assert skill_bucket(stats(PROVISIONAL_GAMES, 50)) == 'mid'
+    assert skill_bucket(stats(PROVISIONAL_GAMES, 60)) == 'high'
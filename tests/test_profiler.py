@@ -0,0 +1,85 @@
+"""Call profiling runs end on their count, their deadline or a cancel."""
+
+import os
+import sys
+import time
+import marshal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.profiler import Profiler
+
+
+class Timers:
+    """Records scheduled tasks; tests fire them by hand."""
+
+    def __init__(self):
+        self.pending = {}
+
+    def schedule(self, key, delay, callback, *args):
+        self.pending[key] = (delay, callback, args)
+
+    def cancel(self, key):
+        self.pending.pop(key, None)
+
+    def fire(self, key):
+        delay, callback, args = self.pending.pop(key)
+        callback(*args)
+
+
+def handler(game_id, data, caller):
+    return sum(range(100))
+
+
+def profiler():
+    timers = Timers()
+    return Profiler({'play_domino': handler}, timers=timers), timers
+
+
+def test_run_finishes_after_count_calls():
+    profiles, timers = profiler()
+    run = profiles.calls('play_domino', 2)
+    profiles.handlers['play_domino']('g1', {}, None)
+    assert not run.done
+    profiles.handlers['play_domino']('g1', {}, None)
+
+    assert run.done and run.samples == 2
+    assert profiles.handlers['play_domino'] is handler
+    assert marshal.loads(run.result)
+    assert timers.pending == {}
+
+
+def test_deadline_restores_the_handler_with_what_it_has():
+    profiles, timers = profiler()
+    run = profiles.calls('play_domino', 10, seconds=5000)
+    assert timers.pending[('profile', run.id)][0] == Profiler.MAX_SECONDS
+    profiles.handlers['play_domino']('g1', {}, None)
+
+    timers.fire(('profile', run.id))
+    assert run.done and run.samples == 1 and not run.cancelled
+    assert profiles.handlers['play_domino'] is handler
+    profiles.handlers['play_domino']('g1', {}, None)
+    assert run.samples == 1
+
+
+def test_cancel_ends_a_run_with_no_calls():
+    profiles, timers = profiler()
+    run = profiles.calls('play_domino', 10)
+    assert profiles.cancel(run.id) is run
+    assert run.done and run.cancelled and run.to_dict()['cancelled']
+    assert marshal.loads(run.result) == {}
+    assert profiles.handlers['play_domino'] is handler
+    assert timers.pending == {}
+    assert profiles.cancel('missing') is None
+    profiles.calls('play_domino', 1)  # Free to profile again
+
+
+def test_cancel_stops_sampling():
+    profiles, _ = profiler()
+    run = profiles.sample(60)
+    profiles.cancel(run.id)
+    deadline = time.monotonic() + 5
+    while not run.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run.done and run.cancelled
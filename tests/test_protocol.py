@@ -0,0 +1,120 @@
+"""Wire protocol negotiation and encoding, and which protocols a game's audience uses."""
+
+import os
+import re
+import sys
+import pickle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services import protocol
+from services.protocol import (
+    EVENT_CODES, EVENT_FIELDS, PLAYER_FIELDS, PROTOCOL_BINARY, PROTOCOL_COMPACT, PROTOCOL_JSON,
+    TRICK_FIELDS, SharedPayload, encode, encode_message, negotiate, room_for
+)
+from services.registry import SessionRegistry
+from game_logic.domino import Domino
+
+
+def test_negotiate_falls_back_to_json():
+    assert negotiate('2') == PROTOCOL_COMPACT
+    assert negotiate('1') == PROTOCOL_JSON
+    assert negotiate('3') == PROTOCOL_JSON
+    assert negotiate(None) == PROTOCOL_JSON
+
+
+def test_binary_needs_msgpack(monkeypatch):
+    assert negotiate('2b') == (PROTOCOL_BINARY if protocol.msgpack else PROTOCOL_COMPACT)
+    monkeypatch.setattr(protocol, 'msgpack', None)
+    assert negotiate('2b') == PROTOCOL_COMPACT
+
+
+def test_each_protocol_has_its_own_room():
+    assert room_for('g1', PROTOCOL_JSON) == 'g1'
+    assert room_for('g1', PROTOCOL_COMPACT) == 'g1~2'
+    assert room_for('g1', PROTOCOL_BINARY) == 'g1~2b'
+
+
+def test_bid_is_positional_and_drops_trailing_nones():
+    message = encode_message('bid_update', {
+        'position': 'east', 'bid': 30, 'high_bid': 30, 'high_bidder': 'east',
+        'current_bidder': 'south', 'current_turn': None, 'phase': None
+    })
+    assert message == [EVENT_CODES['bid_update'], 1, 30, 30, 1, 2]
+
+
+def test_tiles_and_tricks_become_codes():
+    six_four = Domino(6, 4)
+    message = encode_message('domino_played', {
+        'position': 'north', 'domino_id': '6-4',
+        'current_trick': [('north', six_four.to_dict()), ('east', Domino(0, 0))],
+        'lead_suit': 6, 'current_turn': 'south', 'phase': 'playing'
+    })
+    assert message == [EVENT_CODES['domino_played'], 0, six_four.code, [0, 25, 1, 0], 6, 2, 4]
+
+
+def test_events_without_a_schema_pass_through():
+    assert encode_message('chat_message', {'text': 'hi'}) == ['chat_message', {'text': 'hi'}]
+
+
+def test_frame_encodes_every_message():
+    events = [['trump_selected', {'trump_suit': 3, 'current_leader': 'west', 'phase': 'playing'}],
+              ['error', {'message': 'x'}]]
+    frame = encode(events, PROTOCOL_COMPACT)
+    assert frame == [[EVENT_CODES['trump_selected'], 3, 3, 4], ['error', {'message': 'x'}]]
+    if protocol.msgpack:
+        assert protocol.msgpack.unpackb(encode(events, PROTOCOL_BINARY)) == frame
+
+
+def test_client_mirrors_the_field_lists():
+    with open(os.path.join(ROOT, 'static', 'js', 'wire.js')) as f:
+        source = f.read()
+
+    def fields(name):
+        block = re.search(rf"const {name} = \[(.*?)\n    \];", source, re.S).group(1)
+        return [(key, codec or None) for key, codec in
+                re.findall(r"\['(\w+)'(?:, '(\w+)')?\]", block)]
+
+    assert fields('PLAYER_FIELDS') == list(PLAYER_FIELDS)
+    assert fields('TRICK_FIELDS') == list(TRICK_FIELDS)
+    events = re.search(r"const EVENTS = \[(.*?)\n    \];", source, re.S).group(1)
+    assert re.findall(r"\['(\w+)', \[", events) == list(EVENT_FIELDS)
+    assert fields('EVENTS') == [field for schema in EVENT_FIELDS.values() for field in schema]
+
+
+def test_registry_tracks_protocols_per_audience():
+    sessions = SessionRegistry()
+    sessions.bind('p1', 'g1', 'north')
+    sessions.bind('p2', 'g1', 'east', PROTOCOL_COMPACT)
+    sessions.bind('s1', 'g1', None, PROTOCOL_BINARY)
+    assert sessions.protocols('g1') == {PROTOCOL_JSON, PROTOCOL_COMPACT, PROTOCOL_BINARY}
+    assert sessions.protocols('g1', spectators=True) == {PROTOCOL_BINARY}
+
+    sessions.bind('s1', 'g1', None)  # Rebinding moves it to the default protocol
+    assert sessions.protocols('g1', spectators=True) == {PROTOCOL_JSON}
+    sessions.unbind('p2')
+    assert sessions.protocols('g1') == {PROTOCOL_JSON}
+    assert sessions.protocol('p2') == PROTOCOL_JSON
+
+    sessions.drop_game('g1')
+    assert sessions.protocols('g1') == set()
+    assert len(sessions) == 0
+
+
+def test_tile_codes_round_trip():
+    assert [Domino.from_code(code).code for code in range(28)] == list(range(28))
+
+
+def test_shared_payload_is_encoded_once_per_protocol():
+    view = SharedPayload({'trump_suit': 3, 'current_leader': 'west', 'phase': 'playing'})
+    frame = encode([['trump_selected', view]], PROTOCOL_COMPACT)
+    assert encode([['trump_selected', view]], PROTOCOL_COMPACT) is frame
+    assert frame == encode([['trump_selected', dict(view)]], PROTOCOL_COMPACT)
+    if protocol.msgpack:
+        assert protocol.msgpack.unpackb(encode([['trump_selected', view]], PROTOCOL_BINARY)) == frame
+
+    batch = encode([['trump_selected', view], ['error', {}]], PROTOCOL_COMPACT)
+    assert batch[0] == frame[0]  # Batched with other events it is encoded afresh
+    assert pickle.loads(pickle.dumps(view)) == dict(view)  # Encodings stay on this worker
+    assert type(pickle.loads(pickle.dumps(view))) is dict
@@ -0,0 +1,80 @@
+"""Token-bucket verdicts per connection and event class."""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.ratelimit import RateLimiter, parse_limit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def limiter(clock):
+    return RateLimiter({'play': (2, 3), 'chat': (1, 1)},
+                       {'play_domino': 'play', 'place_bid': 'play', 'send_chat': 'chat'},
+                       clock=clock)
+
+
+def test_burst_then_warn_once_then_drop():
+    clock = Clock()
+    limits = limiter(clock)
+    assert [limits.check('s1', 'play_domino') for _ in range(3)] == ['allow'] * 3
+    assert limits.check('s1', 'place_bid') == 'warn'  # Same class, same bucket
+    assert limits.check('s1', 'play_domino') == 'drop'
+    assert limits.stats()['play'] == {'allowed': 3, 'dropped': 2}
+
+
+def test_refill_allows_again_and_rearms_the_warning():
+    clock = Clock()
+    limits = limiter(clock)
+    for _ in range(4):
+        limits.check('s1', 'play_domino')
+    assert limits.retry_after('s1', 'play_domino') == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert limits.retry_after('s1', 'play_domino') == 0
+    assert limits.check('s1', 'play_domino') == 'allow'
+    assert limits.check('s1', 'play_domino') == 'warn'
+
+
+def test_connections_and_classes_have_their_own_buckets():
+    clock = Clock()
+    limits = limiter(clock)
+    assert limits.check('s1', 'send_chat') == 'allow'
+    assert limits.check('s1', 'send_chat') == 'warn'
+    assert limits.check('s2', 'send_chat') == 'allow'
+    assert limits.check('s1', 'play_domino') == 'allow'
+    assert len(limits) == 2
+
+
+def test_unclassified_events_are_never_limited():
+    limits = limiter(Clock())
+    assert all(limits.check('s1', 'join_game') == 'allow' for _ in range(100))
+    assert limits.retry_after('s1', 'join_game') == 0
+    assert len(limits) == 0
+
+
+def test_forget_resets_a_connection():
+    limits = limiter(Clock())
+    limits.check('s1', 'send_chat')
+    limits.forget('s1')
+    limits.forget('s1')
+    assert len(limits) == 0
+    assert limits.check('s1', 'send_chat') == 'allow'
+
+
+def test_parse_limit():
+    assert parse_limit('5:10') == (5.0, 10)
+    assert parse_limit('0.5:2') == (0.5, 2)
+    assert parse_limit('3') == (3.0, 3)
+    assert parse_limit('0.5') == (0.5, 1)
@@ -0,0 +1,134 @@
+"""TimerWheel arming, cascading and cancelling, and the keyed TaskScheduler."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.scheduler import BotScheduler, TaskScheduler, TimerWheel
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fired(wheel, now):
+    return [timer.fire() for timer in wheel.advance(now)]
+
+
+def test_timers_fire_in_deadline_order():
+    clock = Clock()
+    wheel = TimerWheel(tick=1, slots=4, levels=3, clock=clock)
+    for delay in (3, 1, 2):
+        wheel.schedule(delay, lambda d=delay: d)
+    assert fired(wheel, 0.5) == []
+    assert fired(wheel, 3) == [1, 2, 3]
+    assert len(wheel) == 0
+
+
+def test_far_timers_cascade_down_the_levels():
+    clock = Clock()
+    wheel = TimerWheel(tick=1, slots=4, levels=3, clock=clock)
+    for delay in (5, 17, 40, 100):  # Past level 0, level 1 and the top level's reach
+        wheel.schedule(delay, lambda d=delay: d)
+
+    seen = []
+    for now in range(1, 101):
+        for value in fired(wheel, now):
+            seen.append((now, value))
+    assert seen == [(5, 5), (17, 17), (40, 40), (100, 100)]
+
+
+def test_cancelled_timer_does_not_fire():
+    clock = Clock()
+    wheel = TimerWheel(tick=1, slots=4, levels=2, clock=clock)
+    keep = wheel.schedule(2, lambda: 'keep')
+    drop = wheel.schedule(2, lambda: 'drop')
+    wheel.cancel(drop)
+    wheel.cancel(drop)  # Twice is a no-op
+    assert len(wheel) == 1
+    assert fired(wheel, 2) == ['keep']
+    wheel.cancel(keep)  # Already fired: a no-op
+    assert len(wheel) == 0
+
+
+def test_idle_wheel_skips_the_ticks_nobody_waited_for():
+    clock = Clock()
+    wheel = TimerWheel(tick=1, slots=4, levels=2, clock=clock)
+    clock.now = 1000
+    wheel.schedule(1, lambda: 'late')
+    assert fired(wheel, 1000) == []
+    assert fired(wheel, 1001) == ['late']
+
+
+class Loop:
+    """spawn/sleep for a TaskScheduler: runs its loop inline on a fake clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.spawned = []
+
+    def spawn(self, fn, *args):
+        self.spawned.append((fn, args))
+
+    def sleep(self, seconds):
+        self.clock.now += seconds
+
+    def run(self):
+        while self.spawned:
+            fn, args = self.spawned.pop(0)
+            fn(*args)
+
+
+def scheduler(cls=TaskScheduler, *args):
+    clock = Clock()
+    loop = Loop(clock)
+    return cls(loop.spawn, loop.sleep, *args, wheel=TimerWheel(tick=0.1, clock=clock)), loop
+
+
+def test_task_scheduler_rearms_a_key():
+    timers, loop = scheduler()
+    calls = []
+    timers.schedule(('turn', 'g1'), 1, calls.append, 'first')
+    timers.schedule(('turn', 'g1'), 2, calls.append, 'second')
+    timers.schedule(('away', 'g1'), 1, calls.append, 'away')
+    assert len(timers) == 2
+    assert len(loop.spawned) == 1  # One loop for every key
+
+    loop.run()
+    assert calls == ['away', 'second']
+    assert not timers.is_pending(('turn', 'g1'))
+
+
+def test_task_scheduler_cancel():
+    timers, loop = scheduler()
+    calls = []
+    timers.schedule('k', 1, calls.append, 'x')
+    timers.cancel('k')
+    timers.cancel('k')
+    loop.run()
+    assert calls == [] and len(timers) == 0
+
+
+def test_failing_task_does_not_stop_the_others():
+    timers, loop = scheduler()
+    calls = []
+    timers.schedule('bad', 1, lambda: 1 / 0)
+    timers.schedule('good', 2, calls.append, 'ok')
+    loop.run()
+    assert calls == ['ok']
+
+
+def test_bot_scheduler_submits_the_game():
+    submitted = []
+    bots, loop = scheduler(BotScheduler, submitted.append)
+    bots.schedule('g1', 0.5)
+    bots.schedule('g2', 0.2)
+    assert bots.is_pending('g1')
+    loop.run()
+    assert submitted == ['g2', 'g1']
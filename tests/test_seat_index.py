@@ -0,0 +1,78 @@
+"""SeatIndex follows seat and spectator changes and answers the rejoin lookup."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services.seat_index import SeatIndex
+from game_logic.game import Game
+
+
+def test_loaded_game_is_indexed_without_bots():
+    game = Game('g1')
+    game.add_player(1, 'alice', 'north')
+    game.add_player(-1, 'Bot 1', 'east', is_ai=True)
+    game.add_spectator(2, 'bob')
+
+    index = SeatIndex()
+    index.add_game(game)
+    assert index.active_game(1) == ('g1', 'north')
+    assert index.active_game(2) == ('g1', None)
+    assert index.active_game(-1) is None
+    assert len(index) == 2
+
+
+def test_seat_changes_keep_the_index_in_sync():
+    game = Game('g1')
+    index = SeatIndex()
+    index.add_game(game)
+
+    game.add_spectator(1, 'alice')
+    assert index.active_game(1) == ('g1', None)
+    game.remove_spectator(1)
+    game.add_player(1, 'alice', 'south')
+    assert index.active_game(1) == ('g1', 'south')
+    game.remove_player('south')
+    assert index.active_game(1) is None
+    assert len(index) == 0
+
+
+def test_latest_seat_wins_over_spectating():
+    index = SeatIndex()
+    games = [Game(game_id) for game_id in ('g1', 'g2', 'g3')]
+    for game in games:
+        index.add_game(game)
+
+    games[0].add_player(1, 'alice')
+    games[1].add_player(1, 'alice')
+    games[2].add_spectator(1, 'alice')
+    assert index.active_game(1) == ('g2', 'north')  # A seat beats a newer spectator slot
+    games[1].remove_player('north')
+    assert index.active_game(1) == ('g1', 'north')
+
+
+def test_dropped_game_stops_being_followed():
+    game = Game('g1')
+    game.add_player(1, 'alice')
+    index = SeatIndex()
+    index.add_game(game)
+
+    index.drop_game('g1', game)
+    assert index.active_game(1) is None
+    game.add_player(2, 'bob')  # No longer reported
+    assert len(index) == 0
+
+
+def test_reloaded_game_replaces_the_old_entries():
+    index = SeatIndex()
+    old = Game('g1')
+    index.add_game(old)
+    old.add_player(1, 'alice')
+
+    saved = Game('g1')
+    saved.add_player(2, 'bob', 'west')
+    index.add_game(saved)
+    assert index.active_game(1) is None
+    assert index.active_game(2) == ('g1', 'west')
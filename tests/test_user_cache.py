@@ -0,0 +1,88 @@
+"""UserCache hits, expiry and invalidation."""
+
+import os
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from models.user_cache import UserCache
+
+
+def user(user_id, username='alice'):
+    return SimpleNamespace(to_dict=lambda: {'id': user_id, 'username': username, 'is_guest': False})
+
+
+class Loader:
+    """Stands in for User.query.get, counting database reads."""
+
+    def __init__(self, users):
+        self.users = users
+        self.calls = 0
+
+    def __call__(self, user_id):
+        self.calls += 1
+        return self.users.get(user_id)
+
+
+def test_hits_are_served_without_loading():
+    cache = UserCache()
+    load = Loader({1: user(1)})
+    assert cache.get(1, load).username == 'alice'
+    assert cache.get(1, load).username == 'alice'
+    assert load.calls == 1
+
+
+def test_expired_entries_are_reloaded():
+    cache = UserCache(ttl=0)
+    load = Loader({1: user(1)})
+    cache.get(1, load)
+    cache.get(1, load)
+    assert load.calls == 2
+
+
+def test_invalidate_drops_the_user_and_notifies():
+    cache = UserCache()
+    notified = []
+    cache.on_invalidate = notified.append
+    load = Loader({1: user(1)})
+    cache.get(1, load)
+
+    load.users[1] = user(1, 'bob')
+    cache.invalidate(1)
+    assert cache.get(1, load).username == 'bob'
+    assert notified == [1]
+
+    cache.invalidate(1, notify=False)  # From another worker: not passed on again
+    assert notified == [1]
+
+
+def test_snapshot_read_before_an_invalidation_is_not_kept():
+    cache = UserCache()
+
+    def load_then_change(user_id):
+        loaded = user(user_id)
+        cache.invalidate(user_id)  # Changed while the row was being read
+        return loaded
+
+    assert cache.get(1, load_then_change).username == 'alice'
+    assert len(cache) == 0
+
+
+def test_full_cache_drops_oldest_entry():
+    cache = UserCache(max_size=2)
+    load = Loader({n: user(n) for n in range(3)})
+    for n in range(3):
+        cache.get(n, load)
+    assert len(cache) == 2
+    cache.get(0, load)
+    assert load.calls == 4
+
+
+def test_missing_user_is_not_cached():
+    cache = UserCache()
+    load = Loader({})
+    assert cache.get(1, load) is None
+    assert cache.get(1, load) is None
+    assert load.calls == 2